@@ -1,22 +1,13 @@
 import sys
 import os
-import numpy as np
 import random
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpinBox, QDialog, QFormLayout, QSizePolicy, QGridLayout, QSpacerItem, QMessageBox
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QPainter, QColor, QPen, QIcon
+from predators_engine import DEFAULT_RECRUIT_RADIUS, DEFAULT_PLANT_SPAWN_INTERVAL, DEFAULT_PLANT_LAY_FOOD_INTERVAL, DEFAULT_RANDOM_EGG_SPAWN_INTERVAL, DIRECTIONS, Creature, Game
 
-DEFAULT_GRID_SIZE = 100
 DEFAULT_GAME_AREA_SIZE = 400
 DEFAULT_CYCLE_SPEED = 25
-DEFAULT_INCU_CYCLES = 20
-DEFAULT_HUNGER_CYCLES = 200
-DEFAULT_TURN_INTERVAL = 10
-DEFAULT_food_radius = 20
-DEFAULT_LAY_EGG_INTERVAL = 10
-DEFAULT_MATURITY_CYCLES = 100
-DEFAULT_RARITY = 0.5
-DEFAULT_RECRUIT_RADIUS = 2
 
 COLOR_NEUTRAL = QColor(128, 128, 128)
 COLOR_WEAPON = QColor(255, 0, 0)
@@ -28,1018 +19,6 @@ COLOR_OLD = QColor(128, 0, 128)
 COLOR_NUCLEUS = QColor(255, 128, 0)
 COLOR_PLANT = QColor(0, 200, 0)
 
-DIRECTIONS = [
-    (1,0), (1,1), (0,1), (-1,1), (-1,0), (-1,-1), (0,-1), (1,-1)
-]
-
-COOP_ATTACH_DIRS = DIRECTIONS
-
-DEFAULT_IDLE_LIMIT = 10
-DEFAULT_PLANT_SPAWN_INTERVAL = 300
-DEFAULT_PLANT_LAY_FOOD_INTERVAL = 50
-
-# Tambahkan default interval untuk random egg spawn
-DEFAULT_RANDOM_EGG_SPAWN_INTERVAL = 400
-
-CANIBALITY_THRESHOLD = 0.25
-
-class Egg:
-    def __init__(self, x, y, incubate_cycles):
-        self.x = x
-        self.y = y
-        self.incubate_cycles = incubate_cycles
-        self.born_cycle = None
-        self.hatched = False
-
-class PlantCell:
-    def __init__(self, x, y, lay_food_interval=DEFAULT_PLANT_LAY_FOOD_INTERVAL, game=None, random_features=True):
-        self.neutral = (x, y)
-        self.direction_idx = random.randint(0, 7)
-        self.direction = DIRECTIONS[self.direction_idx]
-        self.cells = {'neutral': [(x, y)]}
-        self.has_leg = False
-        self.has_eye = False
-        self.has_weapon = False
-        self.lay_food_interval = lay_food_interval
-        self.last_lay_cycle = 0
-        self.age = 0
-        self.alive = True
-        self.game = game
-        self.last_position = self.neutral
-        self.idle_counter = 0
-        self.idle_limit = getattr(game, "idle_limit", DEFAULT_IDLE_LIMIT) if game else DEFAULT_IDLE_LIMIT
-        if random_features:
-            if random.random() < 0.5:
-                self.has_leg = True
-            if random.random() < 0.5:
-                self.has_eye = True
-            self._update_attached_cells()
-
-    def _update_attached_cells(self):
-        tx, ty = self.neutral
-        dx, dy = self.direction
-        if self.has_leg:
-            self.cells['leg'] = [(tx - dx, ty - dy)]
-        if self.has_eye:
-            ex, ey = dy, -dx
-            self.cells['eye'] = [(tx + ex, ty + ey)]
-
-    def rotate(self):
-        self.direction_idx = random.randint(0, 7)
-        self.direction = DIRECTIONS[self.direction_idx]
-        self._update_attached_cells()
-
-    def move(self, grid_size, current_cycle, food_list):
-        self.age += 1
-        speed = 1 + (1 if self.has_leg else 0)
-        for _ in range(speed):
-            self.direction_idx = random.randint(0, 7)
-            self.direction = DIRECTIONS[self.direction_idx]
-            dx, dy = self.direction
-            nx, ny = self.neutral
-            tx, ty = nx + dx, ny + dy
-            if 0 <= tx < grid_size and 0 <= ty < grid_size:
-                self.neutral = (tx, ty)
-                self.cells['neutral'] = [self.neutral]
-                self._update_attached_cells()
-                if self.last_position != self.neutral:
-                    self.idle_counter = 0
-                    self.last_position = self.neutral
-                else:
-                    self.idle_counter += 1
-            else:
-                self.rotate()
-                self.idle_counter += 1
-                continue
-            if current_cycle - self.last_lay_cycle >= self.lay_food_interval:
-                tx, ty = self.neutral
-                self.last_lay_cycle = current_cycle
-                food_list.append((tx, ty))
-            if self.idle_counter >= self.idle_limit:
-                self.alive = False
-
-    def cell_count(self):
-        count = 0
-        for v in self.cells.values():
-            count += len(v)
-        return count
-
-    def feature_count(self):
-        count = 0
-        if self.has_leg:
-            count += 1
-        if self.has_eye:
-            count += 1
-        return count
-
-    def all_cells(self):
-        result = []
-        for v in self.cells.values():
-            result.extend(v)
-        return result
-
-    def grow(self, part):
-        if self.feature_count() >= 2:
-            return
-        options = []
-        if not self.has_leg:
-            options.append('leg')
-        if not self.has_eye:
-            options.append('eye')
-        if options:
-            if part == 'random':
-                chosen = random.choice(options)
-            else:
-                chosen = part
-            if chosen == 'leg' and not self.has_leg:
-                self.has_leg = True
-            elif chosen == 'eye' and not self.has_eye:
-                self.has_eye = True
-            self._update_attached_cells()
-
-class Creature:
-    def __init__(self, x, y, hunger_cycles, turn_interval, food_radius, lay_egg_interval=DEFAULT_LAY_EGG_INTERVAL, maturity_cycles=DEFAULT_MATURITY_CYCLES, rarity=DEFAULT_RARITY, game=None, recruit_radius=DEFAULT_RECRUIT_RADIUS):
-        self.neutral = (x, y)
-        self.direction_idx = random.randint(0, 7)
-        self.direction = DIRECTIONS[self.direction_idx]
-        self.cells = {'neutral': [(x, y)]}
-        self.hunger_cycles = hunger_cycles
-        self.turn_interval = turn_interval
-        self.food_radius = food_radius
-        self.born_cycle = 0
-        self.hunger = hunger_cycles
-        self.steps_since_turn = 0
-        self.has_weapon = False
-        self.has_leg = False
-        self.has_eye = False
-        self.alive = True
-        self.last_lay_cycle = 0
-        self.lay_egg_interval = lay_egg_interval
-        self.age = 0
-        self.maturity_cycles = maturity_cycles
-        self.is_old = False
-        self.old_since = None
-        self.last_feature_loss_age = None
-        self.rarity = rarity
-        self.game = game
-        self.coop_group = None
-        self.last_coop_cycle = -1
-        self.coop_leader = None
-        self.recruit_radius = recruit_radius
-        self.is_nucleus = False
-        self.last_position = self.neutral
-        self.idle_counter = 0
-        self.idle_limit = getattr(game, "idle_limit", DEFAULT_IDLE_LIMIT) if game else DEFAULT_IDLE_LIMIT
-
-    def rotate(self):
-        self.direction_idx = random.randint(0, 7)
-        self.direction = DIRECTIONS[self.direction_idx]
-        self._update_attached_cells()
-
-    def _update_attached_cells(self):
-        tx, ty = self.neutral
-        dx, dy = self.direction
-        if self.has_weapon:
-            self.cells['weapon'] = [(tx + dx, ty + dy)]
-        if self.has_leg:
-            self.cells['leg'] = [(tx - dx, ty - dy)]
-        if self.has_eye:
-            ex, ey = dy, -dx
-            self.cells['eye'] = [(tx + ex, ty + ey)]
-
-    def maybe_lose_feature(self):
-        if not self.is_old:
-            return
-        if self.last_feature_loss_age is not None:
-            if self.age - self.last_feature_loss_age < self.maturity_cycles:
-                return
-        features = []
-        if self.has_weapon:
-            features.append('weapon')
-        if self.has_leg:
-            features.append('leg')
-        if self.has_eye:
-            features.append('eye')
-        if not features:
-            return
-        max_prob = 0.8
-        min_prob = 0.05
-        old_age = self.age - self.maturity_cycles
-        prob = min_prob + min(max_prob - min_prob, old_age / (self.maturity_cycles * 2))
-        if random.random() < prob:
-            lost = random.choice(features)
-            if lost == 'weapon':
-                self.has_weapon = False
-                self.cells.pop('weapon', None)
-            elif lost == 'leg':
-                self.has_leg = False
-                self.cells.pop('leg', None)
-            elif lost == 'eye':
-                self.has_eye = False
-                self.cells.pop('eye', None)
-            self.last_feature_loss_age = self.age
-
-    def can_cooperate_with(self, other, creatures):
-        if not self.alive or not other.alive:
-            return False
-        if not (self.is_old or other.is_old):
-            return False
-        if self.coop_group and other.coop_group and self.coop_group is not other.coop_group:
-            if any(c.is_nucleus for c in self.coop_group) and any(c.is_nucleus for c in other.coop_group):
-                pass
-            else:
-                return False
-        elif (self.coop_group and any(c.is_nucleus for c in self.coop_group)) or (other.coop_group and any(c.is_nucleus for c in other.coop_group)):
-            if self.coop_group is not None and other.coop_group is not None and self.coop_group is not other.coop_group:
-                return False
-        if self.coop_group is not None and other.coop_group is not None and self.coop_group is other.coop_group:
-            return False
-        x1, y1 = self.neutral
-        x2, y2 = other.neutral
-        if max(abs(x1 - x2), abs(y1 - y2)) <= self.recruit_radius:
-            return True
-        return False
-
-    def try_cooperate(self, other, coop_probability, current_cycle, creatures):
-        if not self.can_cooperate_with(other, creatures):
-            return False
-        if self.coop_group and other.coop_group and self.coop_group is not other.coop_group:
-            if any(c.is_nucleus for c in self.coop_group) and any(c.is_nucleus for c in other.coop_group):
-                recruiter = None
-                for c in self.coop_group:
-                    if c.is_nucleus:
-                        recruiter = c
-                        break
-                if recruiter is None:
-                    recruiter = self
-                coop_chance = coop_probability
-                if random.random() < coop_chance:
-                    merged = self.coop_group | other.coop_group
-                    nucleus = recruiter
-                    for member in merged:
-                        member.coop_group = merged
-                        member.coop_leader = nucleus
-                        member.last_coop_cycle = current_cycle
-                        member.is_nucleus = (member is nucleus)
-                        if hasattr(member, "group_hunger"):
-                            delattr(member, "group_hunger")
-                    self._enforce_group_features(merged)
-                    return True
-                return False
-        if self.is_nucleus or other.is_nucleus:
-            recruiter = self if self.is_nucleus else other if other.is_nucleus else self if self.is_old else other
-        else:
-            recruiter = self if self.is_old else other if other.is_old else None
-        if recruiter is None:
-            return False
-        joined = False
-        if self.is_old and other.is_old:
-            coop_chance = 1.0
-        else:
-            coop_chance = coop_probability
-        if random.random() < coop_chance:
-            self._pending_coop = True
-            other._pending_coop = True
-            if self.coop_group and other.coop_group:
-                merged = self.coop_group | other.coop_group
-            elif self.coop_group:
-                merged = self.coop_group | set([other])
-            elif other.coop_group:
-                merged = other.coop_group | set([self])
-            else:
-                merged = set([self, other])
-            nucleus = None
-            for m in merged:
-                if m.is_nucleus:
-                    nucleus = m
-                    break
-            if not nucleus:
-                recruiter.is_nucleus = True
-                nucleus = recruiter
-            for member in merged:
-                member.coop_group = merged
-                member.coop_leader = nucleus
-                member.last_coop_cycle = current_cycle
-                member.is_nucleus = (member is nucleus)
-                if hasattr(member, "group_hunger"):
-                    delattr(member, "group_hunger")
-            self.attach_to_coop_group_outermost(other, merged, creatures)
-            self._enforce_group_features(merged)
-            joined = True
-        return joined
-
-    def _enforce_group_features(self, group):
-        weapon_owner = None
-        leg_owner = None
-        eye_owner = None
-        for member in group:
-            if member.has_weapon and weapon_owner is None:
-                weapon_owner = member
-            elif member.has_weapon:
-                member.has_weapon = False
-                member.cells.pop('weapon', None)
-            if member.has_leg and leg_owner is None:
-                leg_owner = member
-            elif member.has_leg:
-                member.has_leg = False
-                member.cells.pop('leg', None)
-            if member.has_eye and eye_owner is None:
-                eye_owner = member
-            elif member.has_eye:
-                member.has_eye = False
-                member.cells.pop('eye', None)
-        for member in group:
-            member._update_attached_cells()
-
-    def attach_to_coop_group_outermost(self, other, group, creatures):
-        group_cells = {c.neutral for c in group}
-        occupied = group_cells | {c.neutral for c in creatures if c.alive and c not in group}
-        possible = set()
-        for gx, gy in group_cells:
-            for dx, dy in COOP_ATTACH_DIRS:
-                nx, ny = gx + dx, gy + dy
-                if (nx, ny) not in occupied and 0 <= nx < (self.game.grid_size if self.game else 100) and 0 <= ny < (self.game.grid_size if self.game else 100):
-                    possible.add((nx, ny))
-        if possible:
-            pos = random.choice(list(possible))
-            other.neutral = pos
-            other.cells['neutral'] = [pos]
-            other._update_attached_cells()
-        else:
-            self.attach_to_coop_group(other)
-
-    def attach_to_coop_group(self, other):
-        group = self.coop_group if self.coop_group else set([self])
-        group_cells = [c.neutral for c in group]
-        possible = set()
-        for gx, gy in group_cells:
-            for dx, dy in COOP_ATTACH_DIRS:
-                nx, ny = gx + dx, gy + dy
-                if (nx, ny) not in group_cells:
-                    possible.add((nx, ny))
-        if possible:
-            pos = random.choice(list(possible))
-            other.neutral = pos
-            other.cells['neutral'] = [pos]
-            other._update_attached_cells()
-
-    def move_coop_group(self, grid_size, food_positions, eggs, creatures, current_cycle, food_list, coop_probability):
-        if not self.is_nucleus:
-            return None
-        group = [c for c in self.coop_group if c.alive]
-        leader = self
-        group_size = len(group)
-        if not hasattr(leader, "group_hunger") or getattr(leader, "_last_group_size", None) != group_size:
-            leader.group_hunger = leader.hunger_cycles * group_size
-            leader._last_group_size = group_size
-        if len(group) == 1 and leader.is_nucleus:
-            leader.alive = False
-            return None
-        leader.group_hunger -= 1
-        if leader.group_hunger <= 0:
-            for member in group:
-                member.alive = False
-            return None
-        for member in group:
-            member.hunger -= 1
-            if member.hunger <= 0:
-                member.alive = False
-        for member in group:
-            member.age += 1
-            if not member.is_old and member.age >= member.maturity_cycles:
-                member.is_old = True
-                member.old_since = member.age
-            if member.is_old:
-                member.maybe_lose_feature()
-        speed = 1 + (1 if leader.has_leg else 0)
-        for _ in range(speed):
-            leader.steps_since_turn += 1
-            head_x, head_y = leader.neutral
-            nearest_target = None
-            min_dist = None
-            egg_targets = [(egg.x, egg.y) for egg in eggs if not egg.hatched]
-            all_targets = set(food_positions) | set(egg_targets)
-            for tx, ty in all_targets:
-                dist = abs(head_x - tx) + abs(head_y - ty)
-                if dist <= leader.food_radius:
-                    if min_dist is None or dist < min_dist:
-                        min_dist = dist
-                        nearest_target = (tx, ty)
-            if leader.has_eye:
-                eye_pos = leader.cells['eye'][0]
-                ex, ey = eye_pos
-                dx_eye = ex - head_x
-                dy_eye = ey - head_y
-                if dx_eye != 0 or dy_eye != 0:
-                    found_target = None
-                    for step in range(1, grid_size):
-                        tx = ex + dx_eye * step
-                        ty = ey + dy_eye * step
-                        if 0 <= tx < grid_size and 0 <= ty < grid_size:
-                            if (tx, ty) in all_targets:
-                                found_target = (dx_eye, dy_eye)
-                                break
-                        else:
-                            break
-                    if found_target:
-                        nx, ny = leader.neutral
-                        tx, ty = nx + dx_eye, ny + dy_eye
-                        if 0 <= tx < grid_size and 0 <= ty < grid_size:
-                            if (dx_eye, dy_eye) in DIRECTIONS:
-                                leader.direction_idx = DIRECTIONS.index((dx_eye, dy_eye))
-                                leader.direction = DIRECTIONS[leader.direction_idx]
-                            leader.neutral = (tx, ty)
-                            leader.cells['neutral'] = [leader.neutral]
-                            leader._update_attached_cells()
-                            if leader.last_position != leader.neutral:
-                                leader.idle_counter = 0
-                                leader.last_position = leader.neutral
-                            else:
-                                leader.idle_counter += 1
-                            continue
-            elif nearest_target:
-                dx = np.sign(nearest_target[0] - head_x)
-                dy = np.sign(nearest_target[1] - head_y)
-                if (dx, dy) in DIRECTIONS:
-                    leader.direction_idx = DIRECTIONS.index((dx, dy))
-                    leader.direction = DIRECTIONS[leader.direction_idx]
-            if leader.steps_since_turn >= leader.turn_interval:
-                leader.rotate()
-                leader.steps_since_turn = 0
-            dx, dy = leader.direction
-            nx, ny = leader.neutral
-            tx, ty = nx + dx, ny + dy
-            if 0 <= tx < grid_size and 0 <= ty < grid_size:
-                leader.neutral = (tx, ty)
-                leader.cells['neutral'] = [leader.neutral]
-                leader._update_attached_cells()
-                if leader.last_position != leader.neutral:
-                    leader.idle_counter = 0
-                    leader.last_position = leader.neutral
-                else:
-                    leader.idle_counter += 1
-            else:
-                leader.rotate()
-                leader.idle_counter += 1
-                continue
-            self.recruit_nearby(leader, creatures, coop_probability, current_cycle)
-            if leader.has_weapon:
-                weapon_cells = set(leader.cells.get('weapon', []))
-                for c in creatures:
-                    if c is not leader and c.alive and (leader.coop_group is None or c.coop_group is None or leader.coop_group != c.coop_group):
-                        kill = False
-                        if any(cell in weapon_cells for cell in c.cells.get('neutral', [])):
-                            kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('leg', [])):
-                            kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('eye', [])):
-                            kill = True
-                        if getattr(c, "is_old", False):
-                            if any(cell in weapon_cells for cell in c.cells.get('neutral', [])):
-                                kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('weapon', [])):
-                            kill = False
-                        if kill and not (getattr(leader, "_pending_coop", False) and getattr(c, "_pending_coop", False)):
-                            c.alive = False
-            if hasattr(leader, "_pending_coop"):
-                del leader._pending_coop
-            food_count = len(leader.game.food) if leader.game else 0
-            total_living_cells = 0
-            if leader.game:
-                total_living_cells += sum(1 for c in leader.game.creatures if c.alive)
-                total_living_cells += sum(1 for p in getattr(leader.game, "plant_cells", []) if p.alive)
-            total_creature = sum(1 for c in leader.game.creatures if c.alive) if leader.game else 0
-            total_group = 0
-            if leader.game:
-                all_groups = set()
-                for c in leader.game.creatures:
-                    if c.alive and c.coop_group:
-                        all_groups.add(id(c.coop_group))
-                total_group = len(all_groups)
-            # Prevent cannibalism if only 1 creature or only 1 group exists and no other single creatures
-            only_one_group = total_group == 1 and total_creature == len(group)
-            can_eat_egg = food_count >= total_living_cells and total_creature > 1 and not only_one_group
-            group_lay_egg = False
-            if leader.game:
-                if total_creature <= max(2, leader.game.grid_size // 10):
-                    group_lay_egg = True
-            if leader.feature_count() == 3 and current_cycle - leader.last_lay_cycle >= leader.lay_egg_interval:
-                tx, ty = leader.neutral
-                leader.last_lay_cycle = current_cycle
-                return Egg(tx, ty, leader.hunger_cycles)
-            elif group_lay_egg and current_cycle - leader.last_lay_cycle >= leader.lay_egg_interval:
-                tx, ty = leader.neutral
-                leader.last_lay_cycle = current_cycle
-                return Egg(tx, ty, leader.hunger_cycles)
-            for egg in eggs:
-                if not egg.hatched and (egg.x, egg.y) == leader.neutral:
-                    if can_eat_egg:
-                        self._group_eat_and_grow(group)
-                        egg.hatched = True
-            for idx, (fx, fy) in enumerate(food_list):
-                if (fx, fy) == leader.neutral:
-                    self._group_eat_and_grow(group)
-                    food_list.pop(idx)
-                    break
-            if leader.cell_count() > 4:
-                leader.alive = False
-            if leader.idle_counter >= leader.idle_limit:
-                leader.alive = False
-        if leader.alive:
-            members = [m for m in group if m is not leader]
-            n_members = len(members)
-            if n_members > 0:
-                cx, cy = leader.neutral
-                radius = 1
-                angle_step = 2 * np.pi / n_members if n_members > 0 else 0
-                used_positions = set([leader.neutral])
-                for idx, member in enumerate(members):
-                    angle = idx * angle_step
-                    # Cari radius yang tidak bertabrakan
-                    found = False
-                    for r in range(1, max(2, grid_size // 2)):
-                        nx = int(round(cx + r * np.cos(angle)))
-                        ny = int(round(cy + r * np.sin(angle)))
-                        if 0 <= nx < grid_size and 0 <= ny < grid_size and (nx, ny) not in used_positions:
-                            member.neutral = (nx, ny)
-                            member.cells['neutral'] = [member.neutral]
-                            member._update_attached_cells()
-                            member.steps_since_turn = leader.steps_since_turn
-                            member.direction_idx = leader.direction_idx
-                            member.direction = leader.direction
-                            if member.last_position != (nx, ny):
-                                member.idle_counter = 0
-                                member.last_position = (nx, ny)
-                            else:
-                                member.idle_counter += 1
-                            used_positions.add((nx, ny))
-                            found = True
-                            break
-                    if not found:
-                        # fallback: random nearby
-                        for dx in range(-1, 2):
-                            for dy in range(-1, 2):
-                                nx = cx + dx
-                                ny = cy + dy
-                                if 0 <= nx < grid_size and 0 <= ny < grid_size and (nx, ny) not in used_positions:
-                                    member.neutral = (nx, ny)
-                                    member.cells['neutral'] = [member.neutral]
-                                    member._update_attached_cells()
-                                    used_positions.add((nx, ny))
-                                    break
-        for member in group:
-            self.recruit_nearby(member, creatures, coop_probability, current_cycle)
-            if member.has_weapon:
-                weapon_cells = set(member.cells.get('weapon', []))
-                for c in creatures:
-                    if c is not member and c.alive and (member.coop_group is None or c.coop_group is None or member.coop_group != c.coop_group):
-                        kill = False
-                        if any(cell in weapon_cells for cell in c.cells.get('neutral', [])):
-                            kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('leg', [])):
-                            kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('eye', [])):
-                            kill = True
-                        if getattr(c, "is_old", False):
-                            if any(cell in weapon_cells for cell in c.cells.get('neutral', [])):
-                                kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('weapon', [])):
-                            kill = False
-                        if kill and not (getattr(member, "_pending_coop", False) and getattr(c, "_pending_coop", False)):
-                            c.alive = False
-            if hasattr(member, "_pending_coop"):
-                del member._pending_coop
-            food_count = len(member.game.food) if member.game else 0
-            total_living_cells = 0
-            if member.game:
-                total_living_cells += sum(1 for c in member.game.creatures if c.alive)
-                total_living_cells += sum(1 for p in getattr(member.game, "plant_cells", []) if p.alive)
-            total_creature = sum(1 for c in member.game.creatures if c.alive) if member.game else 0
-            total_group = 0
-            if member.game:
-                all_groups = set()
-                for c in member.game.creatures:
-                    if c.alive and c.coop_group:
-                        all_groups.add(id(c.coop_group))
-                total_group = len(all_groups)
-            only_one_group = total_group == 1 and total_creature == len(group)
-            can_eat_egg = food_count >= total_living_cells and total_creature > 1 and not only_one_group
-            for egg in eggs:
-                if not egg.hatched and (egg.x, egg.y) == member.neutral:
-                    if can_eat_egg:
-                        self._group_eat_and_grow(group)
-                        egg.hatched = True
-            for idx, (fx, fy) in enumerate(food_list):
-                if (fx, fy) == member.neutral:
-                    self._group_eat_and_grow(group)
-                    food_list.pop(idx)
-                    break
-            if member.cell_count() > 4:
-                member.alive = False
-            if member.idle_counter >= member.idle_limit:
-                member.alive = False
-        return None
-
-    def _group_eat_and_grow(self, group):
-        for member in group:
-            if member.feature_count() < 3:
-                rarity_factor = member.rarity
-                if member.game:
-                    total_cells = member.game.grid_size * member.game.grid_size
-                    food_count = len(member.game.food)
-                    egg_count = len([egg for egg in member.game.eggs if not egg.hatched])
-                    abundance = (food_count + egg_count) / max(1, total_cells)
-                    rarity_factor = min(1.0, max(0.0, member.rarity + abundance * 0.8 - 0.2))
-                if rarity_factor == 0.0 or random.random() > rarity_factor:
-                    member.grow('random')
-            member.hunger += member.hunger_cycles
-
-    def move(self, grid_size, food_positions, eggs, creatures, current_cycle, food_list, coop_probability):
-        if self.coop_group and self.is_nucleus:
-            return self.move_coop_group(grid_size, food_positions, eggs, creatures, current_cycle, food_list, coop_probability)
-        elif self.coop_group:
-            return None
-        self.age += 1
-        if not self.is_old and self.age >= self.maturity_cycles:
-            self.is_old = True
-            self.old_since = self.age
-        if self.is_old:
-            self.maybe_lose_feature()
-        speed = 1 + (1 if self.has_leg else 0)
-        for _ in range(speed):
-            self.steps_since_turn += 1
-            head_x, head_y = self.neutral
-            nearest_target = None
-            min_dist = None
-            egg_targets = [(egg.x, egg.y) for egg in eggs if not egg.hatched]
-            all_targets = set(food_positions) | set(egg_targets)
-            for tx, ty in all_targets:
-                dist = abs(head_x - tx) + abs(head_y - ty)
-                if dist <= self.food_radius:
-                    if min_dist is None or dist < min_dist:
-                        min_dist = dist
-                        nearest_target = (tx, ty)
-            if self.has_eye:
-                eye_pos = self.cells['eye'][0]
-                ex, ey = eye_pos
-                dx_eye = ex - head_x
-                dy_eye = ey - head_y
-                if dx_eye != 0 or dy_eye != 0:
-                    found_target = None
-                    for step in range(1, grid_size):
-                        tx = ex + dx_eye * step
-                        ty = ey + dy_eye * step
-                        if 0 <= tx < grid_size and 0 <= ty < grid_size:
-                            if (tx, ty) in all_targets:
-                                found_target = (dx_eye, dy_eye)
-                                break
-                        else:
-                            break
-                    if found_target:
-                        nx, ny = self.neutral
-                        tx, ty = nx + dx_eye, ny + dy_eye
-                        if 0 <= tx < grid_size and 0 <= ty < grid_size:
-                            if (dx_eye, dy_eye) in DIRECTIONS:
-                                self.direction_idx = DIRECTIONS.index((dx_eye, dy_eye))
-                                self.direction = DIRECTIONS[self.direction_idx]
-                            self.neutral = (tx, ty)
-                            self.cells['neutral'] = [self.neutral]
-                            self._update_attached_cells()
-                            if self.last_position != self.neutral:
-                                self.idle_counter = 0
-                                self.last_position = self.neutral
-                            else:
-                                self.idle_counter += 1
-                            continue
-            elif nearest_target:
-                dx = np.sign(nearest_target[0] - head_x)
-                dy = np.sign(nearest_target[1] - head_y)
-                if (dx, dy) in DIRECTIONS:
-                    self.direction_idx = DIRECTIONS.index((dx, dy))
-                    self.direction = DIRECTIONS[self.direction_idx]
-            if self.steps_since_turn >= self.turn_interval:
-                self.rotate()
-                self.steps_since_turn = 0
-            dx, dy = self.direction
-            nx, ny = self.neutral
-            tx, ty = nx + dx, ny + dy
-            if 0 <= tx < grid_size and 0 <= ty < grid_size:
-                self.neutral = (tx, ty)
-                self.cells['neutral'] = [self.neutral]
-                self._update_attached_cells()
-                if self.last_position != self.neutral:
-                    self.idle_counter = 0
-                    self.last_position = self.neutral
-                else:
-                    self.idle_counter += 1
-            else:
-                self.rotate()
-                self.idle_counter += 1
-                continue
-            self.recruit_nearby(self, creatures, coop_probability, current_cycle)
-            if self.has_weapon:
-                weapon_cells = set(self.cells.get('weapon', []))
-                for c in creatures:
-                    if c is not self and c.alive and (self.coop_group is None or c.coop_group is None or self.coop_group != c.coop_group):
-                        kill = False
-                        if any(cell in weapon_cells for cell in c.cells.get('neutral', [])):
-                            kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('leg', [])):
-                            kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('eye', [])):
-                            kill = True
-                        if getattr(c, "is_old", False):
-                            if any(cell in weapon_cells for cell in c.cells.get('neutral', [])):
-                                kill = True
-                        if any(cell in weapon_cells for cell in c.cells.get('weapon', [])):
-                            kill = False
-                        if kill and not (getattr(self, "_pending_coop", False) and getattr(c, "_pending_coop", False)):
-                            c.alive = False
-            if hasattr(self, "_pending_coop"):
-                del self._pending_coop
-            food_count = len(self.game.food) if self.game else 0
-            total_living_cells = 0
-            if self.game:
-                total_living_cells += sum(1 for c in self.game.creatures if c.alive)
-                total_living_cells += sum(1 for p in getattr(self.game, "plant_cells", []) if p.alive)
-            can_eat_egg = food_count >= total_living_cells
-            for egg in eggs:
-                if not egg.hatched and (egg.x, egg.y) == self.neutral:
-                    if can_eat_egg:
-                        self.eat_and_grow()
-                        egg.hatched = True
-            for idx, (fx, fy) in enumerate(food_list):
-                if (fx, fy) == self.neutral:
-                    self.eat_and_grow()
-                    food_list.pop(idx)
-                    break
-            if self.cell_count() > 4:
-                self.alive = False
-            if self.idle_counter >= self.idle_limit:
-                self.alive = False
-        if self.feature_count() == 3 and current_cycle - self.last_lay_cycle >= self.lay_egg_interval:
-            tx, ty = self.neutral
-            self.last_lay_cycle = current_cycle
-            return Egg(tx, ty, self.hunger_cycles)
-        return None
-
-    def recruit_nearby(self, self_creature, creatures, coop_probability, current_cycle):
-        for other in creatures:
-            if other is self_creature:
-                continue
-            if not other.alive:
-                continue
-            if self_creature.coop_group is not None and other.coop_group is not None and self_creature.coop_group is other.coop_group:
-                continue
-            if self_creature.can_cooperate_with(other, creatures):
-                self_creature.try_cooperate(other, coop_probability, current_cycle, creatures)
-
-    def eat_and_grow(self):
-        if self.coop_group:
-            group = [c for c in self.coop_group if c.alive]
-            self._group_eat_and_grow(group)
-        else:
-            if self.feature_count() < 3:
-                rarity_factor = self.rarity
-                if self.game:
-                    total_cells = self.game.grid_size * self.game.grid_size
-                    food_count = len(self.game.food)
-                    egg_count = len([egg for egg in self.game.eggs if not egg.hatched])
-                    abundance = (food_count + egg_count) / max(1, total_cells)
-                    rarity_factor = min(1.0, max(0.0, self.rarity + abundance * 0.8 - 0.2))
-                if rarity_factor == 0.0 or random.random() > rarity_factor:
-                    self.grow('random')
-            self.hunger += self.hunger_cycles
-
-    def grow(self, part):
-        if self.feature_count() >= 3:
-            return
-        options = []
-        if not self.has_weapon:
-            options.append('weapon')
-        if not self.has_leg:
-            options.append('leg')
-        if not self.has_eye:
-            options.append('eye')
-        if options:
-            if part == 'random':
-                chosen = random.choice(options)
-            else:
-                chosen = part
-            if chosen == 'weapon' and not self.has_weapon:
-                self.has_weapon = True
-            elif chosen == 'leg' and not self.has_leg:
-                self.has_leg = True
-            elif chosen == 'eye' and not self.has_eye:
-                self.has_eye = True
-            self._update_attached_cells()
-
-    def cell_count(self):
-        count = 0
-        for v in self.cells.values():
-            count += len(v)
-        return count
-
-    def feature_count(self):
-        count = 0
-        if self.has_weapon:
-            count += 1
-        if self.has_leg:
-            count += 1
-        if self.has_eye:
-            count += 1
-        return count
-
-    def all_cells(self):
-        result = []
-        for v in self.cells.values():
-            result.extend(v)
-        return result
-
-class Game:
-    def __init__(self, grid_size=DEFAULT_GRID_SIZE, incubate_cycles=DEFAULT_INCU_CYCLES, hunger_cycles=DEFAULT_HUNGER_CYCLES, turn_interval=DEFAULT_TURN_INTERVAL, food_radius=DEFAULT_food_radius, lay_egg_interval=DEFAULT_LAY_EGG_INTERVAL, maturity_cycles=DEFAULT_MATURITY_CYCLES, rarity=DEFAULT_RARITY, recruit_radius=DEFAULT_RECRUIT_RADIUS, plant_spawn_interval=DEFAULT_PLANT_SPAWN_INTERVAL, plant_lay_food_interval=DEFAULT_PLANT_LAY_FOOD_INTERVAL, random_egg_spawn_interval=DEFAULT_RANDOM_EGG_SPAWN_INTERVAL):
-        self.grid_size = grid_size
-        self.cell_size = DEFAULT_GAME_AREA_SIZE // self.grid_size
-        self.incubate_cycles = incubate_cycles
-        self.hunger_cycles = hunger_cycles
-        self.turn_interval = turn_interval
-        self.food_radius = food_radius
-        self.lay_egg_interval = lay_egg_interval
-        self.maturity_cycles = maturity_cycles
-        self.rarity = rarity
-        self.recruit_radius = recruit_radius
-        self.idle_limit = DEFAULT_IDLE_LIMIT
-        self.plant_spawn_interval = plant_spawn_interval
-        self.plant_lay_food_interval = plant_lay_food_interval
-        self.random_egg_spawn_interval = random_egg_spawn_interval
-        self.reset()
-        self.max_creature_age = 0
-        self.last_coop_probability = 0.0
-
-    def reset(self):
-        self.eggs = []
-        self.creatures = []
-        self.food = []
-        self.grid = np.zeros((self.grid_size, self.grid_size), dtype=np.uint8)
-        self.cycle = 0
-        self.max_creature_age = 0
-        self.last_coop_probability = 0.0
-        self.plant_cells = []
-        self._last_plant_spawn = 0
-        self._last_random_egg_spawn = 0
-
-    def add_egg(self, x, y):
-        for egg in self.eggs:
-            if egg.x == x and egg.y == y:
-                return
-        self.eggs.append(Egg(x, y, self.incubate_cycles))
-
-    def add_food(self, x, y):
-        if (x, y) not in self.food:
-            self.food.append((x, y))
-
-    def add_plant_cell(self, x, y):
-        if any(pc.neutral == (x, y) for pc in self.plant_cells):
-            return
-        self.plant_cells.append(PlantCell(x, y, self.plant_lay_food_interval, self, random_features=True))
-
-    # Fungsi baru untuk spawn egg secara acak
-    def spawn_random_egg(self):
-        empty_cells = [(x, y) for x in range(self.grid_size) for y in range(self.grid_size)
-                       if self.grid[x, y] == 0 and not any(egg.x == x and egg.y == y and not egg.hatched for egg in self.eggs)]
-        if empty_cells:
-            ex, ey = random.choice(empty_cells)
-            self.add_egg(ex, ey)
-
-    def update_grid(self):
-        self.grid[:] = 0
-        for egg in self.eggs:
-            if not egg.hatched:
-                if 0 <= egg.x < self.grid_size and 0 <= egg.y < self.grid_size:
-                    self.grid[egg.x, egg.y] = 2
-        for fx, fy in self.food:
-            if 0 <= fx < self.grid_size and 0 <= fy < self.grid_size:
-                self.grid[fx, fy] = 3
-        for creature in self.creatures:
-            if creature.alive:
-                for cell in creature.cells.get('neutral', []):
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        if getattr(creature, "is_nucleus", False):
-                            self.grid[cell[0], cell[1]] = 9
-                        elif getattr(creature, "is_old", False):
-                            self.grid[cell[0], cell[1]] = 8
-                        else:
-                            self.grid[cell[0], cell[1]] = 4
-                for cell in creature.cells.get('weapon', []):
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        self.grid[cell[0], cell[1]] = 5
-                for cell in creature.cells.get('leg', []):
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        self.grid[cell[0], cell[1]] = 6
-                for cell in creature.cells.get('eye', []):
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        self.grid[cell[0], cell[1]] = 7
-        for plant in self.plant_cells:
-            if plant.alive:
-                for cell in plant.cells.get('neutral', []):
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        self.grid[cell[0], cell[1]] = 10
-                for cell in plant.cells.get('leg', []):
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        self.grid[cell[0], cell[1]] = 11
-                for cell in plant.cells.get('eye', []):
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        self.grid[cell[0], cell[1]] = 12
-
-    def step(self):
-        self.cycle += 1
-        total_cells = self.grid_size * self.grid_size
-        food_count = len(self.food)
-        egg_count = len([egg for egg in self.eggs if not egg.hatched])
-        if total_cells == 0:
-            abundance = 1.0
-        else:
-            abundance = min(1.0, max(0.0, (food_count + egg_count) / total_cells))
-        if abundance >= 0.5:
-            coop_probability = 0.0
-        else:
-            coop_probability = 1.0 - (abundance * 2.0)
-        self.last_coop_probability = coop_probability
-
-        # Spawn egg random secara periodik
-        if self.cycle - getattr(self, "_last_random_egg_spawn", 0) >= self.random_egg_spawn_interval:
-            self.spawn_random_egg()
-            self._last_random_egg_spawn = self.cycle
-
-        if self.cycle - getattr(self, "_last_plant_spawn", 0) >= self.plant_spawn_interval:
-            empty_cells = [(x, y) for x in range(self.grid_size) for y in range(self.grid_size)
-                           if self.grid[x, y] == 0 and not any(pc.neutral == (x, y) for pc in self.plant_cells)]
-            if empty_cells:
-                px, py = random.choice(empty_cells)
-                self.add_plant_cell(px, py)
-            self._last_plant_spawn = self.cycle
-        for plant in self.plant_cells:
-            if plant.alive:
-                plant.move(self.grid_size, self.cycle, self.food)
-        for egg in self.eggs:
-            if not egg.hatched:
-                if egg.born_cycle is None:
-                    egg.born_cycle = self.cycle
-                if self.cycle - egg.born_cycle >= egg.incubate_cycles:
-                    egg.hatched = True
-                    hunger = self.hunger_cycles
-                    turn = self.turn_interval
-                    food_radius = self.food_radius
-                    lay_interval = self.lay_egg_interval
-                    maturity_cycles = self.maturity_cycles
-                    rarity = self.rarity
-                    recruit_radius = self.recruit_radius
-                    self.creatures.append(Creature(egg.x, egg.y, hunger, turn, food_radius, lay_interval, maturity_cycles, rarity, self, recruit_radius))
-        food_positions = set(self.food)
-        new_eggs = []
-        food_list = self.food
-        for creature in self.creatures:
-            if creature.alive:
-                egg_laid = creature.move(self.grid_size, food_positions, self.eggs, self.creatures, self.cycle, food_list, coop_probability)
-                if egg_laid:
-                    new_eggs.append(egg_laid)
-                creature.hunger -= 1
-                if creature.hunger <= 0:
-                    creature.alive = False
-        for creature in self.creatures:
-            if creature.alive:
-                for plant in self.plant_cells:
-                    if plant.alive and plant.neutral == creature.neutral:
-                        plant.alive = False
-                        creature.eat_and_grow()
-                        self.food.append(plant.neutral)
-        for creature in self.creatures:
-            if creature.alive:
-                for plant in self.plant_cells:
-                    if plant.alive:
-                        for cell in creature.all_cells():
-                            if cell == plant.neutral:
-                                plant.alive = False
-                                creature.eat_and_grow()
-                                self.food.append(plant.neutral)
-        for creature in self.creatures:
-            if not creature.alive:
-                for cell in creature.all_cells():
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        self.food.append(cell)
-        for plant in self.plant_cells:
-            if not plant.alive:
-                for cell in plant.all_cells():
-                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
-                        self.food.append(cell)
-        self.creatures = [c for c in self.creatures if c.alive]
-        self.plant_cells = [p for p in self.plant_cells if p.alive]
-        self.eggs += new_eggs
-        for creature in self.creatures:
-            if creature.age > self.max_creature_age:
-                self.max_creature_age = creature.age
-        self.update_grid()
-
 class GuideDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -1250,7 +229,6 @@ class SettingsDialog(QDialog):
         random_egg_spawn_interval = self.spin_random_egg_spawn.value()
         grid_size_changed = (self.game.grid_size != grid_size)
         self.game.grid_size = grid_size
-        self.game.cell_size = DEFAULT_GAME_AREA_SIZE // grid_size
         self.game.incubate_cycles = incubate_cycles
         self.game.hunger_cycles = hunger_cycles
         self.game.turn_interval = turn_interval
@@ -1465,7 +443,7 @@ class MainWindow(QMainWindow):
         self.update_coop_prob()
         self.update_max_hunger()
         self.widget.update()
-        if len(self.game.creatures) == 0 and len([egg for egg in self.game.eggs if not egg.hatched]) == 0 and len(self.game.plant_cells) == 0:
+        if self.game.is_extinct():
             if self.running:
                 self.timer.stop()
                 self.running = False
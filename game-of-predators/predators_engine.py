@@ -0,0 +1,1321 @@
+import itertools
+import random
+import numpy as np
+
+DEFAULT_GRID_SIZE = 100
+DEFAULT_INCU_CYCLES = 20
+DEFAULT_HUNGER_CYCLES = 200
+DEFAULT_TURN_INTERVAL = 10
+DEFAULT_food_radius = 20
+DEFAULT_LAY_EGG_INTERVAL = 10
+DEFAULT_MATURITY_CYCLES = 100
+DEFAULT_RARITY = 0.5
+DEFAULT_RECRUIT_RADIUS = 2
+
+DIRECTIONS = [
+    (1,0), (1,1), (0,1), (-1,1), (-1,0), (-1,-1), (0,-1), (1,-1)
+]
+
+COOP_ATTACH_DIRS = DIRECTIONS
+
+DEFAULT_IDLE_LIMIT = 10
+DEFAULT_PLANT_SPAWN_INTERVAL = 300
+DEFAULT_PLANT_LAY_FOOD_INTERVAL = 50
+
+# Tambahkan default interval untuk random egg spawn
+DEFAULT_RANDOM_EGG_SPAWN_INTERVAL = 400
+
+CANIBALITY_THRESHOLD = 0.25
+
+# Side of the square areas the target index groups food and eggs into
+TARGET_BUCKET_SIZE = 8
+
+class Egg:
+    def __init__(self, x, y, incubate_cycles):
+        self.x = x
+        self.y = y
+        self.incubate_cycles = incubate_cycles
+        self.born_cycle = None
+        self.hatched = False
+
+def _steps_along(lines):
+    # For every cell, the steps down axis 0 to the next True cell in its
+    # column and up axis 0 to the previous one, 0 where there is none
+    n = lines.shape[0]
+    rows = np.arange(n, dtype=np.int16)[:, None]
+    following = np.where(lines, rows, np.int16(n))[::-1]
+    following = np.minimum.accumulate(following, axis=0)[::-1]
+    preceding = np.maximum.accumulate(np.where(lines, rows, np.int16(-1)), axis=0)
+    ahead = np.zeros(lines.shape, dtype=np.int16)
+    behind = np.zeros(lines.shape, dtype=np.int16)
+    ahead[:-1] = np.where(following[1:] < n, following[1:] - rows[:-1], 0)
+    behind[1:] = np.where(preceding[:-1] >= 0, rows[1:] - preceding[:-1], 0)
+    return ahead, behind
+
+def _shear(grid):
+    # Row x shifted right by x, so each anti-diagonal x + y is a column.
+    # Going through a padded buffer makes both ways a reshape.
+    n = grid.shape[0]
+    padded = np.zeros((n, 2 * n), dtype=grid.dtype)
+    padded[:, :n] = grid
+    return padded.reshape(-1)[:n * (2 * n - 1)].reshape(n, 2 * n - 1)
+
+def _unshear(sheared):
+    n = sheared.shape[0]
+    flat = np.concatenate((sheared.reshape(-1), np.zeros(n, dtype=sheared.dtype)))
+    return flat.reshape(n, 2 * n)[:, :n]
+
+def sight_distances(mask, dx, dy):
+    # For the square grid `mask`, two arrays giving for every cell the steps
+    # to the next True cell in direction (dx, dy) and in the opposite
+    # direction, not counting the cell itself; 0 when the ray leaves the
+    # grid first. Each ray is a column of some view of the grid (the grid,
+    # its transpose, or a shear of it with y flipped or not), so one
+    # accumulate down the columns covers both directions.
+    if dx < 0 or (dx == 0 and dy < 0):
+        behind, ahead = sight_distances(mask, -dx, -dy)
+        return ahead, behind
+    if dy == 0:
+        return _steps_along(mask)
+    if dx == 0:
+        ahead, behind = _steps_along(mask.T)
+        return ahead.T, behind.T
+    if dy > 0:
+        ahead, behind = sight_distances(mask[:, ::-1], dx, -dy)
+        return ahead[:, ::-1], behind[:, ::-1]
+    ahead, behind = _steps_along(_shear(mask))
+    return _unshear(ahead), _unshear(behind)
+
+class TargetIndex:
+    # Food and unhatched eggs for one cycle, grouped by cell into square
+    # buckets so a creature looking for the nearest one only visits the
+    # buckets within its food radius. Food is a snapshot taken at the start
+    # of the cycle; eggs leave the index as they are eaten.
+    def __init__(self, food, eggs, grid_size, bucket_size=TARGET_BUCKET_SIZE):
+        self.grid_size = grid_size
+        self.bucket_size = bucket_size
+        self.food = set(food)
+        self.eggs = {}  # cell -> unhatched eggs on it, in game order
+        self.buckets = {}
+        # Bucket keys span [0, _key_max] on both axes unless a target sits
+        # off the grid, which widens the range
+        self._key_min = 0
+        self._key_max = (grid_size - 1) // bucket_size
+        self._mask = None  # target cells as a grid, for the sight distances
+        self._sight = {}  # direction -> steps to the next target, built on first use
+        for cell in self.food:
+            self._add(cell)
+        for egg in eggs:
+            if not egg.hatched:
+                cell = (egg.x, egg.y)
+                if cell in self.eggs:
+                    self.eggs[cell].append(egg)
+                else:
+                    self.eggs[cell] = [egg]
+                    if cell not in self.food:
+                        self._add(cell)
+
+    def _add(self, cell):
+        key = (cell[0] // self.bucket_size, cell[1] // self.bucket_size)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self._key_min = min(self._key_min, *key)
+            self._key_max = max(self._key_max, *key)
+            self.buckets[key] = {cell}
+        else:
+            bucket.add(cell)
+
+    def __contains__(self, cell):
+        return cell in self.food or cell in self.eggs
+
+    def eggs_at(self, cell):
+        return self.eggs.get(cell, ())
+
+    def remove_egg(self, egg):
+        cell = (egg.x, egg.y)
+        on_cell = self.eggs[cell]
+        on_cell.remove(egg)
+        if on_cell:
+            return
+        del self.eggs[cell]
+        if cell not in self.food:
+            key = (cell[0] // self.bucket_size, cell[1] // self.bucket_size)
+            bucket = self.buckets[key]
+            bucket.discard(cell)
+            if not bucket:
+                del self.buckets[key]
+
+    def nearest(self, x, y, radius):
+        # Closest target within `radius` steps (Manhattan), ties going to
+        # the smaller cell. Buckets are visited in rings around the one
+        # holding (x, y); ring k is at least (k - 1) * bucket_size + 1 steps
+        # away, so the rings stop once that passes the best distance found,
+        # or once they lie wholly outside the buckets that can hold targets.
+        if not self.buckets:
+            return None
+        size = self.bucket_size
+        bx, by = x // size, y // size
+        lo, hi = self._key_min, self._key_max
+        last = max(bx - lo, hi - bx, by - lo, hi - by)
+        best = (radius + 1,)
+        k = 0
+        while k <= last and (k - 1) * size < best[0]:
+            for key in self._ring(bx, by, k):
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    for cell in bucket:
+                        candidate = (abs(cell[0] - x) + abs(cell[1] - y), cell)
+                        if candidate < best:
+                            best = candidate
+            k += 1
+        return best[1] if len(best) == 2 else None
+
+    def in_sight(self, x, y, dx, dy):
+        # Whether a target lies on the ray from (x, y) in direction (dx, dy)
+        # before the world edge, not counting (x, y). The distances are from
+        # the start of the cycle, so hop over targets eaten since then.
+        n = self.grid_size
+        if not (0 <= x < n and 0 <= y < n):
+            return False
+        ahead = self._sight.get((dx, dy))
+        if ahead is None:
+            if self._mask is None:
+                self._mask = np.zeros((n, n), dtype=bool)
+                for cx, cy in self.food.union(self.eggs):
+                    if 0 <= cx < n and 0 <= cy < n:
+                        self._mask[cx, cy] = True
+            ahead, behind = sight_distances(self._mask, dx, dy)
+            self._sight[(dx, dy)] = ahead
+            self._sight[(-dx, -dy)] = behind
+        while True:
+            steps = int(ahead[x, y])
+            if steps == 0:
+                return False
+            x += dx * steps
+            y += dy * steps
+            if (x, y) in self:
+                return True
+
+    def _ring(self, bx, by, k):
+        if k == 0:
+            yield bx, by
+            return
+        for i in range(-k, k + 1):
+            yield bx + i, by - k
+            yield bx + i, by + k
+        for j in range(-k + 1, k):
+            yield bx - k, by + j
+            yield bx + k, by + j
+
+class CellOccupancy:
+    # The (organism, part) entries on each cell, for one cycle. Organisms
+    # register again whenever their cells change, so a lookup sees where
+    # everything is right now. Dead organisms stay in; callers skip them.
+    def __init__(self, organisms=()):
+        self.cells = {}  # cell -> [(organism, part), ...]
+        self._placed = {}  # organism -> the cells it was last placed on
+        for organism in organisms:
+            self.place(organism)
+
+    def place(self, organism):
+        for cell in self._placed.get(organism, ()):
+            entries = self.cells[cell]
+            entries[:] = [entry for entry in entries if entry[0] is not organism]
+            if not entries:
+                del self.cells[cell]
+        placed = []
+        for part, part_cells in organism.cells.items():
+            for cell in part_cells:
+                self.cells.setdefault(cell, []).append((organism, part))
+                placed.append(cell)
+        self._placed[organism] = placed
+
+    def at(self, cell):
+        return self.cells.get(cell, ())
+
+class PopulationSummary:
+    # Counts the creatures check on every move and meal, taken once at the
+    # start of a cycle and then kept up to date as organisms are born and
+    # die, eggs are laid and eaten, and coop groups change
+    def __init__(self, game):
+        self.game = game
+        self.creatures = 0
+        self.plants = sum(1 for plant in game.plant_cells if plant.alive)
+        self.eggs = sum(1 for egg in game.eggs if not egg.hatched)
+        self._groups = {}  # id(group) -> [group, live members]
+        for creature in game.creatures:
+            if creature.alive:
+                self.creature_born(creature)
+
+    def creature_born(self, creature):
+        self.creatures += 1
+        if creature.coop_group:
+            self._join(creature.coop_group)
+
+    def creature_died(self, creature):
+        self.creatures -= 1
+        if creature.coop_group:
+            self._leave(creature.coop_group)
+
+    def regroup(self, creature, group):
+        # Call before a live creature's coop_group changes
+        if creature.coop_group:
+            self._leave(creature.coop_group)
+        if group:
+            self._join(group)
+
+    def _join(self, group):
+        entry = self._groups.get(id(group))
+        if entry is None:
+            self._groups[id(group)] = [group, 1]
+        else:
+            entry[1] += 1
+
+    def _leave(self, group):
+        entry = self._groups[id(group)]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._groups[id(group)]
+
+    def coop_groups(self):
+        return len(self._groups)
+
+    def living_cells(self):
+        return self.creatures + self.plants
+
+    def abundance(self):
+        # Food and eggs per grid cell
+        return (len(self.game.food) + self.eggs) / max(1, self.game.grid_size * self.game.grid_size)
+
+class PlantCell:
+    def __init__(self, x, y, lay_food_interval=DEFAULT_PLANT_LAY_FOOD_INTERVAL, game=None, random_features=True):
+        self.neutral = (x, y)
+        self.direction_idx = random.randint(0, 7)
+        self.direction = DIRECTIONS[self.direction_idx]
+        self.cells = {'neutral': [(x, y)]}
+        self.has_leg = False
+        self.has_eye = False
+        self.has_weapon = False
+        self.lay_food_interval = lay_food_interval
+        self.last_lay_cycle = 0
+        self.age = 0
+        self.alive = True
+        self.game = game
+        self.last_position = self.neutral
+        self.idle_counter = 0
+        self.idle_limit = getattr(game, "idle_limit", DEFAULT_IDLE_LIMIT) if game else DEFAULT_IDLE_LIMIT
+        if random_features:
+            if random.random() < 0.5:
+                self.has_leg = True
+            if random.random() < 0.5:
+                self.has_eye = True
+            self._update_attached_cells()
+
+    def _update_attached_cells(self):
+        tx, ty = self.neutral
+        dx, dy = self.direction
+        if self.has_leg:
+            self.cells['leg'] = [(tx - dx, ty - dy)]
+        if self.has_eye:
+            ex, ey = dy, -dx
+            self.cells['eye'] = [(tx + ex, ty + ey)]
+        if self.game and self.game.occupancy is not None:
+            self.game.occupancy.place(self)
+
+    def rotate(self):
+        self.direction_idx = random.randint(0, 7)
+        self.direction = DIRECTIONS[self.direction_idx]
+        self._update_attached_cells()
+
+    def move(self, grid_size, current_cycle, food_list):
+        self.age += 1
+        speed = 1 + (1 if self.has_leg else 0)
+        for _ in range(speed):
+            self.direction_idx = random.randint(0, 7)
+            self.direction = DIRECTIONS[self.direction_idx]
+            dx, dy = self.direction
+            nx, ny = self.neutral
+            tx, ty = nx + dx, ny + dy
+            if 0 <= tx < grid_size and 0 <= ty < grid_size:
+                self.neutral = (tx, ty)
+                self.cells['neutral'] = [self.neutral]
+                self._update_attached_cells()
+                if self.last_position != self.neutral:
+                    self.idle_counter = 0
+                    self.last_position = self.neutral
+                else:
+                    self.idle_counter += 1
+            else:
+                self.rotate()
+                self.idle_counter += 1
+                continue
+            if current_cycle - self.last_lay_cycle >= self.lay_food_interval:
+                tx, ty = self.neutral
+                self.last_lay_cycle = current_cycle
+                food_list.append((tx, ty))
+            if self.idle_counter >= self.idle_limit:
+                self.die()
+
+    def die(self):
+        if self.alive:
+            self.alive = False
+            if self.game and self.game.population is not None:
+                self.game.population.plants -= 1
+
+    def cell_count(self):
+        count = 0
+        for v in self.cells.values():
+            count += len(v)
+        return count
+
+    def feature_count(self):
+        count = 0
+        if self.has_leg:
+            count += 1
+        if self.has_eye:
+            count += 1
+        return count
+
+    def all_cells(self):
+        result = []
+        for v in self.cells.values():
+            result.extend(v)
+        return result
+
+    def grow(self, part):
+        if self.feature_count() >= 2:
+            return
+        options = []
+        if not self.has_leg:
+            options.append('leg')
+        if not self.has_eye:
+            options.append('eye')
+        if options:
+            if part == 'random':
+                chosen = random.choice(options)
+            else:
+                chosen = part
+            if chosen == 'leg' and not self.has_leg:
+                self.has_leg = True
+            elif chosen == 'eye' and not self.has_eye:
+                self.has_eye = True
+            self._update_attached_cells()
+
+class Creature:
+    def __init__(self, x, y, hunger_cycles, turn_interval, food_radius, lay_egg_interval=DEFAULT_LAY_EGG_INTERVAL, maturity_cycles=DEFAULT_MATURITY_CYCLES, rarity=DEFAULT_RARITY, game=None, recruit_radius=DEFAULT_RECRUIT_RADIUS):
+        self.neutral = (x, y)
+        self.direction_idx = random.randint(0, 7)
+        self.direction = DIRECTIONS[self.direction_idx]
+        self.cells = {'neutral': [(x, y)]}
+        self.hunger_cycles = hunger_cycles
+        self.turn_interval = turn_interval
+        self.food_radius = food_radius
+        self.born_cycle = 0
+        self.hunger = hunger_cycles
+        self.steps_since_turn = 0
+        self.has_weapon = False
+        self.has_leg = False
+        self.has_eye = False
+        self.alive = True
+        self.last_lay_cycle = 0
+        self.lay_egg_interval = lay_egg_interval
+        self.age = 0
+        self.maturity_cycles = maturity_cycles
+        self.is_old = False
+        self.old_since = None
+        self.last_feature_loss_age = None
+        self.rarity = rarity
+        self.game = game
+        self.coop_group = None
+        self.last_coop_cycle = -1
+        self.coop_leader = None
+        self.recruit_radius = recruit_radius
+        self.is_nucleus = False
+        self.last_position = self.neutral
+        self.idle_counter = 0
+        self.idle_limit = getattr(game, "idle_limit", DEFAULT_IDLE_LIMIT) if game else DEFAULT_IDLE_LIMIT
+        self.uid = next(game.creature_ids) if game else 0
+
+    def __hash__(self):
+        # Coop groups are sets of creatures; hashing by a per-game number
+        # instead of the address makes their order, and so a seeded game,
+        # the same on every run
+        return self.uid
+
+    def rotate(self):
+        self.direction_idx = random.randint(0, 7)
+        self.direction = DIRECTIONS[self.direction_idx]
+        self._update_attached_cells()
+
+    def _update_attached_cells(self):
+        tx, ty = self.neutral
+        dx, dy = self.direction
+        if self.has_weapon:
+            self.cells['weapon'] = [(tx + dx, ty + dy)]
+        if self.has_leg:
+            self.cells['leg'] = [(tx - dx, ty - dy)]
+        if self.has_eye:
+            ex, ey = dy, -dx
+            self.cells['eye'] = [(tx + ex, ty + ey)]
+        self._place()
+
+    def _place(self):
+        if self.game and self.game.occupancy is not None:
+            self.game.occupancy.place(self)
+
+    def die(self):
+        if self.alive:
+            self.alive = False
+            if self.game and self.game.population is not None:
+                self.game.population.creature_died(self)
+
+    def _set_coop_group(self, group):
+        if self.alive and self.game and self.game.population is not None:
+            self.game.population.regroup(self, group)
+        self.coop_group = group
+
+    def maybe_lose_feature(self):
+        if not self.is_old:
+            return
+        if self.last_feature_loss_age is not None:
+            if self.age - self.last_feature_loss_age < self.maturity_cycles:
+                return
+        features = []
+        if self.has_weapon:
+            features.append('weapon')
+        if self.has_leg:
+            features.append('leg')
+        if self.has_eye:
+            features.append('eye')
+        if not features:
+            return
+        max_prob = 0.8
+        min_prob = 0.05
+        old_age = self.age - self.maturity_cycles
+        prob = min_prob + min(max_prob - min_prob, old_age / (self.maturity_cycles * 2))
+        if random.random() < prob:
+            lost = random.choice(features)
+            if lost == 'weapon':
+                self.has_weapon = False
+                self.cells.pop('weapon', None)
+            elif lost == 'leg':
+                self.has_leg = False
+                self.cells.pop('leg', None)
+            elif lost == 'eye':
+                self.has_eye = False
+                self.cells.pop('eye', None)
+            self._place()
+            self.last_feature_loss_age = self.age
+
+    def can_cooperate_with(self, other, creatures):
+        if not self.alive or not other.alive:
+            return False
+        if not (self.is_old or other.is_old):
+            return False
+        if self.coop_group and other.coop_group and self.coop_group is not other.coop_group:
+            if any(c.is_nucleus for c in self.coop_group) and any(c.is_nucleus for c in other.coop_group):
+                pass
+            else:
+                return False
+        elif (self.coop_group and any(c.is_nucleus for c in self.coop_group)) or (other.coop_group and any(c.is_nucleus for c in other.coop_group)):
+            if self.coop_group is not None and other.coop_group is not None and self.coop_group is not other.coop_group:
+                return False
+        if self.coop_group is not None and other.coop_group is not None and self.coop_group is other.coop_group:
+            return False
+        x1, y1 = self.neutral
+        x2, y2 = other.neutral
+        if max(abs(x1 - x2), abs(y1 - y2)) <= self.recruit_radius:
+            return True
+        return False
+
+    def try_cooperate(self, other, coop_probability, current_cycle, creatures):
+        if not self.can_cooperate_with(other, creatures):
+            return False
+        if self.coop_group and other.coop_group and self.coop_group is not other.coop_group:
+            if any(c.is_nucleus for c in self.coop_group) and any(c.is_nucleus for c in other.coop_group):
+                recruiter = None
+                for c in self.coop_group:
+                    if c.is_nucleus:
+                        recruiter = c
+                        break
+                if recruiter is None:
+                    recruiter = self
+                coop_chance = coop_probability
+                if random.random() < coop_chance:
+                    merged = self.coop_group | other.coop_group
+                    nucleus = recruiter
+                    for member in merged:
+                        member._set_coop_group(merged)
+                        member.coop_leader = nucleus
+                        member.last_coop_cycle = current_cycle
+                        member.is_nucleus = (member is nucleus)
+                        if hasattr(member, "group_hunger"):
+                            delattr(member, "group_hunger")
+                    self._enforce_group_features(merged)
+                    return True
+                return False
+        if self.is_nucleus or other.is_nucleus:
+            recruiter = self if self.is_nucleus else other if other.is_nucleus else self if self.is_old else other
+        else:
+            recruiter = self if self.is_old else other if other.is_old else None
+        if recruiter is None:
+            return False
+        joined = False
+        if self.is_old and other.is_old:
+            coop_chance = 1.0
+        else:
+            coop_chance = coop_probability
+        if random.random() < coop_chance:
+            self._pending_coop = True
+            other._pending_coop = True
+            if self.coop_group and other.coop_group:
+                merged = self.coop_group | other.coop_group
+            elif self.coop_group:
+                merged = self.coop_group | set([other])
+            elif other.coop_group:
+                merged = other.coop_group | set([self])
+            else:
+                merged = set([self, other])
+            nucleus = None
+            for m in merged:
+                if m.is_nucleus:
+                    nucleus = m
+                    break
+            if not nucleus:
+                recruiter.is_nucleus = True
+                nucleus = recruiter
+            for member in merged:
+                member._set_coop_group(merged)
+                member.coop_leader = nucleus
+                member.last_coop_cycle = current_cycle
+                member.is_nucleus = (member is nucleus)
+                if hasattr(member, "group_hunger"):
+                    delattr(member, "group_hunger")
+            self.attach_to_coop_group_outermost(other, merged, creatures)
+            self._enforce_group_features(merged)
+            joined = True
+        return joined
+
+    def _enforce_group_features(self, group):
+        weapon_owner = None
+        leg_owner = None
+        eye_owner = None
+        for member in group:
+            if member.has_weapon and weapon_owner is None:
+                weapon_owner = member
+            elif member.has_weapon:
+                member.has_weapon = False
+                member.cells.pop('weapon', None)
+            if member.has_leg and leg_owner is None:
+                leg_owner = member
+            elif member.has_leg:
+                member.has_leg = False
+                member.cells.pop('leg', None)
+            if member.has_eye and eye_owner is None:
+                eye_owner = member
+            elif member.has_eye:
+                member.has_eye = False
+                member.cells.pop('eye', None)
+        for member in group:
+            member._update_attached_cells()
+
+    def attach_to_coop_group_outermost(self, other, group, creatures):
+        group_cells = {c.neutral for c in group}
+        occupied = group_cells | {c.neutral for c in creatures if c.alive and c not in group}
+        possible = set()
+        for gx, gy in group_cells:
+            for dx, dy in COOP_ATTACH_DIRS:
+                nx, ny = gx + dx, gy + dy
+                if (nx, ny) not in occupied and 0 <= nx < (self.game.grid_size if self.game else 100) and 0 <= ny < (self.game.grid_size if self.game else 100):
+                    possible.add((nx, ny))
+        if possible:
+            pos = random.choice(list(possible))
+            other.neutral = pos
+            other.cells['neutral'] = [pos]
+            other._update_attached_cells()
+        else:
+            self.attach_to_coop_group(other)
+
+    def attach_to_coop_group(self, other):
+        group = self.coop_group if self.coop_group else set([self])
+        group_cells = [c.neutral for c in group]
+        possible = set()
+        for gx, gy in group_cells:
+            for dx, dy in COOP_ATTACH_DIRS:
+                nx, ny = gx + dx, gy + dy
+                if (nx, ny) not in group_cells:
+                    possible.add((nx, ny))
+        if possible:
+            pos = random.choice(list(possible))
+            other.neutral = pos
+            other.cells['neutral'] = [pos]
+            other._update_attached_cells()
+
+    def move_coop_group(self, grid_size, targets, creatures, current_cycle, food_list, coop_probability):
+        if not self.is_nucleus:
+            return None
+        group = [c for c in self.coop_group if c.alive]
+        leader = self
+        group_size = len(group)
+        if not hasattr(leader, "group_hunger") or getattr(leader, "_last_group_size", None) != group_size:
+            leader.group_hunger = leader.hunger_cycles * group_size
+            leader._last_group_size = group_size
+        if len(group) == 1 and leader.is_nucleus:
+            leader.die()
+            return None
+        leader.group_hunger -= 1
+        if leader.group_hunger <= 0:
+            for member in group:
+                member.die()
+            return None
+        for member in group:
+            member.hunger -= 1
+            if member.hunger <= 0:
+                member.die()
+        for member in group:
+            member.age += 1
+            if not member.is_old and member.age >= member.maturity_cycles:
+                member.is_old = True
+                member.old_since = member.age
+            if member.is_old:
+                member.maybe_lose_feature()
+        speed = 1 + (1 if leader.has_leg else 0)
+        for _ in range(speed):
+            leader.steps_since_turn += 1
+            head_x, head_y = leader.neutral
+            if leader.has_eye:
+                eye_pos = leader.cells['eye'][0]
+                ex, ey = eye_pos
+                dx_eye = ex - head_x
+                dy_eye = ey - head_y
+                if dx_eye != 0 or dy_eye != 0:
+                    if targets.in_sight(ex, ey, dx_eye, dy_eye):
+                        nx, ny = leader.neutral
+                        tx, ty = nx + dx_eye, ny + dy_eye
+                        if 0 <= tx < grid_size and 0 <= ty < grid_size:
+                            if (dx_eye, dy_eye) in DIRECTIONS:
+                                leader.direction_idx = DIRECTIONS.index((dx_eye, dy_eye))
+                                leader.direction = DIRECTIONS[leader.direction_idx]
+                            leader.neutral = (tx, ty)
+                            leader.cells['neutral'] = [leader.neutral]
+                            leader._update_attached_cells()
+                            if leader.last_position != leader.neutral:
+                                leader.idle_counter = 0
+                                leader.last_position = leader.neutral
+                            else:
+                                leader.idle_counter += 1
+                            continue
+            elif (nearest_target := targets.nearest(head_x, head_y, leader.food_radius)):
+                dx = np.sign(nearest_target[0] - head_x)
+                dy = np.sign(nearest_target[1] - head_y)
+                if (dx, dy) in DIRECTIONS:
+                    leader.direction_idx = DIRECTIONS.index((dx, dy))
+                    leader.direction = DIRECTIONS[leader.direction_idx]
+            if leader.steps_since_turn >= leader.turn_interval:
+                leader.rotate()
+                leader.steps_since_turn = 0
+            dx, dy = leader.direction
+            nx, ny = leader.neutral
+            tx, ty = nx + dx, ny + dy
+            if 0 <= tx < grid_size and 0 <= ty < grid_size:
+                leader.neutral = (tx, ty)
+                leader.cells['neutral'] = [leader.neutral]
+                leader._update_attached_cells()
+                if leader.last_position != leader.neutral:
+                    leader.idle_counter = 0
+                    leader.last_position = leader.neutral
+                else:
+                    leader.idle_counter += 1
+            else:
+                leader.rotate()
+                leader.idle_counter += 1
+                continue
+            self.recruit_nearby(leader, creatures, coop_probability, current_cycle)
+            if leader.has_weapon:
+                leader._weapon_strike()
+            if hasattr(leader, "_pending_coop"):
+                del leader._pending_coop
+            population = leader.game.population if leader.game else None
+            food_count = len(leader.game.food) if leader.game else 0
+            total_living_cells = population.living_cells() if population else 0
+            total_creature = population.creatures if population else 0
+            total_group = population.coop_groups() if population else 0
+            # Prevent cannibalism if only 1 creature or only 1 group exists and no other single creatures
+            only_one_group = total_group == 1 and total_creature == len(group)
+            can_eat_egg = food_count >= total_living_cells and total_creature > 1 and not only_one_group
+            group_lay_egg = False
+            if leader.game:
+                if total_creature <= max(2, leader.game.grid_size // 10):
+                    group_lay_egg = True
+            if leader.feature_count() == 3 and current_cycle - leader.last_lay_cycle >= leader.lay_egg_interval:
+                tx, ty = leader.neutral
+                leader.last_lay_cycle = current_cycle
+                return Egg(tx, ty, leader.hunger_cycles)
+            elif group_lay_egg and current_cycle - leader.last_lay_cycle >= leader.lay_egg_interval:
+                tx, ty = leader.neutral
+                leader.last_lay_cycle = current_cycle
+                return Egg(tx, ty, leader.hunger_cycles)
+            if can_eat_egg:
+                for egg in list(targets.eggs_at(leader.neutral)):
+                    self._group_eat_and_grow(group)
+                    egg.hatched = True
+                    targets.remove_egg(egg)
+                    if population:
+                        population.eggs -= 1
+            for idx, (fx, fy) in enumerate(food_list):
+                if (fx, fy) == leader.neutral:
+                    self._group_eat_and_grow(group)
+                    food_list.pop(idx)
+                    break
+            if leader.cell_count() > 4:
+                leader.die()
+            if leader.idle_counter >= leader.idle_limit:
+                leader.die()
+        if leader.alive:
+            members = [m for m in group if m is not leader]
+            n_members = len(members)
+            if n_members > 0:
+                cx, cy = leader.neutral
+                radius = 1
+                angle_step = 2 * np.pi / n_members if n_members > 0 else 0
+                used_positions = set([leader.neutral])
+                for idx, member in enumerate(members):
+                    angle = idx * angle_step
+                    # Cari radius yang tidak bertabrakan
+                    found = False
+                    for r in range(1, max(2, grid_size // 2)):
+                        nx = int(round(cx + r * np.cos(angle)))
+                        ny = int(round(cy + r * np.sin(angle)))
+                        if 0 <= nx < grid_size and 0 <= ny < grid_size and (nx, ny) not in used_positions:
+                            member.neutral = (nx, ny)
+                            member.cells['neutral'] = [member.neutral]
+                            member._update_attached_cells()
+                            member.steps_since_turn = leader.steps_since_turn
+                            member.direction_idx = leader.direction_idx
+                            member.direction = leader.direction
+                            if member.last_position != (nx, ny):
+                                member.idle_counter = 0
+                                member.last_position = (nx, ny)
+                            else:
+                                member.idle_counter += 1
+                            used_positions.add((nx, ny))
+                            found = True
+                            break
+                    if not found:
+                        # fallback: random nearby
+                        for dx in range(-1, 2):
+                            for dy in range(-1, 2):
+                                nx = cx + dx
+                                ny = cy + dy
+                                if 0 <= nx < grid_size and 0 <= ny < grid_size and (nx, ny) not in used_positions:
+                                    member.neutral = (nx, ny)
+                                    member.cells['neutral'] = [member.neutral]
+                                    member._update_attached_cells()
+                                    used_positions.add((nx, ny))
+                                    break
+        for member in group:
+            self.recruit_nearby(member, creatures, coop_probability, current_cycle)
+            if member.has_weapon:
+                member._weapon_strike()
+            if hasattr(member, "_pending_coop"):
+                del member._pending_coop
+            population = member.game.population if member.game else None
+            food_count = len(member.game.food) if member.game else 0
+            total_living_cells = population.living_cells() if population else 0
+            total_creature = population.creatures if population else 0
+            total_group = population.coop_groups() if population else 0
+            only_one_group = total_group == 1 and total_creature == len(group)
+            can_eat_egg = food_count >= total_living_cells and total_creature > 1 and not only_one_group
+            if can_eat_egg:
+                for egg in list(targets.eggs_at(member.neutral)):
+                    self._group_eat_and_grow(group)
+                    egg.hatched = True
+                    targets.remove_egg(egg)
+                    if population:
+                        population.eggs -= 1
+            for idx, (fx, fy) in enumerate(food_list):
+                if (fx, fy) == member.neutral:
+                    self._group_eat_and_grow(group)
+                    food_list.pop(idx)
+                    break
+            if member.cell_count() > 4:
+                member.die()
+            if member.idle_counter >= member.idle_limit:
+                member.die()
+        return None
+
+    def _weapon_strike(self):
+        # Kills the creatures outside this one's coop group that have their
+        # neutral, leg or eye on this one's weapon cell, unless their own
+        # weapon is there too
+        hits = {}
+        for cell in set(self.cells.get('weapon', [])):
+            for organism, part in self.game.occupancy.at(cell):
+                if isinstance(organism, Creature):
+                    hits.setdefault(organism, set()).add(part)
+        for c, parts in hits.items():
+            if c is not self and c.alive and (self.coop_group is None or c.coop_group is None or self.coop_group != c.coop_group):
+                if 'weapon' not in parts and not (getattr(self, "_pending_coop", False) and getattr(c, "_pending_coop", False)):
+                    c.die()
+
+    def _group_eat_and_grow(self, group):
+        for member in group:
+            if member.feature_count() < 3:
+                rarity_factor = member.rarity
+                if member.game:
+                    abundance = member.game.population.abundance()
+                    rarity_factor = min(1.0, max(0.0, member.rarity + abundance * 0.8 - 0.2))
+                if rarity_factor == 0.0 or random.random() > rarity_factor:
+                    member.grow('random')
+            member.hunger += member.hunger_cycles
+
+    def move(self, grid_size, targets, creatures, current_cycle, food_list, coop_probability):
+        if self.coop_group and self.is_nucleus:
+            return self.move_coop_group(grid_size, targets, creatures, current_cycle, food_list, coop_probability)
+        elif self.coop_group:
+            return None
+        self.age += 1
+        if not self.is_old and self.age >= self.maturity_cycles:
+            self.is_old = True
+            self.old_since = self.age
+        if self.is_old:
+            self.maybe_lose_feature()
+        speed = 1 + (1 if self.has_leg else 0)
+        for _ in range(speed):
+            self.steps_since_turn += 1
+            head_x, head_y = self.neutral
+            if self.has_eye:
+                eye_pos = self.cells['eye'][0]
+                ex, ey = eye_pos
+                dx_eye = ex - head_x
+                dy_eye = ey - head_y
+                if dx_eye != 0 or dy_eye != 0:
+                    if targets.in_sight(ex, ey, dx_eye, dy_eye):
+                        nx, ny = self.neutral
+                        tx, ty = nx + dx_eye, ny + dy_eye
+                        if 0 <= tx < grid_size and 0 <= ty < grid_size:
+                            if (dx_eye, dy_eye) in DIRECTIONS:
+                                self.direction_idx = DIRECTIONS.index((dx_eye, dy_eye))
+                                self.direction = DIRECTIONS[self.direction_idx]
+                            self.neutral = (tx, ty)
+                            self.cells['neutral'] = [self.neutral]
+                            self._update_attached_cells()
+                            if self.last_position != self.neutral:
+                                self.idle_counter = 0
+                                self.last_position = self.neutral
+                            else:
+                                self.idle_counter += 1
+                            continue
+            elif (nearest_target := targets.nearest(head_x, head_y, self.food_radius)):
+                dx = np.sign(nearest_target[0] - head_x)
+                dy = np.sign(nearest_target[1] - head_y)
+                if (dx, dy) in DIRECTIONS:
+                    self.direction_idx = DIRECTIONS.index((dx, dy))
+                    self.direction = DIRECTIONS[self.direction_idx]
+            if self.steps_since_turn >= self.turn_interval:
+                self.rotate()
+                self.steps_since_turn = 0
+            dx, dy = self.direction
+            nx, ny = self.neutral
+            tx, ty = nx + dx, ny + dy
+            if 0 <= tx < grid_size and 0 <= ty < grid_size:
+                self.neutral = (tx, ty)
+                self.cells['neutral'] = [self.neutral]
+                self._update_attached_cells()
+                if self.last_position != self.neutral:
+                    self.idle_counter = 0
+                    self.last_position = self.neutral
+                else:
+                    self.idle_counter += 1
+            else:
+                self.rotate()
+                self.idle_counter += 1
+                continue
+            self.recruit_nearby(self, creatures, coop_probability, current_cycle)
+            if self.has_weapon:
+                self._weapon_strike()
+            if hasattr(self, "_pending_coop"):
+                del self._pending_coop
+            population = self.game.population if self.game else None
+            food_count = len(self.game.food) if self.game else 0
+            total_living_cells = population.living_cells() if population else 0
+            can_eat_egg = food_count >= total_living_cells
+            if can_eat_egg:
+                for egg in list(targets.eggs_at(self.neutral)):
+                    self.eat_and_grow()
+                    egg.hatched = True
+                    targets.remove_egg(egg)
+                    if population:
+                        population.eggs -= 1
+            for idx, (fx, fy) in enumerate(food_list):
+                if (fx, fy) == self.neutral:
+                    self.eat_and_grow()
+                    food_list.pop(idx)
+                    break
+            if self.cell_count() > 4:
+                self.die()
+            if self.idle_counter >= self.idle_limit:
+                self.die()
+        if self.feature_count() == 3 and current_cycle - self.last_lay_cycle >= self.lay_egg_interval:
+            tx, ty = self.neutral
+            self.last_lay_cycle = current_cycle
+            return Egg(tx, ty, self.hunger_cycles)
+        return None
+
+    def recruit_nearby(self, self_creature, creatures, coop_probability, current_cycle):
+        for other in creatures:
+            if other is self_creature:
+                continue
+            if not other.alive:
+                continue
+            if self_creature.coop_group is not None and other.coop_group is not None and self_creature.coop_group is other.coop_group:
+                continue
+            if self_creature.can_cooperate_with(other, creatures):
+                self_creature.try_cooperate(other, coop_probability, current_cycle, creatures)
+
+    def eat_and_grow(self):
+        if self.coop_group:
+            group = [c for c in self.coop_group if c.alive]
+            self._group_eat_and_grow(group)
+        else:
+            if self.feature_count() < 3:
+                rarity_factor = self.rarity
+                if self.game:
+                    abundance = self.game.population.abundance()
+                    rarity_factor = min(1.0, max(0.0, self.rarity + abundance * 0.8 - 0.2))
+                if rarity_factor == 0.0 or random.random() > rarity_factor:
+                    self.grow('random')
+            self.hunger += self.hunger_cycles
+
+    def grow(self, part):
+        if self.feature_count() >= 3:
+            return
+        options = []
+        if not self.has_weapon:
+            options.append('weapon')
+        if not self.has_leg:
+            options.append('leg')
+        if not self.has_eye:
+            options.append('eye')
+        if options:
+            if part == 'random':
+                chosen = random.choice(options)
+            else:
+                chosen = part
+            if chosen == 'weapon' and not self.has_weapon:
+                self.has_weapon = True
+            elif chosen == 'leg' and not self.has_leg:
+                self.has_leg = True
+            elif chosen == 'eye' and not self.has_eye:
+                self.has_eye = True
+            self._update_attached_cells()
+
+    def cell_count(self):
+        count = 0
+        for v in self.cells.values():
+            count += len(v)
+        return count
+
+    def feature_count(self):
+        count = 0
+        if self.has_weapon:
+            count += 1
+        if self.has_leg:
+            count += 1
+        if self.has_eye:
+            count += 1
+        return count
+
+    def all_cells(self):
+        result = []
+        for v in self.cells.values():
+            result.extend(v)
+        return result
+
+class Game:
+    def __init__(self, grid_size=DEFAULT_GRID_SIZE, incubate_cycles=DEFAULT_INCU_CYCLES, hunger_cycles=DEFAULT_HUNGER_CYCLES, turn_interval=DEFAULT_TURN_INTERVAL, food_radius=DEFAULT_food_radius, lay_egg_interval=DEFAULT_LAY_EGG_INTERVAL, maturity_cycles=DEFAULT_MATURITY_CYCLES, rarity=DEFAULT_RARITY, recruit_radius=DEFAULT_RECRUIT_RADIUS, plant_spawn_interval=DEFAULT_PLANT_SPAWN_INTERVAL, plant_lay_food_interval=DEFAULT_PLANT_LAY_FOOD_INTERVAL, random_egg_spawn_interval=DEFAULT_RANDOM_EGG_SPAWN_INTERVAL):
+        self.grid_size = grid_size
+        self.incubate_cycles = incubate_cycles
+        self.hunger_cycles = hunger_cycles
+        self.turn_interval = turn_interval
+        self.food_radius = food_radius
+        self.lay_egg_interval = lay_egg_interval
+        self.maturity_cycles = maturity_cycles
+        self.rarity = rarity
+        self.recruit_radius = recruit_radius
+        self.idle_limit = DEFAULT_IDLE_LIMIT
+        self.plant_spawn_interval = plant_spawn_interval
+        self.plant_lay_food_interval = plant_lay_food_interval
+        self.random_egg_spawn_interval = random_egg_spawn_interval
+        self.reset()
+        self.max_creature_age = 0
+        self.last_coop_probability = 0.0
+
+    def reset(self):
+        self.eggs = []
+        self.creatures = []
+        self.food = []
+        self.grid = np.zeros((self.grid_size, self.grid_size), dtype=np.uint8)
+        self.cycle = 0
+        self.max_creature_age = 0
+        self.last_coop_probability = 0.0
+        self.plant_cells = []
+        self._last_plant_spawn = 0
+        self._last_random_egg_spawn = 0
+        self.creature_ids = itertools.count()
+        self.occupancy = None
+        self.population = None
+
+    def add_egg(self, x, y):
+        for egg in self.eggs:
+            if egg.x == x and egg.y == y:
+                return
+        self.eggs.append(Egg(x, y, self.incubate_cycles))
+        if self.population is not None:
+            self.population.eggs += 1
+
+    def add_food(self, x, y):
+        if (x, y) not in self.food:
+            self.food.append((x, y))
+
+    def add_plant_cell(self, x, y):
+        if any(pc.neutral == (x, y) for pc in self.plant_cells):
+            return
+        self.plant_cells.append(PlantCell(x, y, self.plant_lay_food_interval, self, random_features=True))
+        if self.population is not None:
+            self.population.plants += 1
+
+    # Fungsi baru untuk spawn egg secara acak
+    def spawn_random_egg(self):
+        empty_cells = [(x, y) for x in range(self.grid_size) for y in range(self.grid_size)
+                       if self.grid[x, y] == 0 and not any(egg.x == x and egg.y == y and not egg.hatched for egg in self.eggs)]
+        if empty_cells:
+            ex, ey = random.choice(empty_cells)
+            self.add_egg(ex, ey)
+
+    def update_grid(self):
+        self.grid[:] = 0
+        for egg in self.eggs:
+            if not egg.hatched:
+                if 0 <= egg.x < self.grid_size and 0 <= egg.y < self.grid_size:
+                    self.grid[egg.x, egg.y] = 2
+        for fx, fy in self.food:
+            if 0 <= fx < self.grid_size and 0 <= fy < self.grid_size:
+                self.grid[fx, fy] = 3
+        for creature in self.creatures:
+            if creature.alive:
+                for cell in creature.cells.get('neutral', []):
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        if getattr(creature, "is_nucleus", False):
+                            self.grid[cell[0], cell[1]] = 9
+                        elif getattr(creature, "is_old", False):
+                            self.grid[cell[0], cell[1]] = 8
+                        else:
+                            self.grid[cell[0], cell[1]] = 4
+                for cell in creature.cells.get('weapon', []):
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self.grid[cell[0], cell[1]] = 5
+                for cell in creature.cells.get('leg', []):
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self.grid[cell[0], cell[1]] = 6
+                for cell in creature.cells.get('eye', []):
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self.grid[cell[0], cell[1]] = 7
+        for plant in self.plant_cells:
+            if plant.alive:
+                for cell in plant.cells.get('neutral', []):
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self.grid[cell[0], cell[1]] = 10
+                for cell in plant.cells.get('leg', []):
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self.grid[cell[0], cell[1]] = 11
+                for cell in plant.cells.get('eye', []):
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self.grid[cell[0], cell[1]] = 12
+
+    def update(self):
+        self.cycle += 1
+        self.population = PopulationSummary(self)
+        total_cells = self.grid_size * self.grid_size
+        food_count = len(self.food)
+        egg_count = self.population.eggs
+        if total_cells == 0:
+            abundance = 1.0
+        else:
+            abundance = min(1.0, max(0.0, (food_count + egg_count) / total_cells))
+        if abundance >= 0.5:
+            coop_probability = 0.0
+        else:
+            coop_probability = 1.0 - (abundance * 2.0)
+        self.last_coop_probability = coop_probability
+
+        # Spawn egg random secara periodik
+        if self.cycle - getattr(self, "_last_random_egg_spawn", 0) >= self.random_egg_spawn_interval:
+            self.spawn_random_egg()
+            self._last_random_egg_spawn = self.cycle
+
+        if self.cycle - getattr(self, "_last_plant_spawn", 0) >= self.plant_spawn_interval:
+            empty_cells = [(x, y) for x in range(self.grid_size) for y in range(self.grid_size)
+                           if self.grid[x, y] == 0 and not any(pc.neutral == (x, y) for pc in self.plant_cells)]
+            if empty_cells:
+                px, py = random.choice(empty_cells)
+                self.add_plant_cell(px, py)
+            self._last_plant_spawn = self.cycle
+        for plant in self.plant_cells:
+            if plant.alive:
+                plant.move(self.grid_size, self.cycle, self.food)
+        for egg in self.eggs:
+            if not egg.hatched:
+                if egg.born_cycle is None:
+                    egg.born_cycle = self.cycle
+                if self.cycle - egg.born_cycle >= egg.incubate_cycles:
+                    egg.hatched = True
+                    self.population.eggs -= 1
+                    hunger = self.hunger_cycles
+                    turn = self.turn_interval
+                    food_radius = self.food_radius
+                    lay_interval = self.lay_egg_interval
+                    maturity_cycles = self.maturity_cycles
+                    rarity = self.rarity
+                    recruit_radius = self.recruit_radius
+                    creature = Creature(egg.x, egg.y, hunger, turn, food_radius, lay_interval, maturity_cycles, rarity, self, recruit_radius)
+                    self.creatures.append(creature)
+                    self.population.creature_born(creature)
+        targets = TargetIndex(self.food, self.eggs, self.grid_size)
+        self.occupancy = CellOccupancy(self.creatures + self.plant_cells)
+        new_eggs = []
+        food_list = self.food
+        for creature in self.creatures:
+            if creature.alive:
+                egg_laid = creature.move(self.grid_size, targets, self.creatures, self.cycle, food_list, coop_probability)
+                if egg_laid:
+                    new_eggs.append(egg_laid)
+                creature.hunger -= 1
+                if creature.hunger <= 0:
+                    creature.die()
+        # Creatures eat the plants under their neutral first, then the ones
+        # under any of their cells. Plants go in list order, as eating can
+        # grow a feature onto the next one.
+        plant_order = {plant: i for i, plant in enumerate(self.plant_cells)}
+        for creature in self.creatures:
+            if creature.alive:
+                for plant in self._plants_on([creature.neutral], plant_order, -1):
+                    plant.die()
+                    creature.eat_and_grow()
+                    self.food.append(plant.neutral)
+        for creature in self.creatures:
+            if creature.alive:
+                last = -1
+                while True:
+                    plants = self._plants_on(creature.all_cells(), plant_order, last)
+                    if not plants:
+                        break
+                    plant = plants[0]
+                    last = plant_order[plant]
+                    plant.die()
+                    creature.eat_and_grow()
+                    self.food.append(plant.neutral)
+        for creature in self.creatures:
+            if not creature.alive:
+                for cell in creature.all_cells():
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self.food.append(cell)
+        for plant in self.plant_cells:
+            if not plant.alive:
+                for cell in plant.all_cells():
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self.food.append(cell)
+        self.creatures = [c for c in self.creatures if c.alive]
+        self.plant_cells = [p for p in self.plant_cells if p.alive]
+        self.eggs += new_eggs
+        self.population.eggs += len(new_eggs)
+        for creature in self.creatures:
+            if creature.age > self.max_creature_age:
+                self.max_creature_age = creature.age
+        self.update_grid()
+
+    def _plants_on(self, cells, plant_order, after):
+        # Live plants whose neutral is on one of `cells` and that come after
+        # position `after` in plant_cells, in plant_cells order
+        plants = set()
+        for cell in cells:
+            for organism, part in self.occupancy.at(cell):
+                if part == 'neutral' and isinstance(organism, PlantCell) and organism.alive and plant_order[organism] > after:
+                    plants.add(organism)
+        return sorted(plants, key=plant_order.get)
+
+    def step(self, cycles=1):
+        for _ in range(cycles):
+            self.update()
+
+    def run(self, max_cycles):
+        for _ in range(max_cycles):
+            self.update()
+            if self.is_extinct():
+                break
+        return self.cycle
+
+    def is_extinct(self):
+        return len(self.creatures) == 0 and len(self.plant_cells) == 0 and not any(not egg.hatched for egg in self.eggs)
+
+    def _random_empty_cells(self, count):
+        self.update_grid()
+        taken = set()
+        count = min(count, int(np.count_nonzero(self.grid == 0)))
+        for _ in range(count):
+            while True:
+                x = random.randint(0, self.grid_size - 1)
+                y = random.randint(0, self.grid_size - 1)
+                if self.grid[x, y] == 0 and (x, y) not in taken:
+                    break
+            taken.add((x, y))
+            yield x, y
+
+    def scatter_eggs(self, count):
+        for x, y in self._random_empty_cells(count):
+            self.add_egg(x, y)
+        self.update_grid()
+
+    def scatter_food(self, count):
+        for x, y in self._random_empty_cells(count):
+            self.add_food(x, y)
+        self.update_grid()
+
+    def stats(self):
+        creatures = [c for c in self.creatures if c.alive]
+        return {
+            "cycle": self.cycle,
+            "creatures": len(creatures),
+            "eggs": sum(1 for egg in self.eggs if not egg.hatched),
+            "food": len(self.food),
+            "plants": sum(1 for p in self.plant_cells if p.alive),
+            "old": sum(1 for c in creatures if c.is_old),
+            "coop_groups": len({id(c.coop_group) for c in creatures if c.coop_group}),
+            "weapons": sum(1 for c in creatures if c.has_weapon),
+            "legs": sum(1 for c in creatures if c.has_leg),
+            "eyes": sum(1 for c in creatures if c.has_eye),
+            "max_hunger": max((c.hunger for c in creatures), default=0),
+            "max_creature_age": self.max_creature_age,
+            "coop_probability": self.last_coop_probability,
+        }
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Run Game of Predators without the UI")
+    parser.add_argument("--eggs", type=int, default=50, help="eggs placed at random empty cells")
+    parser.add_argument("--food", type=int, default=0, help="food placed at random empty cells")
+    parser.add_argument("--cycles", type=int, default=1000, help="maximum cycles to run")
+    parser.add_argument("--grid-size", type=int, default=DEFAULT_GRID_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    game = Game(grid_size=args.grid_size)
+    game.scatter_eggs(args.eggs)
+    game.scatter_food(args.food)
+    start = time.perf_counter()
+    game.run(args.cycles)
+    elapsed = time.perf_counter() - start
+    for key, value in game.stats().items():
+        print(f"{key}: {value}")
+    print(f"cycles/sec: {game.cycle / elapsed if elapsed > 0 else 0:.1f}")
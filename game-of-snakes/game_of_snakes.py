@@ -1,457 +1,90 @@
 import sys
 import os
+import time
 import numpy as np
-import random
-from PySide6.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QHBoxLayout, QGridLayout, QLabel, QSpinBox, QDialog, QFormLayout, QSpacerItem, QSizePolicy, QMessageBox
-from PySide6.QtCore import QTimer, Qt
-from PySide6.QtGui import QPainter, QColor, QPen, QIcon
+from PySide6.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QHBoxLayout, QGridLayout, QLabel, QSpinBox, QDialog, QFormLayout, QSpacerItem, QSizePolicy, QMessageBox, QCheckBox, QComboBox, QFileDialog, QSlider
+from PySide6.QtCore import QTimer, Qt, QRect
+from PySide6.QtGui import QPainter, QColor, QPen, QIcon, QImage
 from player_snake import PlayerSnake
+from snake_engine import Game
+from snake_checkpoint import save_game, load_game
+from snake_vector_engine import VectorGame
+from snake_worker import SimulationWorker
+from snake_profiler import UpdateProfiler
+from snake_replay import ReplayWriter, ReplayReader
 
-GRID_SIZE = 80
 GAME_AREA_SIZE = 400  # px, area game tetap
-
-class Egg:
-    def __init__(self, x, y, hatch_cycle, is_food=False, is_player=False):
-        self.x = x
-        self.y = y
-        self.hatch_cycle = hatch_cycle
-        self.is_food = is_food
-        self.is_player = is_player
-
-class Snake:
-    def __init__(self, body, direction, born_cycle, hungry=False, turn_interval=30, tangled_die_cycles=30, food_attract_radius=5, egg_attract_radius=5, shading_interval=300):
-        self.body = body
-        self.direction = direction
-        self.born_cycle = born_cycle
-        self.last_lay = born_cycle
-        self.steps_since_dir_change = 0
-        self.turn_interval = turn_interval
-        self.hungry = hungry
-        self.ate = False
-        self.tangled_cycles = 0
-        self.tangled_die_cycles = tangled_die_cycles
-        self.food_attract_radius = food_attract_radius
-        self.egg_attract_radius = egg_attract_radius
-        self.last_head = self.head()
-        self.shading_interval = shading_interval
-        self.last_shading = born_cycle
-
-    def head(self):
-        return self.body[0]
-
-    def move(self, food_positions, egg_positions):
-        self.steps_since_dir_change += 1
-        head_x, head_y = self.head()
-        nearest_food = None
-        min_food_dist = None
-        for fx, fy in food_positions:
-            dist = abs(head_x - fx) + abs(head_y - fy)
-            if dist <= self.food_attract_radius:
-                if min_food_dist is None or dist < min_food_dist:
-                    min_food_dist = dist
-                    nearest_food = (fx, fy)
-        nearest_egg = None
-        min_egg_dist = None
-        for ex, ey in egg_positions:
-            dist = abs(head_x - ex) + abs(head_y - ey)
-            if dist <= self.egg_attract_radius:
-                if min_egg_dist is None or dist < min_egg_dist:
-                    min_egg_dist = dist
-                    nearest_egg = (ex, ey)
-        moved = False
-        target = None
-        if nearest_food:
-            target = nearest_food
-        elif nearest_egg:
-            target = nearest_egg
-        if target:
-            dx = np.sign(target[0] - head_x)
-            dy = np.sign(target[1] - head_y)
-            preferred_dirs = []
-            if dx != 0:
-                preferred_dirs.append((dx, 0))
-            if dy != 0:
-                preferred_dirs.append((0, dy))
-            if dx != 0 and dy != 0:
-                preferred_dirs.append((dx, dy))
-            possible_dirs = preferred_dirs + [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(-1,1),(1,-1)]
-            for ddx, ddy in possible_dirs:
-                new_head = (head_x + ddx, head_y + ddy)
-                if 0 <= new_head[0] < GRID_SIZE and 0 <= new_head[1] < GRID_SIZE and new_head not in self.body:
-                    self.direction = (ddx, ddy)
-                    self.body = [new_head] + self.body[:-1]
-                    self.steps_since_dir_change = 0
-                    moved = True
-                    break
-        if not moved:
-            if self.steps_since_dir_change >= self.turn_interval:
-                possible_dirs = [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(1,-1),(-1,1)]
-                random.shuffle(possible_dirs)
-                for dx, dy in possible_dirs:
-                    new_head = (head_x + dx, head_y + dy)
-                    if 0 <= new_head[0] < GRID_SIZE and 0 <= new_head[1] < GRID_SIZE and new_head not in self.body:
-                        self.direction = (dx, dy)
-                        self.steps_since_dir_change = 0
-                        self.body = [new_head] + self.body[:-1]
-                        moved = True
-                        break
-                if not moved:
-                    self.bounce()
-                    dx, dy = self.direction
-                    new_head = (head_x + dx, head_y + dy)
-                    if 0 <= new_head[0] < GRID_SIZE and 0 <= new_head[1] < GRID_SIZE and new_head not in self.body:
-                        self.body = [new_head] + self.body[:-1]
-                        self.steps_since_dir_change = 0
-                        moved = True
-            if not moved:
-                dx, dy = self.direction
-                new_head = (head_x + dx, head_y + dy)
-                if 0 <= new_head[0] < GRID_SIZE and 0 <= new_head[1] < GRID_SIZE and new_head not in self.body:
-                    self.body = [new_head] + self.body[:-1]
-                    moved = True
-                else:
-                    self.bounce()
-                    dx, dy = self.direction
-                    new_head = (head_x + dx, head_y + dy)
-                    if 0 <= new_head[0] < GRID_SIZE and 0 <= new_head[1] < GRID_SIZE and new_head not in self.body:
-                        self.body = [new_head] + self.body[:-1]
-                        moved = True
-        if self.head() == self.last_head:
-            self.tangled_cycles += 1
-        else:
-            self.tangled_cycles = 0
-        self.last_head = self.head()
-
-    def grow_by(self, extra_body_len):
-        dx, dy = self.direction
-        for _ in range(extra_body_len):
-            possible_dirs = [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(1,-1),(-1,1)]
-            random.shuffle(possible_dirs)
-            for ddx, ddy in possible_dirs:
-                new_head = (self.body[0][0] + ddx, self.body[0][1] + ddy)
-                if 0 <= new_head[0] < GRID_SIZE and 0 <= new_head[1] < GRID_SIZE and new_head not in self.body:
-                    self.direction = (ddx, ddy)
-                    self.body = [new_head] + self.body
-                    break
-            else:
-                self.bounce()
-                dx, dy = self.direction
-                new_head = (self.body[0][0] + dx, self.body[0][1] + dy)
-                if 0 <= new_head[0] < GRID_SIZE and 0 <= new_head[1] < GRID_SIZE and new_head not in self.body:
-                    self.body = [new_head] + self.body
-
-    def bounce(self):
-        if not self.body:
-            return
-        dx, dy = self.direction
-        x, y = self.body[0]
-        if x <= 0 or x >= GRID_SIZE-1:
-            dx = -dx
-        if y <= 0 or y >= GRID_SIZE-1:
-            dy = -dy
-        self.direction = (dx, dy)
-
-    def shade_skin(self, current_cycle, eggs):
-        if self.shading_interval <= 0 or len(self.body) < 2:
-            return
-        if current_cycle - self.last_shading >= self.shading_interval:
-            tail = self.body[-1]
-            eggs.append(Egg(tail[0], tail[1], 0, is_food=True))
-            self.last_shading = current_cycle
-
-class Game:
-    def __init__(self):
-        self.reset()
-        self.hatch_cycles = 30
-        self.lay_interval = 120
-        self.hungry_die_cycles = 300
-        self.turn_interval = 30
-        self.tangled_die_cycles = 30
-        self.food_attract_radius = 5
-        self.egg_attract_radius = 5
-        self.cell_size = GAME_AREA_SIZE // GRID_SIZE
-        self.shading_interval = 300
-        self.max_snake_length = 0
-        self.total_eggs = 0
-        self.total_food = 0
-        self.stats_head = 0
-        self.stats_body = 0
-        self.stats_egg = 0
-        self.stats_food_legend = 0
-        self.stats_player_body = 0
-        self.stats_player_head = 0
-        self.player_alive = True
-        self.player_max_length = 0
-        self.player_survive_cycles = 0
-
-    def reset(self):
-        self.cycle = 0
-        self.eggs = []
-        self.snakes = []
-        self.grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.uint8)
-        self.stats_snakes = 0
-        self.stats_eggs = 0
-        self.max_snake_length = 0
-        self.total_eggs = 0
-        self.total_food = 0
-        self.stats_head = 0
-        self.stats_body = 0
-        self.stats_egg = 0
-        self.stats_food_legend = 0
-        self.stats_player_body = 0
-        self.stats_player_head = 0
-        self.player_alive = True
-        self.player_max_length = 0
-        self.player_survive_cycles = 0
-
-    def add_egg(self, x, y, is_player=False):
-        for egg in self.eggs:
-            if egg.x == x and egg.y == y:
-                if not egg.is_food:
-                    egg.is_food = True
-                return
-        self.eggs.append(Egg(x, y, self.cycle + self.hatch_cycles, is_player=is_player))
-        self.grid[x, y] = 2 if not is_player else 5
-        self.total_eggs += 1
-
-    def add_food(self, x, y):
-        for egg in self.eggs:
-            if egg.x == x and egg.y == y:
-                egg.is_food = True
-                return
-        self.eggs.append(Egg(x, y, 0, is_food=True))
-        self.grid[x, y] = 4
-        self.total_food += 1
-
-    def add_snake(self, body, direction, hungry=False, is_player=False):
-        valid_body = [(x, y) for x, y in body if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE]
-        if len(valid_body) >= 3:
-            if is_player:
-                snake = PlayerSnake(valid_body, direction, self.cycle, hungry=hungry, turn_interval=self.turn_interval, tangled_die_cycles=self.tangled_die_cycles, food_attract_radius=self.food_attract_radius, egg_attract_radius=self.egg_attract_radius, shading_interval=self.shading_interval)
-            else:
-                snake = Snake(valid_body, direction, self.cycle, hungry=hungry, turn_interval=self.turn_interval, tangled_die_cycles=self.tangled_die_cycles, food_attract_radius=self.food_attract_radius, egg_attract_radius=self.egg_attract_radius, shading_interval=self.shading_interval)
-            self.snakes.append(snake)
-            for x, y in valid_body:
-                self.grid[x, y] = 1
-            if len(valid_body) > self.max_snake_length:
-                self.max_snake_length = len(valid_body)
-
-    def update(self):
-        self.cycle += 1
-        self.grid[:] = 0
-        new_snakes = []
-        remaining_eggs = []
-        for egg in self.eggs:
-            if egg.is_food:
-                remaining_eggs.append(egg)
-                continue
-            if self.cycle >= egg.hatch_cycle:
-                dir = random.choice([(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(-1,1),(1,-1)])
-                body = [(egg.x, egg.y)]
-                for i in range(1,3):
-                    nx, ny = egg.x + dir[0]*i, egg.y + dir[1]*i
-                    if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                        body.append((nx, ny))
-                if len(body) == 3:
-                    if egg.is_player:
-                        new_snake = PlayerSnake(body, dir, self.cycle, hungry=True, turn_interval=self.turn_interval, tangled_die_cycles=self.tangled_die_cycles, food_attract_radius=self.food_attract_radius, egg_attract_radius=self.egg_attract_radius, shading_interval=self.shading_interval)
-                    else:
-                        new_snake = Snake(body, dir, self.cycle, hungry=True, turn_interval=self.turn_interval, tangled_die_cycles=self.tangled_die_cycles, food_attract_radius=self.food_attract_radius, egg_attract_radius=self.egg_attract_radius, shading_interval=self.shading_interval)
-                    new_snakes.append(new_snake)
-                    if len(body) > self.max_snake_length:
-                        self.max_snake_length = len(body)
-            else:
-                remaining_eggs.append(egg)
-        self.eggs = remaining_eggs
-        self.snakes += new_snakes
-
-        eggs_to_add = []
-        eaten_positions = set()
-        food_positions = [(egg.x, egg.y) for egg in self.eggs if egg.is_food]
-        egg_positions = [(egg.x, egg.y) for egg in self.eggs if not egg.is_food]
-        player_snake = None
-        for snake in self.snakes:
-            if isinstance(snake, PlayerSnake):
-                player_snake = snake
-                break
-        for snake in self.snakes:
-            if len(snake.body) >= 3:
-                snake.turn_interval = self.turn_interval
-                snake.tangled_die_cycles = self.tangled_die_cycles
-                snake.food_attract_radius = self.food_attract_radius
-                snake.egg_attract_radius = self.egg_attract_radius
-                snake.shading_interval = self.shading_interval
-                snake.bounce()
-                if isinstance(snake, PlayerSnake):
-                    snake.move(food_positions, egg_positions, self.player_direction)
-                else:
-                    snake.move(food_positions, egg_positions)
-                snake.shade_skin(self.cycle, eggs_to_add)
-                if len(snake.body) > self.max_snake_length:
-                    self.max_snake_length = len(snake.body)
-        self.snakes = [snake for snake in self.snakes if len(snake.body) >= 3]
-        head_positions = {}
-        for idx, snake in enumerate(self.snakes):
-            if snake.body:
-                pos = snake.head()
-                if pos in head_positions:
-                    head_positions[pos].append(idx)
-                else:
-                    head_positions[pos] = [idx]
-        eaten_snakes = set()
-        player_eaten = False
-        for pos, idxs in head_positions.items():
-            if len(idxs) > 1:
-                eater = random.choice(idxs)
-                for idx in idxs:
-                    if idx != eater and self.snakes[idx].body:
-                        # Check if player snake is eaten
-                        if isinstance(self.snakes[idx], PlayerSnake):
-                            player_eaten = True
-                            self.player_alive = False
-                            self.player_survive_cycles = self.cycle - self.snakes[idx].born_cycle
-                            self.player_max_length = max(self.player_max_length, len(self.snakes[idx].body))
-                        self.snakes[eater].grow_by(len(self.snakes[idx].body))
-                        self.snakes[eater].ate = True
-                        self.snakes[idx].body = []
-                        eaten_snakes.add(idx)
-        for snake in self.snakes:
-            if not snake.body:
-                continue
-            for egg in self.eggs:
-                if (egg.x, egg.y) == snake.head() and not egg.is_food:
-                    snake.grow_by(1)
-                    snake.ate = True
-                    eaten_positions.add((egg.x, egg.y))
-                if (egg.x, egg.y) == snake.head() and egg.is_food:
-                    snake.grow_by(1)
-                    snake.ate = True
-                    egg.is_food = False
-                    eaten_positions.add((egg.x, egg.y))
-                    self.total_food += 1
-        snakes_to_remove = set()
-        for i, snake in enumerate(self.snakes):
-            if not snake.body:
-                continue
-            for j, other in enumerate(self.snakes):
-                if i == j or not other.body:
-                    continue
-                if snake.head() in other.body:
-                    eaten_length = len(other.body)
-                    # Check if player snake is eaten
-                    if isinstance(other, PlayerSnake):
-                        player_eaten = True
-                        self.player_alive = False
-                        self.player_survive_cycles = self.cycle - other.born_cycle
-                        self.player_max_length = max(self.player_max_length, len(other.body))
-                    snake.grow_by(eaten_length)
-                    snake.ate = True
-                    other.body = []
-                    snakes_to_remove.add(j)
-        self.snakes = [snake for idx, snake in enumerate(self.snakes) if len(snake.body) >= 3 and idx not in snakes_to_remove and snake.tangled_cycles <= snake.tangled_die_cycles]
-        self.snakes = [snake for snake in self.snakes if not (snake.hungry and not snake.ate and self.cycle - snake.born_cycle > self.hungry_die_cycles)]
-        self.snakes = [snake for snake in self.snakes if not (isinstance(snake, PlayerSnake) and snake.hungry and not snake.ate and self.cycle - snake.born_cycle > self.hungry_die_cycles)]
-        for snake in self.snakes:
-            if snake.hungry and snake.ate:
-                snake.hungry = False
-            snake.ate = False
-        for snake in self.snakes:
-            if not snake.body:
-                continue
-            if not isinstance(snake, PlayerSnake):
-                if len(snake.body) > 3 and self.cycle - snake.last_lay >= self.lay_interval:
-                    tail = snake.body[-1]
-                    if 0 <= tail[0] < GRID_SIZE and 0 <= tail[1] < GRID_SIZE:
-                        eggs_to_add.append(Egg(tail[0], tail[1], self.cycle + self.hatch_cycles, is_player=False))
-                        self.total_eggs += 1
-                    snake.last_lay = self.cycle
-        self.eggs = [egg for egg in self.eggs if (egg.x, egg.y) not in eaten_positions]
-        self.eggs += eggs_to_add
-        for egg in self.eggs:
-            if 0 <= egg.x < GRID_SIZE and 0 <= egg.y < GRID_SIZE:
-                if egg.is_food:
-                    self.grid[egg.x, egg.y] = 4
-                elif egg.is_player:
-                    self.grid[egg.x, egg.y] = 5
-                else:
-                    self.grid[egg.x, egg.y] = 2
-        for snake in self.snakes:
-            for idx, (x, y) in enumerate(snake.body):
-                if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
-                    if isinstance(snake, PlayerSnake):
-                        if idx == 0:
-                            self.grid[x, y] = 6  # kepala oranye
-                        else:
-                            self.grid[x, y] = 5  # badan biru
-                    else:
-                        if idx == 0:
-                            self.grid[x, y] = 3
-                        else:
-                            self.grid[x, y] = 1
-        self.stats_snakes = len(self.snakes)
-        self.stats_eggs = len([egg for egg in self.eggs if not egg.is_food])
-        self.stats_food = len([egg for egg in self.eggs if egg.is_food])
-        self.stats_head = int(np.count_nonzero(self.grid == 3)) + int(np.count_nonzero(self.grid == 6))
-        self.stats_body = int(np.count_nonzero(self.grid == 1)) + int(np.count_nonzero(self.grid == 5))
-        self.stats_egg = int(np.count_nonzero(self.grid == 2))
-        self.stats_food_legend = int(np.count_nonzero(self.grid == 4))
-        self.stats_player_body = int(np.count_nonzero(self.grid == 5))
-        self.stats_player_head = int(np.count_nonzero(self.grid == 6))
-        # Track player snake stats
-        if player_snake and len(player_snake.body) > self.player_max_length:
-            self.player_max_length = len(player_snake.body)
-        if player_snake and self.player_alive:
-            self.player_survive_cycles = self.cycle - player_snake.born_cycle
-        self.player_eaten = player_eaten
+ENGINES = {"Object": Game, "Vector (NumPy)": VectorGame}
+DISPLAY_FPS = 30  # repaint rate while the simulation runs on the worker thread
+
+# RGBA per cell code in Game.grid; code 0 (empty) is fully transparent
+PALETTE = np.array([
+    (0, 0, 0, 0),
+    (51, 204, 51, 255),    # body
+    (255, 255, 0, 255),    # egg
+    (255, 0, 0, 255),      # head
+    (128, 128, 128, 255),  # food
+    (0, 0, 255, 255),      # player body / player egg
+    (255, 128, 0, 255),    # player head
+], dtype=np.uint8)
 
 class GameWidget(QWidget):
     def __init__(self, game):
         super().__init__()
         self.game = game
+        self.worker = None
+        self.frame = None  # grid snapshot to draw instead of game.grid
+        self.playback = False  # showing a replay; clicks must not edit the game
         self.setFixedSize(GAME_AREA_SIZE, GAME_AREA_SIZE)
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self.hud = QLabel(self)
+        self.hud.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: white; font-family: monospace; font-size: 9px; padding: 3px;")
+        self.hud.move(4, 4)
+        self.hud.hide()
+
+    def show_hud(self, text):
+        self.hud.setText(text)
+        self.hud.adjustSize()
+        self.hud.show()
 
     def paintEvent(self, event):
+        profiler = self.game.profiler
+        start = time.perf_counter()
         painter = QPainter(self)
-        cell_size = GAME_AREA_SIZE // GRID_SIZE
-        self.game.cell_size = cell_size
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                val = self.game.grid[x, y]
-                if val == 1:
-                    painter.fillRect(x*cell_size, y*cell_size, cell_size, cell_size, QColor(51,204,51))
-                elif val == 2:
-                    painter.fillRect(x*cell_size, y*cell_size, cell_size, cell_size, QColor(255,255,0))
-                elif val == 3:
-                    painter.fillRect(x*cell_size, y*cell_size, cell_size, cell_size, QColor(255,0,0))
-                elif val == 4:
-                    painter.fillRect(x*cell_size, y*cell_size, cell_size, cell_size, QColor(128,128,128))
-                elif val == 5:
-                    painter.fillRect(x*cell_size, y*cell_size, cell_size, cell_size, QColor(0,0,255))
-                elif val == 6:
-                    painter.fillRect(x*cell_size, y*cell_size, cell_size, cell_size, QColor(255,128,0))
+        grid = self.frame if self.frame is not None else self.game.grid
+        width, height = grid.shape
+        cell_size = GAME_AREA_SIZE // width
+        # grid is indexed [x, y]; image rows run along y. The buffer is kept on
+        # self because QImage wraps it without copying.
+        self._frame = PALETTE[grid.T]
+        image = QImage(self._frame.data, width, height, width * 4, QImage.Format_RGBA8888)
+        painter.drawImage(QRect(0, 0, width * cell_size, height * cell_size), image)
         pen = QPen(QColor(200, 200, 200))
         pen.setWidth(2)
         painter.setPen(pen)
         painter.drawRect(0, 0, GAME_AREA_SIZE - 1, GAME_AREA_SIZE - 1)
+        painter.end()
+        if profiler is not None:
+            profiler.record_paint(time.perf_counter() - start)
 
     def mousePressEvent(self, event):
-        cell_size = GAME_AREA_SIZE // GRID_SIZE
+        if self.playback:
+            return
+        size = self.game.grid_size
+        cell_size = GAME_AREA_SIZE // size
         x = int(event.position().x() // cell_size)
         y = int(event.position().y() // cell_size)
-        if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
+        if 0 <= x < size and 0 <= y < size:
             if event.button() == Qt.LeftButton:
-                found = False
-                for egg in self.game.eggs:
-                    if egg.x == x and egg.y == y:
-                        if not egg.is_food:
-                            egg.is_food = True
-                        found = True
-                        break
-                if not found:
-                    self.game.add_egg(x, y)
+                edit = lambda game: game.add_egg(x, y)
             elif event.button() == Qt.RightButton:
-                self.game.add_food(x, y)
+                edit = lambda game: game.add_food(x, y)
+            else:
+                return
+            if self.worker is not None:
+                self.worker.submit(edit)
+            else:
+                edit(self.game)
             self.update()
 
 class SettingsDialog(QDialog):
@@ -487,10 +120,15 @@ class SettingsDialog(QDialog):
         self.spin_speed.setSuffix(" ms")
         self.spin_grid_size = QSpinBox()
         self.spin_grid_size.setRange(10, 200)
-        self.spin_grid_size.setValue(GRID_SIZE)
+        self.spin_grid_size.setValue(game.grid_size)
         self.spin_shading = QSpinBox()
         self.spin_shading.setRange(1, 9999)
         self.spin_shading.setValue(game.shading_interval)
+        self.combo_engine = QComboBox()
+        for name, engine in ENGINES.items():
+            self.combo_engine.addItem(name, engine)
+            if type(game) is engine:
+                self.combo_engine.setCurrentIndex(self.combo_engine.count() - 1)
         self.layout.addRow("Egg hatch cycles", self.spin_hatch)
         self.layout.addRow("Egg lay interval", self.spin_lay)
         self.layout.addRow("Hungry dies after cycles", self.spin_hungry)
@@ -501,6 +139,7 @@ class SettingsDialog(QDialog):
         self.layout.addRow("Cycle speed", self.spin_speed)
         self.layout.addRow("Grid size", self.spin_grid_size)
         self.layout.addRow("Snake shading interval", self.spin_shading)
+        self.layout.addRow("Engine", self.combo_engine)
         btn_ok = QPushButton("OK")
         btn_ok.clicked.connect(self.accept)
         self.layout.addRow(btn_ok)
@@ -513,11 +152,9 @@ class SettingsDialog(QDialog):
         self.game.tangled_die_cycles = self.spin_tangled.value()
         self.game.food_attract_radius = self.spin_food_radius.value()
         self.game.egg_attract_radius = self.spin_egg_radius.value()
-        global GRID_SIZE
-        GRID_SIZE = self.spin_grid_size.value()
-        self.game.cell_size = GAME_AREA_SIZE // GRID_SIZE
         self.game.shading_interval = self.spin_shading.value()
-        self.game.grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.uint8)
+        if self.spin_grid_size.value() != self.game.grid_size:
+            self.game.resize(self.spin_grid_size.value())
 
 class GuideDialog(QDialog):
     def __init__(self, parent=None):
@@ -552,10 +189,18 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Game of Snakes")
         self.game = Game()
         self.widget = GameWidget(self.game)
+        self.worker = SimulationWorker(self.game)
+        self.widget.worker = self.worker
         self.timer = QTimer()
         self.timer.timeout.connect(self.next_step)
+        self.frame_timer = QTimer()
+        self.frame_timer.timeout.connect(self.show_frame)
         self.running = False
         self.player_direction = None
+        self.recorder = None
+        self.replay = None
+        self.replay_timer = QTimer()
+        self.replay_timer.timeout.connect(self.next_replay_frame)
 
         self.label_cycle = QLabel("Cycle: 0")
         self.label_time = QLabel("Time: 00:00:00")
@@ -569,6 +214,30 @@ class MainWindow(QMainWindow):
         self.spin_speed.setSuffix(" ms")
         self.spin_speed.valueChanged.connect(self.update_speed)
 
+        self.check_threaded = QCheckBox("Worker thread")
+        self.check_threaded.toggled.connect(self.set_threaded)
+        self.spin_cps = QSpinBox()
+        self.spin_cps.setRange(0, 100000)
+        self.spin_cps.setValue(0)
+        self.spin_cps.setSpecialValueText("Max")
+        self.spin_cps.setSuffix(" cycles/s")
+        self.spin_cps.valueChanged.connect(self.update_speed)
+        self.check_hud = QCheckBox("HUD (F3)")
+        self.check_hud.toggled.connect(self.set_hud)
+
+        self.btn_record = QPushButton("Record")
+        self.btn_record.setCheckable(True)
+        self.btn_record.toggled.connect(self.set_recording)
+        self.btn_replay = QPushButton("Replay...")
+        self.btn_replay.clicked.connect(self.toggle_replay)
+        self.btn_replay_play = QPushButton("Play")
+        self.btn_replay_play.clicked.connect(self.toggle_replay_playback)
+        self.slider_replay = QSlider(Qt.Horizontal)
+        self.slider_replay.valueChanged.connect(self.show_replay_frame)
+        self.label_replay = QLabel("")
+        for widget in (self.btn_replay_play, self.slider_replay, self.label_replay):
+            widget.hide()
+
         btn_start = QPushButton("Start/Stop")
         btn_start.clicked.connect(self.toggle)
         btn_clear = QPushButton("Clear")
@@ -579,6 +248,10 @@ class MainWindow(QMainWindow):
         btn_guide.clicked.connect(self.show_guide)
         btn_player = QPushButton("Player")
         btn_player.clicked.connect(self.spawn_player_egg)
+        btn_save = QPushButton("Save")
+        btn_save.clicked.connect(self.save_checkpoint)
+        btn_load = QPushButton("Load")
+        btn_load.clicked.connect(self.load_checkpoint)
 
         top_layout = QHBoxLayout()
         top_layout.addWidget(btn_start)
@@ -586,6 +259,8 @@ class MainWindow(QMainWindow):
         top_layout.addWidget(btn_settings)
         top_layout.addWidget(btn_guide)
         top_layout.addWidget(btn_player)
+        top_layout.addWidget(btn_save)
+        top_layout.addWidget(btn_load)
         stats_layout = QHBoxLayout()
         stats_layout.addWidget(self.label_cycle)
         stats_layout.addWidget(self.label_time)
@@ -616,6 +291,20 @@ class MainWindow(QMainWindow):
         layout.addLayout(top_layout)
         layout.addLayout(stats_layout)
         layout.addLayout(legend_grid)
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(self.check_threaded)
+        mode_layout.addWidget(QLabel("Target speed"))
+        mode_layout.addWidget(self.spin_cps)
+        mode_layout.addWidget(self.check_hud)
+        layout.addLayout(mode_layout)
+        replay_layout = QHBoxLayout()
+        replay_layout.addWidget(self.btn_record)
+        replay_layout.addWidget(self.btn_replay)
+        replay_layout.addWidget(self.btn_replay_play)
+        replay_layout.addWidget(self.slider_replay)
+        replay_layout.addWidget(self.label_replay)
+        replay_layout.addStretch()
+        layout.addLayout(replay_layout)
         center_layout = QHBoxLayout()
         center_layout.addSpacerItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
         center_layout.addWidget(self.widget)
@@ -625,7 +314,7 @@ class MainWindow(QMainWindow):
         container = QWidget()
         container.setLayout(layout)
         self.setCentralWidget(container)
-        self.setFixedSize(GAME_AREA_SIZE + 20, GAME_AREA_SIZE + 200)
+        self.setFixedSize(GAME_AREA_SIZE + 20, GAME_AREA_SIZE + 260)
 
     def _legend_label(self, color, text):
         color_box = QLabel()
@@ -644,22 +333,30 @@ class MainWindow(QMainWindow):
         return w
 
     def spawn_player_egg(self):
-        for snake in self.game.snakes:
+        if not self.game.supports_player:
+            return
+        self.worker.submit(self._spawn_player_egg)
+        self.widget.update()
+
+    def _spawn_player_egg(self, game):
+        for snake in game.snakes:
             if isinstance(snake, PlayerSnake):
                 return
-        for egg in self.game.eggs:
+        for egg in game.eggs:
             if egg.is_player:
                 return
         while True:
-            x = random.randint(0, GRID_SIZE-1)
-            y = random.randint(0, GRID_SIZE-1)
-            if self.game.grid[x, y] == 0:
+            x = game.rng.randint(0, game.grid_size-1)
+            y = game.rng.randint(0, game.grid_size-1)
+            if game.grid[x, y] == 0:
                 break
-        self.game.add_egg(x, y, is_player=True)
-        self.widget.update()
+        game.add_egg(x, y, is_player=True)
 
     def keyPressEvent(self, event):
         key = event.key()
+        if key == Qt.Key_F3:
+            self.check_hud.toggle()
+            return
         # Support WASD and Arrow keys for player movement
         if key == Qt.Key_W or key == Qt.Key_Up:
             self.player_direction = (0, -1)
@@ -669,16 +366,176 @@ class MainWindow(QMainWindow):
             self.player_direction = (-1, 0)
         elif key == Qt.Key_D or key == Qt.Key_Right:
             self.player_direction = (1, 0)
+        else:
+            return
+        if self.worker.is_running():
+            self.worker.set_player_direction(self.player_direction)
 
     def show_settings(self):
+        # The dialog edits the game directly, so pause the worker meanwhile
+        paused = self.worker.is_running()
+        if paused:
+            self.worker.stop()
         dialog = SettingsDialog(self, self.game)
-        if dialog.exec():
+        accepted = dialog.exec()
+        if accepted:
+            engine = dialog.combo_engine.currentData()
+            if type(self.game) is not engine:
+                dialog.game = self.set_engine(engine)
+            elif dialog.spin_grid_size.value() != self.game.grid_size:
+                self.btn_record.setChecked(False)
             dialog.apply_settings()
             self.spin_speed.setValue(dialog.spin_speed.value())
             self.update_speed()
             self.widget.setFixedSize(GAME_AREA_SIZE, GAME_AREA_SIZE)
-            self.setFixedSize(GAME_AREA_SIZE + 20, GAME_AREA_SIZE + 200)
+            self.setFixedSize(GAME_AREA_SIZE + 20, GAME_AREA_SIZE + 260)
             self.widget.update()
+        if paused:
+            self.worker.start()
+
+    def set_engine(self, engine):
+        # Switching engines starts a new, empty game with the same settings
+        old = self.game
+        game = engine(grid_size=old.grid_size)
+        for name in ("hatch_cycles", "lay_interval", "hungry_die_cycles", "turn_interval", "tangled_die_cycles", "food_attract_radius", "egg_attract_radius", "shading_interval"):
+            setattr(game, name, getattr(old, name))
+        return self._use_game(game)
+
+    def _use_game(self, game):
+        # A recording belongs to one run, so it ends with the old game
+        self.btn_record.setChecked(False)
+        game.profiler = self.game.profiler
+        self.game = game
+        self.widget.game = game
+        self.widget.frame = None
+        self.worker.game = game
+        self._show_stats(game.stats())
+        return game
+
+    def save_checkpoint(self):
+        if type(self.game) is not Game:
+            QMessageBox.information(self, "Save", "Only the Object engine can be saved.")
+            return
+        # Pause the worker so the saved state is one whole cycle
+        paused = self.worker.is_running()
+        if paused:
+            self.worker.stop()
+        path, _ = QFileDialog.getSaveFileName(self, "Save game", "", "Snake checkpoints (*.npz)")
+        if path:
+            save_game(self.game, path)
+        if paused:
+            self.worker.start()
+
+    def load_checkpoint(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load game", "", "Snake checkpoints (*.npz)")
+        if not path:
+            return
+        try:
+            game = load_game(path)
+        except (OSError, KeyError, ValueError) as e:
+            QMessageBox.warning(self, "Load", f"Could not load {path}:\n{e}")
+            return
+        if self.running:
+            self.stop_simulation()
+        self._use_game(game)
+        self.widget.update()
+
+    def closeEvent(self, event):
+        # Finish the recording so its index is written
+        self.stop_simulation()
+        self.btn_record.setChecked(False)
+        super().closeEvent(event)
+
+    def set_recording(self, checked):
+        if checked:
+            path, _ = QFileDialog.getSaveFileName(self, "Record replay", "", "Snake replays (*.snkr)")
+            if not path:
+                self.btn_record.setChecked(False)
+                return
+            recorder = ReplayWriter(path, self.game.grid_size)
+            self.recorder = recorder
+
+            def attach(game):
+                recorder(game)
+                game.listeners.append(recorder)
+            self.worker.submit(attach)
+        elif self.recorder is not None:
+            recorder = self.recorder
+            self.recorder = None
+
+            def detach(game):
+                game.listeners.remove(recorder)
+                recorder.close()
+            self.worker.submit(detach)
+
+    def toggle_replay(self):
+        if self.replay is not None:
+            self.close_replay()
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Open replay", "", "Snake replays (*.snkr)")
+        if not path:
+            return
+        try:
+            replay = ReplayReader(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Replay", f"Could not open {path}:\n{e}")
+            return
+        if not len(replay):
+            replay.close()
+            QMessageBox.information(self, "Replay", f"{path} has no frames.")
+            return
+        if self.running:
+            self.stop_simulation()
+        self.replay = replay
+        self.widget.playback = True
+        self.btn_replay.setText("Exit replay")
+        self.btn_record.setEnabled(False)
+        self.slider_replay.setRange(0, len(replay) - 1)
+        for widget in (self.btn_replay_play, self.slider_replay, self.label_replay):
+            widget.show()
+        self.slider_replay.setValue(0)
+        self.show_replay_frame(0)
+
+    def close_replay(self):
+        self.replay_timer.stop()
+        self.replay.close()
+        self.replay = None
+        self.widget.playback = False
+        self.widget.frame = None
+        self.btn_replay.setText("Replay...")
+        self.btn_replay_play.setText("Play")
+        self.btn_record.setEnabled(True)
+        for widget in (self.btn_replay_play, self.slider_replay, self.label_replay):
+            widget.hide()
+        self._show_stats(self.game.stats())
+        self.widget.update()
+
+    def show_replay_frame(self, n):
+        if self.replay is None:
+            return
+        cycle, grid = self.replay.frame(n)
+        self.widget.frame = grid
+        self.label_cycle.setText(f"Cycle: {cycle}")
+        self.label_time.setText(f"Time: {self.format_time(cycle, self.spin_speed.value())}")
+        self.label_replay.setText(f"{n + 1}/{len(self.replay)}")
+        self.widget.update()
+
+    def toggle_replay_playback(self):
+        if self.replay_timer.isActive():
+            self.replay_timer.stop()
+            self.btn_replay_play.setText("Play")
+        else:
+            if self.slider_replay.value() == self.slider_replay.maximum():
+                self.slider_replay.setValue(0)
+            self.replay_timer.start(self.spin_speed.value())
+            self.btn_replay_play.setText("Pause")
+
+    def next_replay_frame(self):
+        value = self.slider_replay.value()
+        if value >= self.slider_replay.maximum():
+            self.toggle_replay_playback()
+        else:
+            self.slider_replay.setValue(value + 1)
 
     def show_guide(self):
         dialog = GuideDialog(self)
@@ -687,13 +544,61 @@ class MainWindow(QMainWindow):
     def update_speed(self):
         if self.running:
             self.timer.setInterval(self.spin_speed.value())
+        self.worker.cycles_per_second = self.spin_cps.value()
 
     def toggle(self):
         if self.running:
-            self.timer.stop()
+            self.stop_simulation()
+        else:
+            self.start_simulation()
+
+    def start_simulation(self):
+        if self.replay is not None:
+            self.close_replay()
+        if self.check_threaded.isChecked():
+            self.worker.cycles_per_second = self.spin_cps.value()
+            self.game.player_direction = self.player_direction
+            self.worker.request_snapshot()
+            self.worker.start()
+            self.frame_timer.start(1000 // DISPLAY_FPS)
         else:
             self.timer.start(self.spin_speed.value())
-        self.running = not self.running
+        self.running = True
+
+    def stop_simulation(self):
+        self.timer.stop()
+        if self.frame_timer.isActive():
+            self.frame_timer.stop()
+            self.worker.stop()
+            self.widget.frame = None
+            self._show_stats(self.game.stats())
+            self.widget.update()
+        self.running = False
+
+    def set_threaded(self, checked):
+        if self.running:
+            self.stop_simulation()
+            self.start_simulation()
+
+    def set_hud(self, checked):
+        # The profiler is read by the worker thread too, so swap it in
+        # through submit() like any other edit to the game
+        profiler = UpdateProfiler() if checked else None
+        if checked:
+            self.widget.show_hud(profiler.format_hud())
+        else:
+            self.widget.hud.hide()
+        self.worker.submit(lambda game: setattr(game, "profiler", profiler))
+
+    def _refresh_hud(self, text=None):
+        # In threaded mode the worker builds the text into its snapshot, as
+        # it may be adding to the profiler while we'd be reading it
+        if not self.check_hud.isChecked():
+            return
+        if text is None and not self.frame_timer.isActive() and self.game.profiler is not None:
+            text = self.game.profiler.format_hud()
+        if text is not None:
+            self.widget.show_hud(text)
 
     def format_time(self, cycles, ms_per_cycle):
         total_ms = cycles * ms_per_cycle
@@ -732,14 +637,9 @@ class MainWindow(QMainWindow):
     def next_step(self):
         self.game.player_direction = self.player_direction
         self.game.update()
-        self.label_cycle.setText(f"Cycle: {self.game.cycle}")
-        self.label_time.setText(f"Time: {self.format_time(self.game.cycle, self.spin_speed.value())}")
-        self.label_snakes.setText(f"Snakes: {self.game.stats_snakes}")
-        self.label_eggs.setText(f"Eggs: {self.game.stats_eggs}")
-        self.label_food.setText(f"Food: {self.game.stats_food}")
-        self._update_legend_labels()
+        self._show_stats(self.game.stats())
+        self._refresh_hud()
         self.widget.update()
-        eggs_pending = any(not egg.is_food for egg in self.game.eggs)
         # Show game over if player is eaten
         if hasattr(self.game, "player_eaten") and self.game.player_eaten:
             if self.running:
@@ -748,30 +648,51 @@ class MainWindow(QMainWindow):
             self.show_player_game_over()
             self.game.player_eaten = False
         # Show game over if all snakes extinct
-        elif self.game.stats_snakes == 0 and not eggs_pending:
+        elif self.game.is_extinct():
             if self.running:
                 self.timer.stop()
                 self.running = False
             self.show_game_over_stats()
 
+    def show_frame(self):
+        snapshot = self.worker.latest
+        if snapshot is not None:
+            self.widget.frame = snapshot.grid
+            self._show_stats(snapshot.stats)
+            self._refresh_hud(snapshot.hud)
+            self.widget.update()
+        self.worker.request_snapshot()
+        reason = self.worker.stop_reason
+        if reason and not self.worker.is_running():
+            self.stop_simulation()
+            if reason == "player_eaten":
+                self.show_player_game_over()
+                self.game.player_eaten = False
+            else:
+                self.show_game_over_stats()
+
     def clear_game(self):
-        self.game.reset()
-        self.label_cycle.setText("Cycle: 0")
-        self.label_time.setText("Time: 00:00:00")
-        self.label_snakes.setText("Snakes: 0")
-        self.label_eggs.setText("Eggs: 0")
-        self.label_food.setText("Food: 0")
-        self._update_legend_labels()
-        self.widget.update()
+        self.worker.submit(lambda game: game.reset())
+        if not self.worker.is_running():
+            self._show_stats(self.game.stats())
+            self.widget.update()
+
+    def _show_stats(self, stats):
+        self.label_cycle.setText(f"Cycle: {stats['cycle']}")
+        self.label_time.setText(f"Time: {self.format_time(stats['cycle'], self.spin_speed.value())}")
+        self.label_snakes.setText(f"Snakes: {stats['snakes']}")
+        self.label_eggs.setText(f"Eggs: {stats['eggs']}")
+        self.label_food.setText(f"Food: {stats['food']}")
+        self._update_legend_labels(stats)
 
-    def _update_legend_labels(self):
+    def _update_legend_labels(self, stats):
         legend_widgets = [
-            (self.game.stats_head, 0, 0, "Head"),
-            (self.game.stats_body, 0, 1, "Body"),
-            (self.game.stats_egg, 0, 2, "Egg"),
-            (self.game.stats_food_legend, 1, 0, "Food"),
-            (self.game.stats_player_body, 1, 1, "Player Body"),
-            (self.game.stats_player_head, 1, 2, "Player Head"),
+            (stats["head"], 0, 0, "Head"),
+            (stats["body"], 0, 1, "Body"),
+            (stats["egg"], 0, 2, "Egg"),
+            (stats["food_legend"], 1, 0, "Food"),
+            (stats["player_body"], 1, 1, "Player Body"),
+            (stats["player_head"], 1, 2, "Player Head"),
         ]
         for count, row, col, label in legend_widgets:
             widget = self.centralWidget().layout().itemAt(2).layout().itemAtPosition(row, col).widget()
@@ -1,8 +1,10 @@
-from PySide6.QtCore import Qt
-import random
+from snake_body import SnakeBody
+from snake_rng import RandomStream
 
 class PlayerSnake:
-    def __init__(self, body, direction, born_cycle, hungry=False, turn_interval=30, tangled_die_cycles=30, food_attract_radius=5, egg_attract_radius=5, shading_interval=300):
+    def __init__(self, body, direction, born_cycle, hungry=False, turn_interval=30, tangled_die_cycles=30, food_attract_radius=5, egg_attract_radius=5, shading_interval=300, grid_size=80, rng=None):
+        self.grid_size = grid_size
+        self.rng = rng if rng is not None else RandomStream()
         self.body = body
         self.direction = direction
         self.born_cycle = born_cycle
@@ -19,33 +21,41 @@ class PlayerSnake:
         self.shading_interval = shading_interval
         self.last_shading = born_cycle
 
+    @property
+    def body(self):
+        return self._body
+
+    @body.setter
+    def body(self, cells):
+        self._body = cells if isinstance(cells, SnakeBody) else SnakeBody(cells)
+
     def head(self):
         return self.body[0]
 
-    def move(self, food_positions, egg_positions, player_direction=None):
+    def move(self, field, player_direction=None):
         self.steps_since_dir_change += 1
         head_x, head_y = self.head()
         moved = False
         if player_direction:
             dx, dy = player_direction
             new_head = (head_x + dx, head_y + dy)
-            if 0 <= new_head[0] < 80 and 0 <= new_head[1] < 80 and new_head not in self.body:
+            if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
                 self.direction = (dx, dy)
-                self.body = [new_head] + self.body[:-1]
+                self.body.advance(new_head)
                 self.steps_since_dir_change = 0
                 moved = True
         if not moved:
             dx, dy = self.direction
             new_head = (head_x + dx, head_y + dy)
-            if 0 <= new_head[0] < 80 and 0 <= new_head[1] < 80 and new_head not in self.body:
-                self.body = [new_head] + self.body[:-1]
+            if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                self.body.advance(new_head)
                 moved = True
             else:
                 self.bounce()
                 dx, dy = self.direction
                 new_head = (head_x + dx, head_y + dy)
-                if 0 <= new_head[0] < 80 and 0 <= new_head[1] < 80 and new_head not in self.body:
-                    self.body = [new_head] + self.body[:-1]
+                if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                    self.body.advance(new_head)
                     moved = True
         if self.head() == self.last_head:
             self.tangled_cycles += 1
@@ -56,29 +66,27 @@ class PlayerSnake:
     def grow_by(self, extra_body_len):
         dx, dy = self.direction
         for _ in range(extra_body_len):
-            possible_dirs = [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(1,-1),(-1,1)]
-            random.shuffle(possible_dirs)
-            for ddx, ddy in possible_dirs:
+            for ddx, ddy in self.rng.directions():
                 new_head = (self.body[0][0] + ddx, self.body[0][1] + ddy)
-                if 0 <= new_head[0] < 80 and 0 <= new_head[1] < 80 and new_head not in self.body:
+                if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
                     self.direction = (ddx, ddy)
-                    self.body = [new_head] + self.body
+                    self.body.push_head(new_head)
                     break
             else:
                 self.bounce()
                 dx, dy = self.direction
                 new_head = (self.body[0][0] + dx, self.body[0][1] + dy)
-                if 0 <= new_head[0] < 80 and 0 <= new_head[1] < 80 and new_head not in self.body:
-                    self.body = [new_head] + self.body
+                if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                    self.body.push_head(new_head)
 
     def bounce(self):
         if not self.body:
             return
         dx, dy = self.direction
         x, y = self.body[0]
-        if x <= 0 or x >= 79:
+        if x <= 0 or x >= self.grid_size-1:
             dx = -dx
-        if y <= 0 or y >= 79:
+        if y <= 0 or y >= self.grid_size-1:
             dy = -dy
         self.direction = (dx, dy)
 
@@ -0,0 +1,183 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from snake_engine import Game
+from snake_vector_engine import VectorGame
+
+ENGINES = {"object": Game, "vector": VectorGame}
+
+# Starting worlds; items and snakes are placed from the scenario seed, so
+# both engines start from the same world
+SCENARIOS = {
+    "sparse_eggs_80": dict(grid_size=80, eggs=20),
+    "dense_eggs_80": dict(grid_size=80, eggs=1200),
+    "food_field_80": dict(grid_size=80, eggs=60, food=2500),
+    "long_snakes_200": dict(grid_size=200, long_snakes=(40, 150)),
+    "short_snakes_200": dict(grid_size=200, short_snakes=3000),
+    "dense_eggs_200": dict(grid_size=200, eggs=6000, food=2000),
+    "sparse_eggs_1000": dict(grid_size=1000, eggs=2000),
+    "dense_eggs_1000": dict(grid_size=1000, eggs=20000, food=10000),
+}
+
+def build(engine, scenario, seed):
+    spec = SCENARIOS[scenario]
+    size = spec["grid_size"]
+    game = ENGINES[engine](grid_size=size, seed=seed)
+    layout = random.Random(seed)
+    eggs, food = spec.get("eggs", 0), spec.get("food", 0)
+    cells = layout.sample(range(size * size), eggs + food)
+    for cell in cells[:eggs]:
+        game.add_egg(*divmod(cell, size))
+    for cell in cells[eggs:]:
+        game.add_food(*divmod(cell, size))
+    count, length = spec.get("long_snakes", (0, 0))
+    for i in range(count):
+        x = (i + 1) * size // (count + 1)
+        y = layout.randrange(size - length)
+        game.add_snake([(x, y + k) for k in range(length)], (0, -1))
+    for _ in range(spec.get("short_snakes", 0)):
+        x, y = layout.randrange(size - 2), layout.randrange(size)
+        game.add_snake([(x, y), (x + 1, y), (x + 2, y)], (-1, 0))
+    return game
+
+def time_updates(game, cycles):
+    samples = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        game.update()
+        samples.append(time.perf_counter() - start)
+    samples = np.array(samples)
+    return {
+        "cycles_per_second": cycles / samples.sum(),
+        "mean_ms": samples.mean() * 1000.0,
+        "p50_ms": np.percentile(samples, 50) * 1000.0,
+        "p95_ms": np.percentile(samples, 95) * 1000.0,
+        "snakes_after": game.stats()["snakes"],
+    }
+
+def measure_memory(engine, scenario, seed, warmup, cycles):
+    # A separate run, since tracing allocations slows everything down
+    tracemalloc.start()
+    try:
+        game = build(engine, scenario, seed)
+        game.step(warmup)
+        world, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        game.step(cycles)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "world_bytes": world,
+        "peak_bytes_per_cycle": (peak - world) / cycles,
+        "net_bytes_per_cycle": (current - world) / cycles,
+    }
+
+def time_paint(game, frames):
+    # GameWidget.paintEvent reports its own time to the game's profiler
+    from game_of_snakes import GameWidget
+    from snake_profiler import UpdateProfiler
+    widget = GameWidget(game)
+    game.profiler = UpdateProfiler(window=frames)
+    for _ in range(frames):
+        game.update()
+        widget.grab()
+    samples = np.array(game.profiler.paint_samples)
+    game.profiler = None
+    return {
+        "p50_ms": np.percentile(samples, 50) * 1000.0,
+        "p95_ms": np.percentile(samples, 95) * 1000.0,
+    }
+
+def run_scenario(engine, scenario, seed, warmup, cycles, memory_cycles, paint_frames):
+    result = {"scenario": scenario, "engine": engine, "grid_size": SCENARIOS[scenario]["grid_size"], "seed": seed}
+    game = build(engine, scenario, seed)
+    game.step(warmup)
+    result["snakes_before"] = game.stats()["snakes"]
+    result["update"] = time_updates(game, cycles)
+    if paint_frames:
+        result["paint"] = time_paint(game, paint_frames)
+    if memory_cycles:
+        result["memory"] = measure_memory(engine, scenario, seed, warmup, memory_cycles)
+    return result
+
+def git_commit():
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=here, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here, capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+def compare(baseline, report):
+    # Ratios above 1 are faster (update) or cheaper (paint) than the baseline
+    old = {(r["scenario"], r["engine"]): r for r in baseline["results"]}
+    print(f"vs {baseline.get('git_commit') or 'baseline'}", file=sys.stderr)
+    for r in report["results"]:
+        b = old.get((r["scenario"], r["engine"]))
+        if b is None:
+            continue
+        speed = r["update"]["cycles_per_second"] / b["update"]["cycles_per_second"]
+        line = f"{r['scenario']:<18} {r['engine']:<7} update x{speed:.2f}"
+        if "paint" in r and "paint" in b:
+            line += f"  paint x{b['paint']['p50_ms'] / r['paint']['p50_ms']:.2f}"
+        print(line, file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time Game of Snakes updates, memory and painting over fixed scenarios")
+    parser.add_argument("--scenario", action="append", choices=tuple(SCENARIOS), help="scenario to run (repeatable; default all)")
+    parser.add_argument("--engine", choices=("object", "vector", "all"), default="object")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=40, help="cycles before measuring; the first eggs hatch at 30")
+    parser.add_argument("--cycles", type=int, default=100, help="cycles timed per scenario")
+    parser.add_argument("--memory-cycles", type=int, default=20, help="cycles traced with tracemalloc per scenario; 0 skips memory")
+    parser.add_argument("--paint-frames", type=int, default=30, help="frames painted offscreen per scenario; 0 skips painting")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier JSON report to print speed ratios against")
+    args = parser.parse_args()
+    if args.paint_frames:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication(sys.argv)
+    engines = tuple(ENGINES) if args.engine == "all" else (args.engine,)
+    commit, dirty = git_commit()
+    report = {
+        "git_commit": commit,
+        "git_dirty": dirty,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "warmup": args.warmup,
+        "cycles": args.cycles,
+        "memory_cycles": args.memory_cycles,
+        "paint_frames": args.paint_frames,
+        "results": [],
+    }
+    for scenario in args.scenario or SCENARIOS:
+        for engine in engines:
+            result = run_scenario(engine, scenario, args.seed, args.warmup, args.cycles, args.memory_cycles, args.paint_frames)
+            report["results"].append(result)
+            update = result["update"]
+            line = f"{scenario:<18} {engine:<7} {update['cycles_per_second']:8.1f} cycles/s  p95 {update['p95_ms']:7.2f} ms"
+            if "paint" in result:
+                line += f"  paint {result['paint']['p50_ms']:6.2f} ms"
+            print(line, file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
@@ -0,0 +1,87 @@
+from collections import Counter, deque
+
+class SnakeBody:
+    # Segments in a deque (head at index 0) plus a per-cell count, so pushing
+    # the head, dropping the tail and "cell in body" are all O(1).
+    # Every pushed segment gets an increasing sequence number; a segment's
+    # index from the head is head_seq - seq, which lets a world occupancy map
+    # keep segment indices without rewriting them on every move.
+    def __init__(self, cells=()):
+        self._cells = deque(cells)
+        self._counts = dict(Counter(self._cells))
+        self.head_seq = len(self._cells) - 1
+        self.world = None
+        self.owner = None
+
+    def attach(self, world, owner):
+        self.world = world
+        self.owner = owner
+        seq = self.head_seq - len(self._cells) + 1
+        for cell in reversed(self._cells):
+            world.add(cell, owner, seq)
+            seq += 1
+
+    def detach(self):
+        if self.world is None:
+            return
+        seq = self.head_seq - len(self._cells) + 1
+        for cell in reversed(self._cells):
+            self.world.remove(cell, self.owner, seq)
+            seq += 1
+        self.world = None
+        self.owner = None
+
+    def push_head(self, cell):
+        if self.world is not None and self._cells:
+            # The old head turns into a body segment
+            self.world.touch(self._cells[0])
+        self._cells.appendleft(cell)
+        self._counts[cell] = self._counts.get(cell, 0) + 1
+        self.head_seq += 1
+        if self.world is not None:
+            self.world.add(cell, self.owner, self.head_seq)
+
+    def pop_tail(self):
+        tail_seq = self.head_seq - len(self._cells) + 1
+        cell = self._cells.pop()
+        count = self._counts[cell] - 1
+        if count:
+            self._counts[cell] = count
+        else:
+            del self._counts[cell]
+        if self.world is not None:
+            self.world.remove(cell, self.owner, tail_seq)
+        return cell
+
+    def advance(self, cell):
+        self.push_head(cell)
+        self.pop_tail()
+
+    def segment_index(self, seq):
+        return self.head_seq - seq
+
+    def __contains__(self, cell):
+        return cell in self._counts
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._cells)[index]
+        return self._cells[index]
+
+    def __repr__(self):
+        return f"SnakeBody({list(self._cells)!r})"
+
+class CountingSnakeBody(SnakeBody):
+    # SnakeBody that also counts membership tests. Game swaps bodies to this
+    # class only while a profiler is attached, so normal runs pay nothing.
+    probes = 0
+
+    def __contains__(self, cell):
+        CountingSnakeBody.probes += 1
+        return cell in self._counts
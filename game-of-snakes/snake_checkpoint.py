@@ -0,0 +1,134 @@
+import gc
+import itertools
+import json
+import numpy as np
+from player_snake import PlayerSnake
+from snake_body import SnakeBody
+from snake_engine import Egg, Game, Snake
+
+# A checkpoint is an .npz of flat arrays: one entry per snake or item in
+# each column, with all snake bodies concatenated head first and split again
+# by `snake_offsets`. Loading one and carrying on gives the same run as if
+# the game had never stopped.
+CHECKPOINT_VERSION = 2
+SETTINGS = ("hatch_cycles", "lay_interval", "hungry_die_cycles", "turn_interval", "tangled_die_cycles", "food_attract_radius", "egg_attract_radius", "shading_interval")
+COUNTERS = ("cycle", "max_snake_length", "total_eggs", "total_food", "total_births", "total_deaths", "total_bites", "player_alive", "player_max_length", "player_survive_cycles", "player_eaten")
+SNAKE_COLUMNS = ("sid", "born_cycle", "last_lay", "steps_since_dir_change", "tangled_cycles", "last_shading", "hungry", "ate")
+
+def save_game(game, path):
+    arrays = {"version": CHECKPOINT_VERSION, "grid_size": game.grid_size, "next_snake_id": game._next_snake_id, "hatch_seq": game.eggs._hatch_seq}
+    for name in SETTINGS + COUNTERS:
+        arrays[name] = getattr(game, name)
+    arrays["player_direction"] = np.array(game.player_direction or (0, 0), dtype=np.int32)
+
+    snakes = game.snakes
+    for name in SNAKE_COLUMNS:
+        arrays["snake_" + name] = np.array([getattr(snake, name) for snake in snakes], dtype=np.int64)
+    arrays["snake_player"] = np.array([isinstance(snake, PlayerSnake) for snake in snakes], dtype=bool)
+    arrays["snake_head_seq"] = np.array([snake.body.head_seq for snake in snakes], dtype=np.int64)
+    arrays["snake_direction"] = np.array([snake.direction for snake in snakes], dtype=np.int8).reshape(-1, 2)
+    arrays["snake_last_head"] = np.array([snake.last_head for snake in snakes], dtype=np.int32).reshape(-1, 2)
+    lengths = np.array([len(snake.body) for snake in snakes], dtype=np.int64)
+    arrays["snake_offsets"] = np.concatenate(([0], np.cumsum(lengths)))
+    cells = itertools.chain.from_iterable(itertools.chain.from_iterable(snake.body for snake in snakes))
+    arrays["segments"] = np.fromiter(cells, dtype=np.int32, count=2 * int(lengths.sum())).reshape(-1, 2)
+
+    eggs = list(game.eggs)
+    seqs = game.eggs.hatch_seqs()
+    arrays["item_cell"] = np.array([(egg.x, egg.y) for egg in eggs], dtype=np.int32).reshape(-1, 2)
+    arrays["item_hatch_cycle"] = np.array([egg.hatch_cycle for egg in eggs], dtype=np.int64)
+    arrays["item_hatch_seq"] = np.array([seqs.get(id(egg), -1) for egg in eggs], dtype=np.int64)
+    arrays["item_food"] = np.array([egg.is_food for egg in eggs], dtype=bool)
+    arrays["item_player"] = np.array([egg.is_player for egg in eggs], dtype=bool)
+
+    # Generator states hold 128-bit integers, so the RNG goes in as JSON
+    arrays["rng"] = json.dumps(game.rng.getstate())
+
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+def load_game(path):
+    with np.load(path) as data:
+        if int(data["version"]) != CHECKPOINT_VERSION:
+            raise ValueError(f"{path}: unsupported checkpoint version {int(data['version'])}")
+        data = {name: data[name] for name in data.files}
+    # Nothing built here can be garbage yet, so spare the collector from
+    # scanning every new segment tuple
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _build_game(data)
+    finally:
+        if enabled:
+            gc.enable()
+
+def _build_game(data):
+    game = Game(grid_size=int(data["grid_size"]))
+    for name in SETTINGS + COUNTERS:
+        # Checkpoints from before a counter was added leave it at zero
+        if name in data:
+            setattr(game, name, data[name].item())
+    game.rng.setstate(json.loads(data["rng"].item()))
+    direction = tuple(data["player_direction"].tolist())
+    game.player_direction = direction if direction != (0, 0) else None
+
+    segments = list(map(tuple, data["segments"].tolist()))
+    offsets = data["snake_offsets"].tolist()
+    columns = [data["snake_" + name].tolist() for name in SNAKE_COLUMNS]
+    players = data["snake_player"].tolist()
+    head_seqs = data["snake_head_seq"].tolist()
+    directions = list(map(tuple, data["snake_direction"].tolist()))
+    last_heads = list(map(tuple, data["snake_last_head"].tolist()))
+    settings = {name: getattr(game, name) for name in ("turn_interval", "tangled_die_cycles", "food_attract_radius", "egg_attract_radius", "shading_interval")}
+    for i, values in enumerate(zip(*columns)):
+        body = SnakeBody(segments[offsets[i]:offsets[i + 1]])
+        body.head_seq = head_seqs[i]
+        snake_class = PlayerSnake if players[i] else Snake
+        snake = snake_class(body, directions[i], 0, grid_size=game.grid_size, rng=game.rng, **settings)
+        for name, value in zip(SNAKE_COLUMNS, values):
+            setattr(snake, name, value)
+        snake.hungry = bool(snake.hungry)
+        snake.ate = bool(snake.ate)
+        snake.last_head = last_heads[i]
+        game._register_snake(snake, snake.sid)
+        game.snakes.append(snake)
+    game._next_snake_id = int(data["next_snake_id"])
+
+    cells = map(tuple, data["item_cell"].tolist())
+    items = zip(cells, data["item_hatch_cycle"].tolist(), data["item_hatch_seq"].tolist(), data["item_food"].tolist(), data["item_player"].tolist())
+    for (x, y), hatch_cycle, seq, is_food, is_player in items:
+        game.eggs.add(Egg(x, y, hatch_cycle, is_food=is_food, is_player=is_player), None if seq < 0 else seq)
+    game.eggs._hatch_seq = int(data["hatch_seq"])
+
+    game.stats_snakes = len(game.snakes)
+    # Painting the grid from the columns is much faster than rebuild_grid()
+    game.grid = grid_codes(data)
+    game._cell_counts = np.bincount(game.grid.ravel(), minlength=7).tolist()
+    game._dirty_cells.clear()
+    game._flush_grid()
+    return game
+
+def grid_codes(data):
+    # Same codes as Game._cell_code: the latest registered snake on a cell
+    # wins, then items
+    size = int(data["grid_size"])
+    grid = np.zeros(size * size, dtype=np.uint8)
+    items = data["item_cell"]
+    codes = np.where(data["item_food"], 4, np.where(data["item_player"], 5, 2))
+    grid[items[:, 0] * size + items[:, 1]] = codes
+    segments = data["segments"]
+    if len(segments):
+        offsets = data["snake_offsets"]
+        lengths = np.diff(offsets)
+        sid = np.repeat(data["snake_sid"], lengths)
+        player = np.repeat(data["snake_player"], lengths)
+        is_head = np.zeros(len(segments), dtype=bool)
+        is_head[offsets[:-1][lengths > 0]] = True
+        codes = np.where(player, np.where(is_head, 6, 5), np.where(is_head, 3, 1))
+        cells = segments[:, 0] * size + segments[:, 1]
+        # A snake's head is its newest segment, so it wins over the snake's
+        # own body on the same cell
+        order = np.lexsort((is_head, sid))[::-1]
+        cells, first = np.unique(cells[order], return_index=True)
+        grid[cells] = codes[order][first]
+    return grid.reshape(size, size)
@@ -0,0 +1,775 @@
+import heapq
+import numpy as np
+from player_snake import PlayerSnake
+from snake_body import SnakeBody, CountingSnakeBody
+from snake_field import AttractionField
+from snake_rng import DIRECTIONS, RandomStream
+
+DEFAULT_GRID_SIZE = 80
+
+class Egg:
+    def __init__(self, x, y, hatch_cycle, is_food=False, is_player=False):
+        self.x = x
+        self.y = y
+        self.hatch_cycle = hatch_cycle
+        self.is_food = is_food
+        self.is_player = is_player
+
+class Snake:
+    def __init__(self, body, direction, born_cycle, hungry=False, turn_interval=30, tangled_die_cycles=30, food_attract_radius=5, egg_attract_radius=5, shading_interval=300, grid_size=DEFAULT_GRID_SIZE, rng=None):
+        self.grid_size = grid_size
+        self.rng = rng if rng is not None else RandomStream()
+        self.body = body
+        self.direction = direction
+        self.born_cycle = born_cycle
+        self.last_lay = born_cycle
+        self.steps_since_dir_change = 0
+        self.turn_interval = turn_interval
+        self.hungry = hungry
+        self.ate = False
+        self.tangled_cycles = 0
+        self.tangled_die_cycles = tangled_die_cycles
+        self.food_attract_radius = food_attract_radius
+        self.egg_attract_radius = egg_attract_radius
+        self.last_head = self.head()
+        self.shading_interval = shading_interval
+        self.last_shading = born_cycle
+
+    @property
+    def body(self):
+        return self._body
+
+    @body.setter
+    def body(self, cells):
+        self._body = cells if isinstance(cells, SnakeBody) else SnakeBody(cells)
+
+    def head(self):
+        return self.body[0]
+
+    def move(self, field):
+        self.steps_since_dir_change += 1
+        head_x, head_y = self.head()
+        moved = False
+        target = field.target_field(head_x, head_y, self.food_attract_radius, self.egg_attract_radius)
+        if target is not None:
+            preferred_dirs = field.downhill(target, head_x, head_y)
+            possible_dirs = preferred_dirs + [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(-1,1),(1,-1)]
+            for ddx, ddy in possible_dirs:
+                new_head = (head_x + ddx, head_y + ddy)
+                if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                    self.direction = (ddx, ddy)
+                    self.body.advance(new_head)
+                    self.steps_since_dir_change = 0
+                    moved = True
+                    break
+        if not moved:
+            if self.steps_since_dir_change >= self.turn_interval:
+                for dx, dy in self.rng.directions():
+                    new_head = (head_x + dx, head_y + dy)
+                    if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                        self.direction = (dx, dy)
+                        self.steps_since_dir_change = 0
+                        self.body.advance(new_head)
+                        moved = True
+                        break
+                if not moved:
+                    self.bounce()
+                    dx, dy = self.direction
+                    new_head = (head_x + dx, head_y + dy)
+                    if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                        self.body.advance(new_head)
+                        self.steps_since_dir_change = 0
+                        moved = True
+            if not moved:
+                dx, dy = self.direction
+                new_head = (head_x + dx, head_y + dy)
+                if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                    self.body.advance(new_head)
+                    moved = True
+                else:
+                    self.bounce()
+                    dx, dy = self.direction
+                    new_head = (head_x + dx, head_y + dy)
+                    if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                        self.body.advance(new_head)
+                        moved = True
+        if self.head() == self.last_head:
+            self.tangled_cycles += 1
+        else:
+            self.tangled_cycles = 0
+        self.last_head = self.head()
+
+    def grow_by(self, extra_body_len):
+        dx, dy = self.direction
+        for _ in range(extra_body_len):
+            for ddx, ddy in self.rng.directions():
+                new_head = (self.body[0][0] + ddx, self.body[0][1] + ddy)
+                if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                    self.direction = (ddx, ddy)
+                    self.body.push_head(new_head)
+                    break
+            else:
+                self.bounce()
+                dx, dy = self.direction
+                new_head = (self.body[0][0] + dx, self.body[0][1] + dy)
+                if 0 <= new_head[0] < self.grid_size and 0 <= new_head[1] < self.grid_size and new_head not in self.body:
+                    self.body.push_head(new_head)
+
+    def bounce(self):
+        if not self.body:
+            return
+        dx, dy = self.direction
+        x, y = self.body[0]
+        if x <= 0 or x >= self.grid_size-1:
+            dx = -dx
+        if y <= 0 or y >= self.grid_size-1:
+            dy = -dy
+        self.direction = (dx, dy)
+
+    def shade_skin(self, current_cycle, eggs):
+        if self.shading_interval <= 0 or len(self.body) < 2:
+            return
+        if current_cycle - self.last_shading >= self.shading_interval:
+            tail = self.body[-1]
+            eggs.append(Egg(tail[0], tail[1], 0, is_food=True))
+            self.last_shading = current_cycle
+
+class EggMap:
+    # Eggs and food keyed by cell, at most one item per cell, with running
+    # egg and food counts. Iteration follows insertion order.
+    # Unhatched eggs also go into a min-heap on hatch_cycle; entries for eggs
+    # that were eaten or turned into food are dropped when they surface.
+    # Every changed cell is added to `dirty` so the grid can be patched.
+    def __init__(self, dirty=None):
+        self.dirty = dirty if dirty is not None else set()
+        self.cells = {}
+        self.egg_count = 0
+        self.food_count = 0
+        self._hatch_queue = []
+        self._hatch_seq = 0
+
+    def get(self, cell):
+        return self.cells.get(cell)
+
+    def add(self, egg, seq=None):
+        # `seq` puts a restored egg back at its old place among eggs that
+        # hatch on the same cycle
+        cell = (egg.x, egg.y)
+        if cell in self.cells:
+            return False
+        self.cells[cell] = egg
+        self.dirty.add(cell)
+        if egg.is_food:
+            self.food_count += 1
+        else:
+            self.egg_count += 1
+            if seq is None:
+                seq = self._hatch_seq
+                self._hatch_seq += 1
+            heapq.heappush(self._hatch_queue, (egg.hatch_cycle, seq, egg))
+        return True
+
+    def hatch_seqs(self):
+        # Hatch queue sequence number of every unhatched egg
+        return {id(egg): seq for _, seq, egg in self._hatch_queue if self._is_pending(egg)}
+
+    def _is_pending(self, egg):
+        return not egg.is_food and self.cells.get((egg.x, egg.y)) is egg
+
+    def due(self, cycle):
+        hatching = []
+        queue = self._hatch_queue
+        while queue and queue[0][0] <= cycle:
+            egg = heapq.heappop(queue)[2]
+            if self._is_pending(egg):
+                hatching.append(egg)
+        return hatching
+
+    def next_hatch(self):
+        # Earliest hatch_cycle of an egg still waiting, or None
+        queue = self._hatch_queue
+        while queue and not self._is_pending(queue[0][2]):
+            heapq.heappop(queue)
+        return queue[0][0] if queue else None
+
+    def make_food(self, egg):
+        if not egg.is_food:
+            egg.is_food = True
+            self.egg_count -= 1
+            self.food_count += 1
+            self.dirty.add((egg.x, egg.y))
+
+    def remove(self, egg):
+        del self.cells[(egg.x, egg.y)]
+        self.dirty.add((egg.x, egg.y))
+        if egg.is_food:
+            self.food_count -= 1
+        else:
+            self.egg_count -= 1
+
+    def __iter__(self):
+        return iter(self.cells.values())
+
+    def __len__(self):
+        return len(self.cells)
+
+class OccupancyMap:
+    # cell -> {snake id: segment sequence number}. Snakes may overlap each
+    # other, so a cell can hold several owners at once. Every changed cell is
+    # added to `dirty` so the grid can be patched.
+    def __init__(self, dirty=None):
+        self.dirty = dirty if dirty is not None else set()
+        self.cells = {}
+
+    def touch(self, cell):
+        self.dirty.add(cell)
+
+    def add(self, cell, owner, seq):
+        self.dirty.add(cell)
+        owners = self.cells.get(cell)
+        if owners is None:
+            self.cells[cell] = {owner: seq}
+        else:
+            owners[owner] = seq
+
+    def remove(self, cell, owner, seq):
+        self.dirty.add(cell)
+        owners = self.cells.get(cell)
+        if owners is not None and owners.get(owner) == seq:
+            del owners[owner]
+            if not owners:
+                del self.cells[cell]
+
+    def owners(self, cell):
+        return self.cells.get(cell, EMPTY_OWNERS)
+
+EMPTY_OWNERS = {}
+
+class Game:
+    supports_player = True
+
+    def __init__(self, grid_size=DEFAULT_GRID_SIZE, seed=None):
+        self.grid_size = grid_size
+        self.rng = RandomStream(seed)
+        self._profiler = None
+        # Callables run as listener(game) at the end of every update()
+        self.listeners = []
+        self.reset()
+        self.hatch_cycles = 30
+        self.lay_interval = 120
+        self.hungry_die_cycles = 300
+        self.turn_interval = 30
+        self.tangled_die_cycles = 30
+        self.food_attract_radius = 5
+        self.egg_attract_radius = 5
+        self.shading_interval = 300
+        self.max_snake_length = 0
+        self.total_eggs = 0
+        self.total_food = 0
+        self.stats_head = 0
+        self.stats_body = 0
+        self.stats_egg = 0
+        self.stats_food_legend = 0
+        self.stats_player_body = 0
+        self.stats_player_head = 0
+        self.player_alive = True
+        self.player_max_length = 0
+        self.player_survive_cycles = 0
+
+    def reset(self):
+        self.cycle = 0
+        self._dirty_cells = set()
+        self.eggs = EggMap(self._dirty_cells)
+        self.snakes = []
+        self.occupancy = OccupancyMap(self._dirty_cells)
+        self.snakes_by_id = {}
+        self._next_snake_id = 0
+        self.grid = np.zeros((self.grid_size, self.grid_size), dtype=np.uint8)
+        self._cell_counts = [self.grid_size * self.grid_size, 0, 0, 0, 0, 0, 0]
+        self.stats_snakes = 0
+        self.stats_eggs = 0
+        self.max_snake_length = 0
+        self.total_eggs = 0
+        self.total_food = 0
+        self.total_births = 0
+        self.total_deaths = 0
+        self.total_bites = 0  # snakes eaten by another snake, head-on or bitten
+        self.stats_head = 0
+        self.stats_body = 0
+        self.stats_egg = 0
+        self.stats_food_legend = 0
+        self.stats_player_body = 0
+        self.stats_player_head = 0
+        self.player_alive = True
+        self.player_max_length = 0
+        self.player_survive_cycles = 0
+        self.stats_food = 0
+        self.player_direction = None
+        self.player_eaten = False
+
+    def add_egg(self, x, y, is_player=False):
+        egg = self.eggs.get((x, y))
+        if egg is not None:
+            self.eggs.make_food(egg)
+            return
+        self.eggs.add(Egg(x, y, self.cycle + self.hatch_cycles, is_player=is_player))
+        self.total_eggs += 1
+        self._flush_grid()
+
+    def add_food(self, x, y):
+        egg = self.eggs.get((x, y))
+        if egg is not None:
+            self.eggs.make_food(egg)
+            return
+        self.eggs.add(Egg(x, y, 0, is_food=True))
+        self.total_food += 1
+        self._flush_grid()
+
+    def add_snake(self, body, direction, hungry=False, is_player=False):
+        valid_body = [(x, y) for x, y in body if 0 <= x < self.grid_size and 0 <= y < self.grid_size]
+        if len(valid_body) >= 3:
+            if is_player:
+                snake = PlayerSnake(valid_body, direction, self.cycle, hungry=hungry, turn_interval=self.turn_interval, tangled_die_cycles=self.tangled_die_cycles, food_attract_radius=self.food_attract_radius, egg_attract_radius=self.egg_attract_radius, shading_interval=self.shading_interval, grid_size=self.grid_size, rng=self.rng)
+            else:
+                snake = Snake(valid_body, direction, self.cycle, hungry=hungry, turn_interval=self.turn_interval, tangled_die_cycles=self.tangled_die_cycles, food_attract_radius=self.food_attract_radius, egg_attract_radius=self.egg_attract_radius, shading_interval=self.shading_interval, grid_size=self.grid_size, rng=self.rng)
+            self._register_snake(snake)
+            self.snakes.append(snake)
+            if len(valid_body) > self.max_snake_length:
+                self.max_snake_length = len(valid_body)
+            self._flush_grid()
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        # While profiling, bodies count their membership tests
+        self._profiler = profiler
+        body_class = SnakeBody if profiler is None else CountingSnakeBody
+        for snake in self.snakes:
+            snake.body.__class__ = body_class
+
+    def update(self):
+        prof = self._profiler
+        if prof:
+            prof.begin()
+            probes = CountingSnakeBody.probes
+        self.cycle += 1
+        alive_before = len(self.snakes)
+        new_snakes = []
+        for egg in self.eggs.due(self.cycle):
+            self.eggs.remove(egg)
+            dir = self.rng.choice(DIRECTIONS)
+            body = [(egg.x, egg.y)]
+            for i in range(1,3):
+                nx, ny = egg.x + dir[0]*i, egg.y + dir[1]*i
+                if 0 <= nx < self.grid_size and 0 <= ny < self.grid_size:
+                    body.append((nx, ny))
+            if len(body) == 3:
+                if egg.is_player:
+                    new_snake = PlayerSnake(body, dir, self.cycle, hungry=True, turn_interval=self.turn_interval, tangled_die_cycles=self.tangled_die_cycles, food_attract_radius=self.food_attract_radius, egg_attract_radius=self.egg_attract_radius, shading_interval=self.shading_interval, grid_size=self.grid_size, rng=self.rng)
+                else:
+                    new_snake = Snake(body, dir, self.cycle, hungry=True, turn_interval=self.turn_interval, tangled_die_cycles=self.tangled_die_cycles, food_attract_radius=self.food_attract_radius, egg_attract_radius=self.egg_attract_radius, shading_interval=self.shading_interval, grid_size=self.grid_size, rng=self.rng)
+                self._register_snake(new_snake)
+                new_snakes.append(new_snake)
+                if len(body) > self.max_snake_length:
+                    self.max_snake_length = len(body)
+        self.snakes += new_snakes
+        self.total_births += len(new_snakes)
+        if prof:
+            prof.count("hatched", len(new_snakes))
+            prof.mark("hatch")
+
+        eggs_to_add = []
+        field = self._attraction_field()
+        player_snake = None
+        for snake in self.snakes:
+            if isinstance(snake, PlayerSnake):
+                player_snake = snake
+                break
+        for snake in self.snakes:
+            if len(snake.body) >= 3:
+                snake.turn_interval = self.turn_interval
+                snake.tangled_die_cycles = self.tangled_die_cycles
+                snake.food_attract_radius = self.food_attract_radius
+                snake.egg_attract_radius = self.egg_attract_radius
+                snake.shading_interval = self.shading_interval
+                snake.bounce()
+                if isinstance(snake, PlayerSnake):
+                    snake.move(field, self.player_direction)
+                else:
+                    snake.move(field)
+                snake.shade_skin(self.cycle, eggs_to_add)
+                if len(snake.body) > self.max_snake_length:
+                    self.max_snake_length = len(snake.body)
+        self.snakes = [snake for snake in self.snakes if len(snake.body) >= 3]
+        if prof:
+            prof.count("moves", len(self.snakes))
+            prof.count("membership_tests", CountingSnakeBody.probes - probes)
+            prof.mark("move")
+        index_of = {snake.sid: idx for idx, snake in enumerate(self.snakes)}
+        head_groups = []
+        for idx, snake in enumerate(self.snakes):
+            owners = self.occupancy.owners(snake.head())
+            if len(owners) > 1:
+                idxs = sorted(index_of[sid] for sid, seq in owners.items() if seq == self.snakes_by_id[sid].body.head_seq)
+                # Each group is recorded once, by its lowest index
+                if len(idxs) > 1 and idxs[0] == idx:
+                    head_groups.append(idxs)
+        eaten_snakes = set()
+        player_eaten = False
+        for idxs in head_groups:
+            eater = self.rng.choice(idxs)
+            for idx in idxs:
+                if idx != eater and self.snakes[idx].body:
+                    # Check if player snake is eaten
+                    if isinstance(self.snakes[idx], PlayerSnake):
+                        player_eaten = True
+                        self.player_alive = False
+                        self.player_survive_cycles = self.cycle - self.snakes[idx].born_cycle
+                        self.player_max_length = max(self.player_max_length, len(self.snakes[idx].body))
+                    if prof:
+                        prof.count("grow_by", len(self.snakes[idx].body))
+                    self.snakes[eater].grow_by(len(self.snakes[idx].body))
+                    self.snakes[eater].ate = True
+                    self._release_snake(self.snakes[idx])
+                    eaten_snakes.add(idx)
+        if prof:
+            prof.count("collision_checks", len(self.snakes))
+            prof.mark("head_collisions")
+        for snake in self.snakes:
+            if not snake.body:
+                continue
+            egg = self.eggs.get(snake.head())
+            if egg is not None:
+                if prof:
+                    prof.count("grow_by")
+                snake.grow_by(1)
+                snake.ate = True
+                if egg.is_food:
+                    self.total_food += 1
+                self.eggs.remove(egg)
+        if prof:
+            prof.mark("eat")
+        snakes_to_remove = set()
+        bite_checks = 0
+        for i, snake in enumerate(self.snakes):
+            if not snake.body:
+                continue
+            # Victims are taken in index order; growing moves the head, so
+            # each later lookup only considers snakes after the last victim.
+            last_j = -1
+            while True:
+                bite_checks += 1
+                owners = self.occupancy.owners(snake.head())
+                victims = [index_of[sid] for sid in owners if sid != snake.sid and index_of[sid] > last_j]
+                if not victims:
+                    break
+                j = min(victims)
+                last_j = j
+                other = self.snakes[j]
+                eaten_length = len(other.body)
+                # Check if player snake is eaten
+                if isinstance(other, PlayerSnake):
+                    player_eaten = True
+                    self.player_alive = False
+                    self.player_survive_cycles = self.cycle - other.born_cycle
+                    self.player_max_length = max(self.player_max_length, len(other.body))
+                if prof:
+                    prof.count("grow_by", eaten_length)
+                snake.grow_by(eaten_length)
+                snake.ate = True
+                self._release_snake(other)
+                snakes_to_remove.add(j)
+        if prof:
+            prof.count("collision_checks", bite_checks)
+            prof.count("bites", len(snakes_to_remove))
+            prof.mark("bites")
+        self.total_bites += len(eaten_snakes) + len(snakes_to_remove)
+        survivors = []
+        for idx, snake in enumerate(self.snakes):
+            starved = snake.hungry and not snake.ate and self.cycle - snake.born_cycle > self.hungry_die_cycles
+            if len(snake.body) >= 3 and idx not in snakes_to_remove and snake.tangled_cycles <= snake.tangled_die_cycles and not starved:
+                survivors.append(snake)
+            else:
+                self._release_snake(snake)
+        self.snakes = survivors
+        for snake in self.snakes:
+            if snake.hungry and snake.ate:
+                snake.hungry = False
+            snake.ate = False
+        if prof:
+            prof.mark("cull")
+        for snake in self.snakes:
+            if not snake.body:
+                continue
+            if not isinstance(snake, PlayerSnake):
+                if len(snake.body) > 3 and self.cycle - snake.last_lay >= self.lay_interval:
+                    tail = snake.body[-1]
+                    if 0 <= tail[0] < self.grid_size and 0 <= tail[1] < self.grid_size:
+                        eggs_to_add.append(Egg(tail[0], tail[1], self.cycle + self.hatch_cycles, is_player=False))
+                    snake.last_lay = self.cycle
+        for egg in eggs_to_add:
+            # A cell holds one item; laying or shedding onto it keeps what is there
+            if self.eggs.add(egg) and not egg.is_food:
+                self.total_eggs += 1
+        if prof:
+            prof.mark("lay")
+            prof.count("dirty_cells", len(self._dirty_cells))
+        self._flush_grid()
+        if prof:
+            prof.mark("grid")
+        self.stats_snakes = len(self.snakes)
+        self.total_deaths += alive_before + len(new_snakes) - len(self.snakes)
+        # Track player snake stats
+        if player_snake and len(player_snake.body) > self.player_max_length:
+            self.player_max_length = len(player_snake.body)
+        if player_snake and self.player_alive:
+            self.player_survive_cycles = self.cycle - player_snake.born_cycle
+        self.player_eaten = player_eaten
+        if prof:
+            prof.mark("stats")
+            prof.end()
+        for listener in self.listeners:
+            listener(self)
+
+    def _attraction_field(self):
+        food = np.zeros((self.grid_size, self.grid_size), dtype=bool)
+        eggs = np.zeros((self.grid_size, self.grid_size), dtype=bool)
+        for (x, y), egg in self.eggs.cells.items():
+            if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
+                if egg.is_food:
+                    food[x, y] = True
+                else:
+                    eggs[x, y] = True
+        return AttractionField(food, eggs, self.food_attract_radius, self.egg_attract_radius)
+
+    def _cell_code(self, cell):
+        owners = self.occupancy.owners(cell)
+        if owners:
+            # Snakes are drawn in list order, which is registration order
+            sid = max(owners)
+            snake = self.snakes_by_id[sid]
+            is_head = owners[sid] == snake.body.head_seq
+            if isinstance(snake, PlayerSnake):
+                return 6 if is_head else 5  # kepala oranye / badan biru
+            return 3 if is_head else 1
+        egg = self.eggs.get(cell)
+        if egg is None:
+            return 0
+        if egg.is_food:
+            return 4
+        return 5 if egg.is_player else 2
+
+    def _flush_grid(self):
+        grid = self.grid
+        counts = self._cell_counts
+        size = grid.shape[0]
+        for cell in self._dirty_cells:
+            x, y = cell
+            if 0 <= x < size and 0 <= y < size:
+                code = self._cell_code(cell)
+                old = grid[x, y]
+                if code != old:
+                    grid[x, y] = code
+                    counts[old] -= 1
+                    counts[code] += 1
+        self._dirty_cells.clear()
+        self.stats_head = counts[3] + counts[6]
+        self.stats_body = counts[1] + counts[5]
+        self.stats_egg = counts[2]
+        self.stats_food_legend = counts[4]
+        self.stats_player_body = counts[5]
+        self.stats_player_head = counts[6]
+        self.stats_eggs = self.eggs.egg_count
+        self.stats_food = self.eggs.food_count
+
+    def resize(self, grid_size):
+        # Snakes with a segment off the new grid are dropped, as are eggs and food
+        self.grid_size = grid_size
+        inside = lambda x, y: 0 <= x < grid_size and 0 <= y < grid_size
+        survivors = []
+        for snake in self.snakes:
+            snake.grid_size = grid_size
+            if all(inside(x, y) for x, y in snake.body):
+                survivors.append(snake)
+            else:
+                self._release_snake(snake)
+        self.snakes = survivors
+        self.stats_snakes = len(survivors)
+        for egg in list(self.eggs):
+            if not inside(egg.x, egg.y):
+                self.eggs.remove(egg)
+        self.rebuild_grid()
+
+    def rebuild_grid(self):
+        self.grid = np.zeros((self.grid_size, self.grid_size), dtype=np.uint8)
+        self._cell_counts = [self.grid_size * self.grid_size, 0, 0, 0, 0, 0, 0]
+        self._dirty_cells.update(self.occupancy.cells)
+        self._dirty_cells.update(self.eggs.cells)
+        self._flush_grid()
+
+    def _register_snake(self, snake, sid=None):
+        if sid is None:
+            sid = self._next_snake_id
+            self._next_snake_id += 1
+        snake.sid = sid
+        self.snakes_by_id[snake.sid] = snake
+        if self._profiler is not None:
+            snake.body.__class__ = CountingSnakeBody
+        snake.body.attach(self.occupancy, snake.sid)
+
+    def _release_snake(self, snake):
+        if self.snakes_by_id.pop(getattr(snake, "sid", None), None) is snake:
+            snake.body.detach()
+        snake.body = []
+
+    def fast_forward(self, last_cycle=None):
+        # With no snakes nothing happens until the next egg hatches, so jump
+        # to the cycle before that (never past last_cycle). The state is the
+        # same as after stepping there, and listeners still get called once
+        # for each cycle skipped.
+        if self.snakes:
+            return
+        hatch = self.eggs.next_hatch()
+        if hatch is None:
+            if last_cycle is None:
+                return
+            target = last_cycle
+        else:
+            target = hatch - 1 if last_cycle is None else min(hatch - 1, last_cycle)
+        if target > self.cycle:
+            self.stats_snakes = 0
+            self.player_eaten = False
+            self._flush_grid()
+            if not self.listeners:
+                self.cycle = target
+            while self.cycle < target:
+                self.cycle += 1
+                for listener in self.listeners:
+                    listener(self)
+
+    def step(self, cycles=1):
+        end = self.cycle + cycles
+        while self.cycle < end:
+            self.fast_forward(end)
+            if self.cycle < end:
+                self.update()
+
+    def run(self, max_cycles):
+        end = self.cycle + max_cycles
+        while self.cycle < end:
+            self.update()
+            if self.is_extinct():
+                break
+            self.fast_forward(end)
+        return self.cycle
+
+    def run_until_extinct(self, max_cycles=None):
+        # Returns the cycle the world died out on, or None if it was still
+        # alive after max_cycles
+        while max_cycles is None:
+            self.update()
+            if self.is_extinct():
+                return self.cycle
+            self.fast_forward()
+        self.run(max_cycles)
+        return self.cycle if self.is_extinct() else None
+
+    def is_extinct(self):
+        return len(self.snakes) == 0 and self.eggs.egg_count == 0
+
+    def _random_empty_cells(self, count):
+        count = min(count, int(np.count_nonzero(self.grid == 0)))
+        for _ in range(count):
+            while True:
+                x = self.rng.randint(0, self.grid_size-1)
+                y = self.rng.randint(0, self.grid_size-1)
+                if self.grid[x, y] == 0:
+                    break
+            yield x, y
+
+    def scatter_eggs(self, count):
+        for x, y in self._random_empty_cells(count):
+            self.add_egg(x, y)
+
+    def scatter_food(self, count):
+        for x, y in self._random_empty_cells(count):
+            self.add_food(x, y)
+
+    def stats(self):
+        return {
+            "cycle": self.cycle,
+            "snakes": self.stats_snakes,
+            "eggs": self.stats_eggs,
+            "food": self.stats_food,
+            "head": self.stats_head,
+            "body": self.stats_body,
+            "egg": self.stats_egg,
+            "food_legend": self.stats_food_legend,
+            "player_body": self.stats_player_body,
+            "player_head": self.stats_player_head,
+            "max_snake_length": self.max_snake_length,
+            "total_eggs": self.total_eggs,
+            "total_food": self.total_food,
+            "total_births": self.total_births,
+            "total_deaths": self.total_deaths,
+            "total_bites": self.total_bites,
+            "mean_length": sum(len(snake.body) for snake in self.snakes) / len(self.snakes) if self.snakes else 0.0,
+        }
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Run Game of Snakes without the UI")
+    parser.add_argument("--eggs", type=int, default=50, help="eggs placed at random empty cells")
+    parser.add_argument("--food", type=int, default=0, help="food placed at random empty cells")
+    parser.add_argument("--cycles", type=int, default=1000, help="maximum cycles to run; 0 runs until extinction")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--grid-size", type=int, default=DEFAULT_GRID_SIZE)
+    parser.add_argument("--engine", choices=("object", "vector"), default="object", help="Snake objects or NumPy columns (snake_vector_engine)")
+    parser.add_argument("--profile", action="store_true", help="print per-phase timings")
+    parser.add_argument("--resume", metavar="CHECKPOINT", help="continue a saved game instead of starting a new one")
+    parser.add_argument("--save", metavar="CHECKPOINT", help="save the game when the run ends")
+    parser.add_argument("--series", metavar="PATH", help="record population stats every cycle, to a .csv file or a directory of .npz chunks")
+    parser.add_argument("--overwrite", action="store_true", help="replace an existing --series recording")
+    args = parser.parse_args()
+    if args.engine == "vector" and (args.resume or args.save):
+        parser.error("checkpoints are only supported by the object engine")
+    if args.resume:
+        from snake_checkpoint import load_game
+        game = load_game(args.resume)
+    elif args.engine == "vector":
+        from snake_vector_engine import VectorGame
+        game = VectorGame(grid_size=args.grid_size, seed=args.seed)
+    else:
+        game = Game(grid_size=args.grid_size, seed=args.seed)
+    if args.profile:
+        from snake_profiler import UpdateProfiler
+        game.profiler = UpdateProfiler(window=args.cycles)
+    if not args.resume:
+        game.scatter_eggs(args.eggs)
+        game.scatter_food(args.food)
+    if args.series:
+        from snake_timeseries import PopulationRecorder
+        try:
+            recorder = PopulationRecorder(args.series, overwrite=args.overwrite)
+        except FileExistsError as error:
+            parser.error(f"{error}; pass --overwrite to replace it")
+        recorder(game)
+        game.listeners.append(recorder)
+    start = time.perf_counter()
+    start_cycle = game.cycle
+    game.run_until_extinct(args.cycles or None)
+    elapsed = time.perf_counter() - start
+    if args.series:
+        recorder.close()
+    if args.save:
+        from snake_checkpoint import save_game
+        save_game(game, args.save)
+    for key, value in game.stats().items():
+        print(f"{key}: {value}")
+    print(f"cycles/sec: {(game.cycle - start_cycle) / elapsed if elapsed > 0 else 0:.1f}")
+    if args.profile:
+        print(game.profiler.format_hud())
@@ -0,0 +1,79 @@
+import numpy as np
+
+FAR = np.iinfo(np.int32).max // 4  # distance of cells with no source at all
+DILATE_LIMIT = 12  # below this limit, growing the sources step by step is cheaper
+
+# Neighbour order for descending a field: straight steps, then diagonals
+AXIS_DIRS = ((-1,0),(1,0),(0,-1),(0,1))
+DIAGONAL_DIRS = ((-1,-1),(1,1),(-1,1),(1,-1))
+
+def _spread(dist, axis):
+    # One 1D pass of the L1 transform along `axis`:
+    # out[j] = min over k of dist[k] + |j - k|
+    n = dist.shape[axis]
+    shape = [1, 1]
+    shape[axis] = n
+    idx = np.arange(n, dtype=dist.dtype).reshape(shape)
+    forward = dist - idx
+    np.minimum.accumulate(forward, axis=axis, out=forward)
+    forward += idx
+    backward = np.flip(dist + idx, axis)
+    np.minimum.accumulate(backward, axis=axis, out=backward)
+    backward = np.flip(backward, axis)
+    backward -= idx
+    return np.minimum(forward, backward, out=forward)
+
+def _dilate(sources, limit):
+    # Grow the sources one step per round; after `limit` rounds every cell
+    # within `limit` has its exact distance and the rest are left at limit + 1
+    dist = np.where(sources, 0, limit + 1).astype(np.uint8)
+    if not sources.any():
+        return dist
+    for _ in range(limit):
+        step = dist + 1
+        np.minimum(dist[1:], step[:-1], out=dist[1:])
+        np.minimum(dist[:-1], step[1:], out=dist[:-1])
+        np.minimum(dist[:, 1:], step[:, :-1], out=dist[:, 1:])
+        np.minimum(dist[:, :-1], step[:, 1:], out=dist[:, :-1])
+    return dist
+
+def distance_field(sources, limit=None):
+    # Manhattan distance from every cell to the nearest True cell of the 2D
+    # mask `sources` (FAR when there is none). Exact, since the L1 transform
+    # separates into a pass along each axis. With a limit, distances past it
+    # are only known to be larger than the limit.
+    if limit is not None and limit < DILATE_LIMIT:
+        return _dilate(sources, limit)
+    dist = np.where(sources, 0, FAR).astype(np.int32)
+    if not dist.size or not sources.any():
+        return dist
+    return _spread(_spread(dist, 0), 1)
+
+class AttractionField:
+    # Distance to the nearest food and to the nearest egg for every cell,
+    # built once per cycle and shared by all snakes. A snake within its food
+    # radius of some food walks down the food field, otherwise down the egg
+    # field if it is within its egg radius. Each field only has to be exact
+    # up to the largest radius it is queried with.
+    def __init__(self, food_mask, egg_mask, food_radius=None, egg_radius=None):
+        self.food = distance_field(food_mask, food_radius)
+        self.eggs = distance_field(egg_mask, egg_radius)
+
+    def target_field(self, x, y, food_radius, egg_radius):
+        if self.food[x, y] <= food_radius:
+            return self.food
+        if self.eggs[x, y] <= egg_radius:
+            return self.eggs
+        return None
+
+    def downhill(self, field, x, y):
+        # Directions to the neighbours closer to a target than (x, y)
+        here = field[x, y]
+        width, height = field.shape
+        dirs = []
+        for group in (AXIS_DIRS, DIAGONAL_DIRS):
+            for dx, dy in group:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and field[nx, ny] < here:
+                    dirs.append((dx, dy))
+        return dirs
@@ -0,0 +1,87 @@
+import time
+from collections import deque
+import numpy as np
+
+PHASES = ("hatch", "move", "head_collisions", "eat", "bites", "cull", "lay", "grid", "stats")
+
+class UpdateProfiler:
+    # Times each phase of Game.update() and counts the work done in it.
+    # Only the last `window` cycles are kept, for rolling percentiles.
+    # Game calls begin(), then mark(phase) as each phase finishes, then end().
+    def __init__(self, window=300):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.phase_samples = {phase: deque(maxlen=self.window) for phase in PHASES}
+        self.cycle_samples = deque(maxlen=self.window)
+        self.cycle_ends = deque(maxlen=self.window)
+        self.paint_samples = deque(maxlen=self.window)
+        self.op_samples = {}
+        self.cycles = 0
+        self._ops = {}
+        self._start = 0.0
+        self._last = 0.0
+
+    def begin(self):
+        self._start = self._last = time.perf_counter()
+        self._ops = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phase_samples[phase].append(now - self._last)
+        self._last = now
+
+    def count(self, name, n=1):
+        self._ops[name] = self._ops.get(name, 0) + n
+
+    def end(self):
+        now = time.perf_counter()
+        self.cycle_samples.append(now - self._start)
+        self.cycle_ends.append(now)
+        for name, n in self._ops.items():
+            samples = self.op_samples.get(name)
+            if samples is None:
+                samples = self.op_samples[name] = deque(maxlen=self.window)
+            samples.append(n)
+        self.cycles += 1
+
+    def record_paint(self, seconds):
+        self.paint_samples.append(seconds)
+
+    def percentiles_ms(self, samples, qs=(50, 95, 99)):
+        if not samples:
+            return {f"p{q}": 0.0 for q in qs}
+        # Copy first: paint samples are appended from the GUI thread
+        values = np.percentile(np.array(tuple(samples), dtype=float), qs) * 1000.0
+        return {f"p{q}": float(v) for q, v in zip(qs, values)}
+
+    def cycles_per_second(self):
+        if len(self.cycle_ends) < 2:
+            return 0.0
+        span = self.cycle_ends[-1] - self.cycle_ends[0]
+        return (len(self.cycle_ends) - 1) / span if span > 0 else 0.0
+
+    def summary(self):
+        return {
+            "cycles": self.cycles,
+            "cycle_ms": self.percentiles_ms(self.cycle_samples),
+            "cycles_per_second": self.cycles_per_second(),
+            "paint_ms": self.percentiles_ms(self.paint_samples),
+            "phase_ms": {phase: self.percentiles_ms(samples)["p50"] for phase, samples in self.phase_samples.items()},
+            "ops_per_cycle": {name: float(np.mean(samples)) for name, samples in self.op_samples.items() if samples},
+        }
+
+    def format_hud(self):
+        s = self.summary()
+        cycle = s["cycle_ms"]
+        lines = [
+            f"update {cycle['p50']:.2f} ms p50  {cycle['p95']:.2f} ms p95",
+            f"{s['cycles_per_second']:.0f} cycles/s   paint {s['paint_ms']['p50']:.2f} ms",
+        ]
+        phases = [(phase, ms) for phase, ms in s["phase_ms"].items() if ms > 0]
+        for i in range(0, len(phases), 3):
+            lines.append("  ".join(f"{phase} {ms:.2f}" for phase, ms in phases[i:i+3]))
+        if s["ops_per_cycle"]:
+            lines.append("  ".join(f"{name} {n:.0f}" for name, n in s["ops_per_cycle"].items()))
+        return "\n".join(lines)
@@ -0,0 +1,150 @@
+import bisect
+import os
+import struct
+import numpy as np
+
+# Replay file layout, little endian:
+#   header   "SNKR", version, grid size, keyframe interval
+#   frames   kind, cycle, count, then either the whole grid (keyframe, count
+#            is the number of cells) or count cell indices followed by their
+#            count new codes (delta against the previous frame)
+#   index    (frame number, file offset) of every keyframe
+#   trailer  frame count, index offset, "SNKI"
+# A recording cut short has no index or trailer; the reader then finds the
+# keyframes by walking the frames.
+MAGIC = b"SNKR"
+INDEX_MAGIC = b"SNKI"
+VERSION = 1
+HEADER = struct.Struct("<4sHII")
+FRAME = struct.Struct("<BqI")
+TRAILER = struct.Struct("<QQ4s")
+KEYFRAME = 0
+DELTA = 1
+KEYFRAME_INTERVAL = 1000
+
+class ReplayWriter:
+    # Records the grid after every cycle. Use it as a game listener:
+    # game.listeners.append(writer)
+    def __init__(self, path, grid_size, keyframe_interval=KEYFRAME_INTERVAL, buffer_size=1 << 20):
+        self.grid_size = grid_size
+        self.keyframe_interval = keyframe_interval
+        self.frames = 0
+        self._file = open(path, "wb", buffering=buffer_size)
+        self._file.write(HEADER.pack(MAGIC, VERSION, grid_size, keyframe_interval))
+        self._offset = HEADER.size
+        self._previous = np.zeros(grid_size * grid_size, dtype=np.uint8)
+        self._keyframes = []
+
+    def __call__(self, game):
+        self.record(game.cycle, game.grid)
+
+    def record(self, cycle, grid):
+        grid = grid.reshape(-1)
+        if grid.shape != self._previous.shape:
+            raise ValueError(f"replay is for a {self.grid_size}x{self.grid_size} grid")
+        if self.frames % self.keyframe_interval == 0:
+            self._keyframes.append((self.frames, self._offset))
+            self._write(FRAME.pack(KEYFRAME, cycle, grid.size), grid.tobytes())
+        else:
+            cells = np.flatnonzero(grid != self._previous).astype(np.uint32)
+            self._write(FRAME.pack(DELTA, cycle, cells.size), cells.tobytes(), grid[cells].tobytes())
+        self._previous[:] = grid
+        self.frames += 1
+
+    def _write(self, *chunks):
+        for chunk in chunks:
+            self._file.write(chunk)
+            self._offset += len(chunk)
+
+    def close(self):
+        if self._file.closed:
+            return
+        index = np.array(self._keyframes, dtype=np.int64).reshape(-1, 2)
+        self._file.write(index.tobytes())
+        self._file.write(TRAILER.pack(self.frames, self._offset, INDEX_MAGIC))
+        self._file.close()
+
+class ReplayReader:
+    # Random access to the frames of a replay: frame(n) starts from the
+    # nearest keyframe at or before n and applies the deltas after it, or
+    # carries on from the last frame read when that is closer.
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        magic, version, self.grid_size, self.keyframe_interval = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise ValueError(f"{path} is not a Game of Snakes replay")
+        self._cells = self.grid_size * self.grid_size
+        if not self._read_index():
+            self._scan()
+        self._grid = np.zeros(self._cells, dtype=np.uint8)
+        self._position = -1  # frame currently in self._grid
+        self._next_offset = None
+        self.cycle = 0
+
+    def _read_index(self):
+        size = self._file.seek(0, os.SEEK_END)
+        if size < HEADER.size + TRAILER.size:
+            return False
+        self._file.seek(size - TRAILER.size)
+        frames, index_offset, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != INDEX_MAGIC:
+            return False
+        self._file.seek(index_offset)
+        index = np.frombuffer(self._file.read(size - TRAILER.size - index_offset), dtype=np.int64).reshape(-1, 2)
+        self.frames = frames
+        self._key_frames = index[:, 0].tolist()
+        self._key_offsets = index[:, 1].tolist()
+        return True
+
+    def _scan(self):
+        # Unfinished recording: walk the frames, stopping at a torn last one
+        # or at whatever is left of an index
+        self._key_frames = []
+        self._key_offsets = []
+        self.frames = 0
+        size = self._file.seek(0, os.SEEK_END)
+        offset = HEADER.size
+        while offset + FRAME.size <= size:
+            self._file.seek(offset)
+            kind, cycle, count = FRAME.unpack(self._file.read(FRAME.size))
+            if kind not in (KEYFRAME, DELTA) or (kind == KEYFRAME and count != self._cells):
+                break
+            end = offset + FRAME.size + (count if kind == KEYFRAME else 5 * count)
+            if end > size:
+                break
+            if kind == KEYFRAME:
+                self._key_frames.append(self.frames)
+                self._key_offsets.append(offset)
+            self.frames += 1
+            offset = end
+
+    def __len__(self):
+        return self.frames
+
+    def _read_frame(self, offset):
+        self._file.seek(offset)
+        kind, self.cycle, count = FRAME.unpack(self._file.read(FRAME.size))
+        if kind == KEYFRAME:
+            self._grid[:] = np.frombuffer(self._file.read(count), dtype=np.uint8)
+            return offset + FRAME.size + count
+        data = self._file.read(5 * count)
+        cells = np.frombuffer(data, dtype=np.uint32, count=count)
+        self._grid[cells] = np.frombuffer(data, dtype=np.uint8, offset=4 * count)
+        return offset + FRAME.size + 5 * count
+
+    def frame(self, n):
+        # Returns (cycle, grid) after frame n; the grid is reused by the next call
+        if not 0 <= n < self.frames:
+            raise IndexError(f"frame {n} out of range 0..{self.frames - 1}")
+        key = bisect.bisect_right(self._key_frames, n) - 1
+        if not self._key_frames[key] <= self._position <= n:
+            self._position = self._key_frames[key]
+            self._next_offset = self._read_frame(self._key_offsets[key])
+        while self._position < n:
+            self._next_offset = self._read_frame(self._next_offset)
+            self._position += 1
+        return self.cycle, self._grid.reshape(self.grid_size, self.grid_size)
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,86 @@
+import itertools
+import numpy as np
+
+# The eight neighbour steps, and every order they can be tried in
+DIRECTIONS = ((-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(1,-1),(-1,1))
+ORDERS = list(itertools.permutations(DIRECTIONS))
+BLOCK_SIZE = 4096
+
+class RandomStream:
+    # Seeded random numbers for one game, drawn from NumPy in blocks so the
+    # hot paths only pay for a list lookup per value. Direction orders and
+    # uniforms come from two child generators of one SeedSequence, so each
+    # sequence depends only on the seed, not on how the calls interleave.
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        orders_seed, uniforms_seed = np.random.SeedSequence(seed).spawn(2)
+        self._orders_rng = np.random.default_rng(orders_seed)
+        self._uniforms_rng = np.random.default_rng(uniforms_seed)
+        # Generator states from before the current blocks were drawn, so a
+        # saved state only needs them and the read positions
+        self._orders_state = self._orders_rng.bit_generator.state
+        self._orders = []
+        self._order_pos = 0
+        self._uniforms_state = self._uniforms_rng.bit_generator.state
+        self._uniforms = []
+        self._uniform_pos = 0
+
+    def _draw_orders(self):
+        self._orders_state = self._orders_rng.bit_generator.state
+        self._orders = self._orders_rng.integers(0, len(ORDERS), size=self.block_size).tolist()
+
+    def _draw_uniforms(self):
+        self._uniforms_state = self._uniforms_rng.bit_generator.state
+        self._uniforms = self._uniforms_rng.random(self.block_size).tolist()
+
+    def directions(self):
+        # The eight directions in a random order
+        i = self._order_pos
+        if i == len(self._orders):
+            self._draw_orders()
+            i = 0
+        self._order_pos = i + 1
+        return ORDERS[self._orders[i]]
+
+    def random(self):
+        i = self._uniform_pos
+        if i == len(self._uniforms):
+            self._draw_uniforms()
+            i = 0
+        self._uniform_pos = i + 1
+        return self._uniforms[i]
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def randint(self, a, b):
+        # Like random.randint: a <= n <= b
+        return a + int(self.random() * (b - a + 1))
+
+    def getstate(self):
+        # Plain data: position -1 means no block has been drawn yet
+        return {
+            "block_size": self.block_size,
+            "orders_rng": self._orders_state,
+            "order_pos": self._order_pos if self._orders else -1,
+            "uniforms_rng": self._uniforms_state,
+            "uniform_pos": self._uniform_pos if self._uniforms else -1,
+        }
+
+    def setstate(self, state):
+        # Redraw the current blocks and carry on where they were left
+        self.block_size = state["block_size"]
+        self._orders_rng.bit_generator.state = state["orders_rng"]
+        self._orders_state = state["orders_rng"]
+        self._orders = []
+        self._order_pos = 0
+        if state["order_pos"] >= 0:
+            self._draw_orders()
+            self._order_pos = state["order_pos"]
+        self._uniforms_rng.bit_generator.state = state["uniforms_rng"]
+        self._uniforms_state = state["uniforms_rng"]
+        self._uniforms = []
+        self._uniform_pos = 0
+        if state["uniform_pos"] >= 0:
+            self._draw_uniforms()
+            self._uniform_pos = state["uniform_pos"]
@@ -0,0 +1,118 @@
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from snake_engine import DEFAULT_GRID_SIZE, Game
+from snake_vector_engine import VectorGame
+
+ENGINES = {"object": Game, "vector": VectorGame}
+
+# Game settings a sweep may vary; the others stay at their defaults
+SWEEP_PARAMS = ("hatch_cycles", "lay_interval", "hungry_die_cycles", "turn_interval", "tangled_die_cycles", "food_attract_radius", "egg_attract_radius", "shading_interval")
+SETUP_COLUMNS = ("engine", "grid_size", "eggs", "food", "max_cycles")
+KEY_COLUMNS = SETUP_COLUMNS + SWEEP_PARAMS + ("seed",)
+RESULT_COLUMNS = ("extinction_cycle", "cycles", "max_snake_length", "total_eggs", "total_food", "seconds")
+COLUMNS = KEY_COLUMNS + RESULT_COLUMNS
+
+def run_key(row):
+    # Identifies a run in the results file, whatever the value types
+    return tuple(str(row[name]) for name in KEY_COLUMNS)
+
+def parse_values(text):
+    # "20,30,40" or a range "20-40:10" (step defaults to 1)
+    values = []
+    for part in text.split(","):
+        if "-" in part[1:]:
+            span, _, step = part.partition(":")
+            start, _, stop = span[1:].partition("-")
+            values.extend(range(int(span[0] + start), int(stop) + 1, int(step or 1)))
+        else:
+            values.append(int(part))
+    return values
+
+def build_jobs(setup, grid, seeds):
+    # One job per combination of swept values, per seed
+    defaults = Game()
+    names = list(grid)
+    jobs = []
+    for combo in itertools.product(*(grid[name] for name in names)):
+        params = {name: getattr(defaults, name) for name in SWEEP_PARAMS}
+        params.update(zip(names, combo))
+        for seed in seeds:
+            job = dict(setup)
+            job.update(params)
+            job["seed"] = seed
+            jobs.append(job)
+    return jobs
+
+def run_job(job):
+    start = time.perf_counter()
+    game = ENGINES[job["engine"]](grid_size=job["grid_size"], seed=job["seed"])
+    for name in SWEEP_PARAMS:
+        setattr(game, name, job[name])
+    game.scatter_eggs(job["eggs"])
+    game.scatter_food(job["food"])
+    extinct = game.run_until_extinct(job["max_cycles"])
+    row = dict(job)
+    row["extinction_cycle"] = "" if extinct is None else extinct
+    row["cycles"] = game.cycle
+    row["max_snake_length"] = game.max_snake_length
+    row["total_eggs"] = game.total_eggs
+    row["total_food"] = game.total_food
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+def finished_runs(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if tuple(reader.fieldnames or ()) != COLUMNS:
+            sys.exit(f"{path} has different columns; pick another --out")
+        return {run_key(row) for row in reader}
+
+def sweep(jobs, path, workers=None):
+    # Runs the jobs not already in `path` on a process pool, appending each
+    # result as soon as it arrives, so an interrupted sweep resumes where it
+    # stopped.
+    done = finished_runs(path)
+    pending = [job for job in jobs if run_key(job) not in done]
+    print(f"{len(jobs)} runs, {len(jobs) - len(pending)} already in {path}, {len(pending)} to go")
+    if not pending:
+        return
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        if new_file:
+            writer.writeheader()
+            f.flush()
+        # Runs vary a lot in length, so hand them out one at a time
+        with multiprocessing.Pool(workers or os.cpu_count()) as pool:
+            for count, row in enumerate(pool.imap_unordered(run_job, pending, chunksize=1), 1):
+                writer.writerow(row)
+                f.flush()
+                print(f"[{count}/{len(pending)}] seed {row['seed']}: {row['cycles']} cycles, longest {row['max_snake_length']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Game of Snakes over a grid of settings and seeds on all cores")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUES", help=f"values to sweep, e.g. hatch_cycles=20,30,40 or lay_interval=60-240:60; NAME is one of {', '.join(SWEEP_PARAMS)}")
+    parser.add_argument("--seeds", default="0-9", help="seeds per combination, e.g. 0-99 or 1,5,9")
+    parser.add_argument("--eggs", type=int, default=50)
+    parser.add_argument("--food", type=int, default=0)
+    parser.add_argument("--cycles", type=int, default=10000, help="maximum cycles per run")
+    parser.add_argument("--grid-size", type=int, default=DEFAULT_GRID_SIZE)
+    parser.add_argument("--engine", choices=tuple(ENGINES), default="object")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--out", default="sweep.csv", help="results table; runs already in it are skipped")
+    args = parser.parse_args()
+    grid = {}
+    for item in args.set:
+        name, _, values = item.partition("=")
+        if name not in SWEEP_PARAMS:
+            parser.error(f"unknown setting {name!r}")
+        grid[name] = parse_values(values)
+    setup = {"engine": args.engine, "grid_size": args.grid_size, "eggs": args.eggs, "food": args.food, "max_cycles": args.cycles}
+    sweep(build_jobs(setup, grid, parse_values(args.seeds)), args.out, args.workers)
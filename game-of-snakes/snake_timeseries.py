@@ -0,0 +1,109 @@
+import glob
+import os
+import numpy as np
+
+# One row per cycle. births, deaths and bites are counts for that cycle;
+# the rest are the game's stats after it.
+COLUMNS = ("cycle", "snakes", "eggs", "food", "head", "body", "egg", "food_legend", "player_body", "player_head", "max_snake_length", "mean_length", "births", "deaths", "bites")
+FLOAT_COLUMNS = ("mean_length",)
+STAT_COLUMNS = COLUMNS[:12]
+TOTALS = (("births", "total_births"), ("deaths", "total_deaths"), ("bites", "total_bites"))
+CHUNK_ROWS = 65536
+
+class PopulationRecorder:
+    # Collects per-cycle population stats into NumPy columns and writes them
+    # out a chunk at a time, so memory stays bounded however long the run.
+    # Use it as a game listener, after calling it once for the starting
+    # row: recorder(game); game.listeners.append(recorder).
+    # A path ending in .csv gets one CSV file; any other path is a directory
+    # of part-NNNNNN.npz files, one per chunk, each holding every column.
+    # An existing recording there is only replaced with overwrite=True.
+    def __init__(self, path, chunk_rows=CHUNK_ROWS, overwrite=False):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.rows = 0  # rows written so far, including buffered ones
+        self._csv = path.endswith(".csv")
+        self._parts = 0
+        self._totals = None
+        self._cycle = None
+        self._size = 0
+        if self._csv:
+            if os.path.exists(path) and not overwrite:
+                raise FileExistsError(f"{path} already exists")
+        else:
+            os.makedirs(path, exist_ok=True)
+            if os.listdir(path):
+                if not overwrite:
+                    raise FileExistsError(f"{path} is not empty")
+                for old in glob.glob(os.path.join(path, "part-*.npz")):
+                    os.remove(old)
+        self._alloc(min(1024, chunk_rows))
+        if self._csv:
+            self._file = open(path, "w")
+            self._file.write(",".join(COLUMNS) + "\n")
+
+    def _alloc(self, capacity):
+        # Buffers start small and double up to a whole chunk
+        columns = {}
+        for name in COLUMNS:
+            column = np.empty(capacity, dtype=np.float64 if name in FLOAT_COLUMNS else np.int64)
+            if self._size:
+                column[:self._size] = self._columns[name][:self._size]
+            columns[name] = column
+        self._columns = columns
+        self._capacity = capacity
+
+    def __call__(self, game):
+        if self._cycle is not None and game.cycle != self._cycle + 1:
+            raise ValueError(f"cycle {game.cycle} does not follow {self._cycle}; every cycle needs a row")
+        self._cycle = game.cycle
+        stats = game.stats()
+        totals = [stats[total] for _, total in TOTALS]
+        if self._totals is None:
+            # Births, deaths and bites start counting from the first row
+            self._totals = totals
+        if self._size == self._capacity:
+            if self._capacity < self.chunk_rows:
+                self._alloc(min(2 * self._capacity, self.chunk_rows))
+            else:
+                self.flush()
+        i = self._size
+        columns = self._columns
+        for name in STAT_COLUMNS:
+            columns[name][i] = stats[name]
+        for (name, _), now, before in zip(TOTALS, totals, self._totals):
+            columns[name][i] = now - before
+        self._totals = totals
+        self._size = i + 1
+        self.rows += 1
+
+    def flush(self):
+        n = self._size
+        if not n:
+            return
+        chunk = {name: column[:n] for name, column in self._columns.items()}
+        if self._csv:
+            text = [np.char.mod("%.3f", chunk[name]) if name in FLOAT_COLUMNS else chunk[name].astype(str) for name in COLUMNS]
+            self._file.write("\n".join(",".join(row) for row in zip(*(column.tolist() for column in text))) + "\n")
+            self._file.flush()
+        else:
+            np.savez(os.path.join(self.path, f"part-{self._parts:06d}.npz"), **chunk)
+            self._parts += 1
+        self._size = 0
+
+    def close(self):
+        self.flush()
+        if self._csv and not self._file.closed:
+            self._file.close()
+
+def read_series(path):
+    # Reads a recording back as {column: array}
+    if path.endswith(".csv"):
+        data = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+        return {name: data[:, i] if name in FLOAT_COLUMNS else data[:, i].astype(np.int64) for i, name in enumerate(COLUMNS)}
+    parts = sorted(glob.glob(os.path.join(path, "part-*.npz")))
+    chunks = []
+    for part in parts:
+        with np.load(part) as data:
+            chunks.append({name: data[name] for name in COLUMNS})
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) if chunks else np.empty(0) for name in COLUMNS}
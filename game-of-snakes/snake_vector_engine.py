@@ -0,0 +1,818 @@
+import heapq
+import numpy as np
+from snake_engine import DEFAULT_GRID_SIZE
+from snake_field import distance_field
+
+# Directions in the order the object engine tries them when it has a
+# target: straight steps, then diagonals, as snake_field.downhill lists them.
+# A snake's direction is an index into this table.
+DIRS = np.array([(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(-1,1),(1,-1)], dtype=np.int64)
+DX = DIRS[:, 0]
+DY = DIRS[:, 1]
+DIR_INDEX = np.full((3, 3), -1, dtype=np.int64)
+DIR_INDEX[DX + 1, DY + 1] = np.arange(len(DIRS))
+DIR_OF = {(int(dx), int(dy)): i for i, (dx, dy) in enumerate(DIRS)}
+
+NO_ITEM, EGG, FOOD = 0, 1, 2
+ITEM_CODES = np.array([0, 2, 4], dtype=np.uint8)  # grid code per item kind
+MIN_CAPACITY = 4
+CHUNK = 1 << 20  # elements per broadcast comparison, keeps temporaries small
+
+class BodyArena:
+    # Snake bodies as ring buffers. Each capacity (a power of two) has its own
+    # table with one body per row; a body runs from its tail at
+    # (head_pos - length + 1) % capacity round to its head at head_pos.
+    # Freed rows are reused, and a body that fills its row is copied to a row
+    # of twice the capacity.
+    def __init__(self):
+        self.tables = {}
+        self.free = {}
+        self.top = {}
+
+    def alloc(self, cap, count):
+        table = self.tables.get(cap)
+        if table is None:
+            table = self.tables[cap] = np.zeros((max(count, 16), cap), dtype=np.int32)
+            self.free[cap] = []
+            self.top[cap] = 0
+        free = self.free[cap]
+        reused = free[len(free) - min(count, len(free)):]
+        del free[len(free) - len(reused):]
+        fresh = count - len(reused)
+        top = self.top[cap]
+        if top + fresh > len(table):
+            grown = np.zeros((max(2 * len(table), top + fresh), cap), dtype=np.int32)
+            grown[:top] = table[:top]
+            self.tables[cap] = grown
+        self.top[cap] = top + fresh
+        return np.concatenate([np.array(reused, dtype=np.int64), np.arange(top, top + fresh)])
+
+    def release(self, cap, rows):
+        self.free[cap].extend(rows)
+
+# Per-snake columns of VectorGame, indexed by snake id
+SNAKE_FIELDS = (
+    ("alive", np.bool_),
+    ("cap", np.int64),
+    ("row", np.int64),
+    ("head_pos", np.int64),
+    ("length", np.int64),
+    ("head", np.int64),
+    ("dir", np.int64),
+    ("steps", np.int64),
+    ("born", np.int64),
+    ("last_lay", np.int64),
+    ("last_shading", np.int64),
+    ("hungry", np.bool_),
+    ("ate", np.bool_),
+    ("tangled", np.int64),
+    ("last_head", np.int64),
+)
+
+class VectorGame:
+    # Game with every snake held in NumPy columns instead of Snake objects.
+    # Moves, bounds and self-collision checks, attraction targets and the
+    # turn_interval re-rolls run for the whole population at once; the sparse
+    # events (head collisions, bites, growing after a meal) are resolved per
+    # snake. The rules follow Game, but work is batched per phase, so ties and
+    # random draws come out differently and runs do not match Game cycle for
+    # cycle. There is no player snake.
+    # Cells are flat indices x * grid_size + y, so grid.reshape(-1)[cell] is
+    # the cell's pixel. Snake ids only grow, and id order is list order.
+    supports_player = False
+
+    def __init__(self, grid_size=DEFAULT_GRID_SIZE, seed=None):
+        self.grid_size = grid_size
+        self.rng = np.random.default_rng(seed)
+        self.profiler = None
+        # Callables run as listener(game) at the end of every update()
+        self.listeners = []
+        self.reset()
+        self.hatch_cycles = 30
+        self.lay_interval = 120
+        self.hungry_die_cycles = 300
+        self.turn_interval = 30
+        self.tangled_die_cycles = 30
+        self.food_attract_radius = 5
+        self.egg_attract_radius = 5
+        self.shading_interval = 300
+
+    def reset(self):
+        n = self.grid_size
+        self.cycle = 0
+        self.arena = BodyArena()
+        self.count = 0  # snake ids in use, alive or not
+        for name, dtype in SNAKE_FIELDS:
+            setattr(self, name, np.zeros(64, dtype=dtype))
+        self.segment_counts = np.zeros(n * n, dtype=np.int32)
+        self.head_counts = np.zeros(n * n, dtype=np.int32)
+        self._dirty = []
+        self.items = np.zeros(n * n, dtype=np.uint8)
+        self.hatch_at = np.zeros(n * n, dtype=np.int64)
+        self._hatch_buckets = {}
+        self.egg_count = 0
+        self.food_count = 0
+        self.grid = np.zeros((n, n), dtype=np.uint8)
+        self._cell_counts = np.zeros(7, dtype=np.int64)
+        self._cell_counts[0] = n * n
+        self.stats_snakes = 0
+        self.stats_eggs = 0
+        self.stats_food = 0
+        self.max_snake_length = 0
+        self.total_eggs = 0
+        self.total_food = 0
+        self.total_births = 0
+        self.total_deaths = 0
+        self.total_bites = 0
+        self.stats_head = 0
+        self.stats_body = 0
+        self.stats_egg = 0
+        self.stats_food_legend = 0
+        self.stats_player_body = 0
+        self.stats_player_head = 0
+        self.player_alive = True
+        self.player_max_length = 0
+        self.player_survive_cycles = 0
+        self.player_direction = None
+        self.player_eaten = False
+
+    def live(self):
+        return np.flatnonzero(self.alive[:self.count])
+
+    # --- eggs and food ---
+
+    def _put_items(self, cells, kind, hatch_cycle=0):
+        # cells must be distinct and hold no item
+        if len(cells) == 0:
+            return
+        self._dirty.append(cells)
+        self.items[cells] = kind
+        if kind == EGG:
+            self.hatch_at[cells] = hatch_cycle
+            self._hatch_buckets.setdefault(hatch_cycle, []).append(cells)
+            self.egg_count += len(cells)
+        else:
+            self.food_count += len(cells)
+
+    def _take_items(self, cells):
+        self._dirty.append(cells)
+        kinds = self.items[cells]
+        self.egg_count -= int(np.count_nonzero(kinds == EGG))
+        self.food_count -= int(np.count_nonzero(kinds == FOOD))
+        self.items[cells] = NO_ITEM
+
+    def _make_food(self, cell):
+        if self.items[cell] == EGG:
+            self._dirty.append(np.array([cell]))
+            self.items[cell] = FOOD
+            self.egg_count -= 1
+            self.food_count += 1
+
+    def add_egg(self, x, y):
+        cell = x * self.grid_size + y
+        if self.items[cell] != NO_ITEM:
+            self._make_food(cell)
+        else:
+            self._put_items(np.array([cell]), EGG, self.cycle + self.hatch_cycles)
+            self.total_eggs += 1
+        self._flush_grid()
+
+    def add_food(self, x, y):
+        cell = x * self.grid_size + y
+        if self.items[cell] != NO_ITEM:
+            self._make_food(cell)
+        else:
+            self._put_items(np.array([cell]), FOOD)
+            self.total_food += 1
+        self._flush_grid()
+
+    def _random_empty_cells(self, count):
+        empty = np.flatnonzero(self.grid.reshape(-1) == 0)
+        return self.rng.choice(empty, size=min(count, len(empty)), replace=False)
+
+    def scatter_eggs(self, count):
+        cells = self._random_empty_cells(count)
+        self._put_items(cells, EGG, self.cycle + self.hatch_cycles)
+        self.total_eggs += len(cells)
+        self._flush_grid()
+
+    def scatter_food(self, count):
+        cells = self._random_empty_cells(count)
+        self._put_items(cells, FOOD)
+        self.total_food += len(cells)
+        self._flush_grid()
+
+    # --- snake storage ---
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        size = len(self.alive)
+        if needed <= size:
+            return
+        size = max(2 * size, needed)
+        for name, dtype in SNAKE_FIELDS:
+            column = np.zeros(size, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def _compact(self):
+        # Drop dead snakes' columns; ids are renumbered but keep their order
+        keep = self.live()
+        for name, dtype in SNAKE_FIELDS:
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+        self.alive[len(keep):self.count] = False
+        self.count = len(keep)
+
+    def _spawn(self, bodies, direction, hungry):
+        # bodies is (k, length), head first, all the same length
+        k, length = bodies.shape
+        if k == 0:
+            return
+        self._reserve(k)
+        sids = np.arange(self.count, self.count + k)
+        self.count += k
+        cap = max(MIN_CAPACITY, 1 << (length - 1).bit_length())
+        rows = self.arena.alloc(cap, k)
+        self.arena.tables[cap][rows, :length] = bodies[:, ::-1]
+        self.alive[sids] = True
+        self.cap[sids] = cap
+        self.row[sids] = rows
+        self.head_pos[sids] = length - 1
+        self.length[sids] = length
+        self.head[sids] = bodies[:, 0]
+        self.dir[sids] = direction
+        self.steps[sids] = 0
+        self.born[sids] = self.cycle
+        self.last_lay[sids] = self.cycle
+        self.last_shading[sids] = self.cycle
+        self.hungry[sids] = hungry
+        self.ate[sids] = False
+        self.tangled[sids] = 0
+        self.last_head[sids] = bodies[:, 0]
+        np.add.at(self.segment_counts, bodies.ravel(), 1)
+        np.add.at(self.head_counts, bodies[:, 0], 1)
+        self._dirty.append(bodies.ravel())
+        self.max_snake_length = max(self.max_snake_length, length)
+
+    def add_snake(self, body, direction, hungry=False):
+        n = self.grid_size
+        cells = [x * n + y for x, y in body if 0 <= x < n and 0 <= y < n]
+        if len(cells) >= 3:
+            self._spawn(np.array([cells], dtype=np.int64), DIR_OF[tuple(direction)], hungry)
+            self._flush_grid()
+
+    def _bodies(self, sids):
+        # Per capacity: positions in sids, the ring rows of those snakes and a
+        # mask of the ring slots that hold segments
+        caps = self.cap[sids]
+        for cap in np.unique(caps).tolist():
+            pos = np.flatnonzero(caps == cap)
+            s = sids[pos]
+            rings = self.arena.tables[cap][self.row[s]]
+            age = (self.head_pos[s][:, None] - np.arange(cap)) % cap
+            yield pos, rings, age < self.length[s][:, None]
+
+    def _segments(self, sids):
+        cells = [np.zeros(0, dtype=np.int64)]
+        owners = [np.zeros(0, dtype=np.int64)]
+        for pos, rings, valid in self._bodies(sids):
+            cells.append(rings[valid])
+            owners.append(np.repeat(sids[pos], valid.sum(axis=1)))
+        return np.concatenate(cells).astype(np.int64), np.concatenate(owners)
+
+    def _body(self, s):
+        # Cells of one snake, tail first
+        cap = int(self.cap[s])
+        length = int(self.length[s])
+        ring = self.arena.tables[cap][self.row[s]]
+        start = (int(self.head_pos[s]) - length + 1) % cap
+        if start + length <= cap:
+            return ring[start:start + length].astype(np.int64)
+        return np.concatenate([ring[start:], ring[:start + length - cap]]).astype(np.int64)
+
+    def _tails(self, sids):
+        tails = np.zeros(len(sids), dtype=np.int64)
+        caps = self.cap[sids]
+        for cap in np.unique(caps).tolist():
+            pos = np.flatnonzero(caps == cap)
+            s = sids[pos]
+            tails[pos] = self.arena.tables[cap][self.row[s], (self.head_pos[s] - self.length[s] + 1) % cap]
+        return tails
+
+    def _hits_body(self, sids, cells):
+        # cells[i, k] in the body of snake sids[i]
+        hit = np.zeros(cells.shape, dtype=bool)
+        for pos, rings, valid in self._bodies(sids):
+            rings = np.where(valid, rings, -2)
+            step = max(1, CHUNK // (rings.shape[1] * cells.shape[1]))
+            for start in range(0, len(pos), step):
+                rows = pos[start:start + step]
+                hit[rows] = (cells[rows][:, :, None] == rings[start:start + step][:, None, :]).any(axis=2)
+        return hit
+
+    def _regrow(self, s, needed=0):
+        # Move a ring to a row of at least twice the capacity, tail first
+        cap = int(self.cap[s])
+        new_cap = max(2 * cap, 1 << (needed - 1).bit_length())
+        cells = self._body(s)
+        new_row = self.arena.alloc(new_cap, 1)[0]
+        self.arena.tables[new_cap][new_row, :len(cells)] = cells
+        self.arena.release(cap, [int(self.row[s])])
+        self.cap[s] = new_cap
+        self.row[s] = new_row
+        self.head_pos[s] = len(cells) - 1
+
+    def _write_heads(self, sids, cells, advance):
+        # New head per snake (sids distinct); advance also drops the tail
+        if len(sids) == 0:
+            return
+        if advance:
+            tails = self._tails(sids)
+        else:
+            for s in sids[self.length[sids] >= self.cap[sids]].tolist():
+                self._regrow(s)
+        caps = self.cap[sids]
+        head_pos = (self.head_pos[sids] + 1) % caps
+        for cap in np.unique(caps).tolist():
+            pos = np.flatnonzero(caps == cap)
+            self.arena.tables[cap][self.row[sids[pos]], head_pos[pos]] = cells[pos]
+        self.head_pos[sids] = head_pos
+        old_heads = self.head[sids]
+        self.head[sids] = cells
+        np.add.at(self.segment_counts, cells, 1)
+        np.subtract.at(self.head_counts, old_heads, 1)
+        np.add.at(self.head_counts, cells, 1)
+        self._dirty.append(old_heads)
+        self._dirty.append(cells)
+        if advance:
+            np.subtract.at(self.segment_counts, tails, 1)
+            self._dirty.append(tails)
+        else:
+            self.length[sids] += 1
+
+    def _append_cells(self, s, cells):
+        # Push several heads onto one snake, oldest first
+        cells = np.asarray(cells, dtype=np.int64)
+        length = int(self.length[s])
+        if length + len(cells) > self.cap[s]:
+            self._regrow(s, length + len(cells))
+        cap = int(self.cap[s])
+        positions = (int(self.head_pos[s]) + 1 + np.arange(len(cells))) % cap
+        self.arena.tables[cap][self.row[s], positions] = cells
+        self._dirty.append(np.r_[self.head[s], cells])
+        self.head_counts[self.head[s]] -= 1
+        self.head_counts[cells[-1]] += 1
+        np.add.at(self.segment_counts, cells, 1)
+        self.head_pos[s] = positions[-1]
+        self.head[s] = cells[-1]
+        self.length[s] = length + len(cells)
+
+    def _release(self, sids):
+        sids = np.asarray(sids, dtype=np.int64)
+        if len(sids) == 0:
+            return
+        cells = self._body(sids[0]) if len(sids) == 1 else self._segments(sids)[0]
+        np.subtract.at(self.segment_counts, cells, 1)
+        np.subtract.at(self.head_counts, self.head[sids], 1)
+        self._dirty.append(cells)
+        caps = self.cap[sids]
+        for cap in np.unique(caps).tolist():
+            self.arena.release(cap, self.row[sids[caps == cap]].tolist())
+        self.alive[sids] = False
+
+    # --- movement ---
+
+    def _bounce(self, d, x, y):
+        n = self.grid_size
+        dx = np.where((x <= 0) | (x >= n - 1), -DX[d], DX[d])
+        dy = np.where((y <= 0) | (y >= n - 1), -DY[d], DY[d])
+        return DIR_INDEX[dx + 1, dy + 1]
+
+    def _first_free(self, sids, cand):
+        # cand[i] lists directions for snake sids[i] in order of preference,
+        # -1 for none. Returns the first that stays on the grid and off the
+        # snake's own body (or -1) and the cell it leads to.
+        n = self.grid_size
+        hx, hy = np.divmod(self.head[sids], n)
+        d = np.maximum(cand, 0)
+        x = hx[:, None] + DX[d]
+        y = hy[:, None] + DY[d]
+        ok = (cand >= 0) & (x >= 0) & (x < n) & (y >= 0) & (y < n)
+        cells = np.where(ok, x * n + y, -1)
+        ok &= ~self._hits_body(sids, cells)
+        first = ok.argmax(axis=1)
+        rows = np.arange(len(sids))
+        return np.where(ok[rows, first], cand[rows, first], -1), cells[rows, first]
+
+    def _random_orders(self, count):
+        return np.argsort(self.rng.random((count, len(DIRS))), axis=1)
+
+    def _move(self, live):
+        n = self.grid_size
+        heads = self.head[live]
+        hx, hy = np.divmod(heads, n)
+        d = self._bounce(self.dir[live], hx, hy)
+        steps = self.steps[live] + 1
+        # Walk down the food field within the food radius, else the egg field
+        food = distance_field((self.items == FOOD).reshape(n, n), self.food_attract_radius).reshape(-1)
+        eggs = distance_field((self.items == EGG).reshape(n, n), self.egg_attract_radius).reshape(-1)
+        near_food = food[heads] <= self.food_attract_radius
+        near_egg = ~near_food & (eggs[heads] <= self.egg_attract_radius)
+        has_target = near_food | near_egg
+        # Candidate directions per snake, as Snake.move tries them: downhill
+        # then all eight; or a random order when it is time to turn;
+        # otherwise straight on, then straight on after a bounce
+        turning = ~has_target & (steps >= self.turn_interval)
+        plain = ~has_target & ~turning
+        cand = np.full((len(live), 2 * len(DIRS)), -1, dtype=np.int64)
+        x = hx[has_target, None] + DX
+        y = hy[has_target, None] + DY
+        inside = (x >= 0) & (x < n) & (y >= 0) & (y < n)
+        around = np.where(inside, x * n + y, 0)
+        by_food = near_food[has_target, None]
+        here = np.where(by_food[:, 0], food[heads[has_target]], eggs[heads[has_target]])
+        downhill = inside & (np.where(by_food, food[around], eggs[around]) < here[:, None])
+        cand[has_target, :len(DIRS)] = np.where(downhill, np.arange(len(DIRS)), -1)
+        cand[has_target, len(DIRS):] = np.arange(len(DIRS))
+        cand[turning, :len(DIRS)] = self._random_orders(int(np.count_nonzero(turning)))
+        bounced = self._bounce(d, hx, hy)
+        cand[plain, 0] = d[plain]
+        cand[plain, 1] = bounced[plain]
+        choice, cells = self._first_free(live, cand)
+        moved = choice >= 0
+        # A snake that cannot move keeps its direction if it tried to turn,
+        # otherwise it is left bounced
+        self.dir[live] = np.where(moved, choice, np.where(steps >= self.turn_interval, d, bounced))
+        self.steps[live] = np.where(moved & ~plain, 0, steps)
+        self._write_heads(live[moved], cells[moved], advance=True)
+        heads = self.head[live]
+        self.tangled[live] = np.where(heads == self.last_head[live], self.tangled[live] + 1, 0)
+        self.last_head[live] = heads
+        return int(np.count_nonzero(moved))
+
+    def _grow_once(self, sids):
+        # grow_by(1) for every snake in sids
+        if len(sids) == 0:
+            return
+        hx, hy = np.divmod(self.head[sids], self.grid_size)
+        bounced = self._bounce(self.dir[sids], hx, hy)
+        cand = np.concatenate([self._random_orders(len(sids)), bounced[:, None]], axis=1)
+        choice, cells = self._first_free(sids, cand)
+        grown = choice >= 0
+        self.dir[sids] = np.where(grown, choice, bounced)
+        self._write_heads(sids[grown], cells[grown], advance=False)
+
+    def _grow(self, s, count):
+        # grow_by(count) for one snake; returns the cells it grew into
+        added = []
+        if count <= 0:
+            return added
+        n = self.grid_size
+        body = set(self._body(s).tolist())
+        x, y = divmod(int(self.head[s]), n)
+        direction = int(self.dir[s])
+        for order in self._random_orders(count).tolist():
+            for d in order:
+                cx, cy = x + int(DX[d]), y + int(DY[d])
+                if 0 <= cx < n and 0 <= cy < n and cx * n + cy not in body:
+                    break
+            else:
+                dx, dy = int(DX[direction]), int(DY[direction])
+                if x <= 0 or x >= n - 1:
+                    dx = -dx
+                if y <= 0 or y >= n - 1:
+                    dy = -dy
+                d = DIR_OF[(dx, dy)]
+                cx, cy = x + dx, y + dy
+                if not (0 <= cx < n and 0 <= cy < n and cx * n + cy not in body):
+                    direction = d
+                    continue
+            direction = d
+            x, y = cx, cy
+            body.add(cx * n + cy)
+            added.append(cx * n + cy)
+        self.dir[s] = direction
+        if added:
+            self._append_cells(s, added)
+        return added
+
+    # --- update phases ---
+
+    def _hatch(self):
+        # Every bucket that is due, including any left from earlier cycles
+        due = []
+        for cycle in [cycle for cycle in self._hatch_buckets if cycle <= self.cycle]:
+            due.extend(self._hatch_buckets.pop(cycle))
+        if not due:
+            return 0
+        cells = np.unique(np.concatenate(due))
+        # Eggs eaten or turned into food since they were laid are skipped
+        cells = cells[(self.items[cells] == EGG) & (self.hatch_at[cells] <= self.cycle)]
+        self._take_items(cells)
+        n = self.grid_size
+        d = self.rng.integers(0, len(DIRS), size=len(cells))
+        x, y = np.divmod(cells, n)
+        x2 = x + 2 * DX[d]
+        y2 = y + 2 * DY[d]
+        fits = (x2 >= 0) & (x2 < n) & (y2 >= 0) & (y2 < n)
+        cells, d = cells[fits], d[fits]
+        step = DX[d] * n + DY[d]
+        self._spawn(np.stack([cells, cells + step, cells + 2 * step], axis=1), d, True)
+        return len(cells)
+
+    def _head_collisions(self, live):
+        heads = self.head[live]
+        order = np.argsort(heads, kind="stable")
+        sorted_heads = heads[order]
+        starts = np.flatnonzero(np.r_[True, sorted_heads[1:] != sorted_heads[:-1]])
+        sizes = np.diff(np.r_[starts, len(sorted_heads)])
+        shared = sizes > 1
+        for start, size in zip(starts[shared].tolist(), sizes[shared].tolist()):
+            group = live[order[start:start + size]]
+            eater = int(group[self.rng.integers(size)])
+            eaten = group[group != eater]
+            self._grow(eater, int(self.length[eaten].sum()))
+            self.ate[eater] = True
+            self._release(eaten)
+        return int(sizes[shared].sum()) - int(np.count_nonzero(shared))
+
+    def _eat(self, live):
+        kinds = self.items[self.head[live]]
+        eaters = live[kinds != NO_ITEM]
+        # One meal per cell; the first snake in order gets it
+        cells, first = np.unique(self.head[eaters], return_index=True)
+        eaters = eaters[np.sort(first)]
+        cells = self.head[eaters]
+        self.total_food += int(np.count_nonzero(self.items[cells] == FOOD))
+        self._take_items(cells)
+        self.ate[eaters] = True
+        self._grow_once(eaters)
+        return len(eaters)
+
+    def _bites(self, live):
+        # A head on another snake's segment eats that snake. Biters go in id
+        # order and each eats its victims in id order; growing moves the head,
+        # so a biter may land on more victims, and any later snake whose head
+        # it grows onto gets its turn as well.
+        heads = self.head[live]
+        pending = live[self.segment_counts[heads] > 1].tolist()
+        if not pending:
+            return 0
+        # Owners of a cell are looked up in a snapshot of all segments plus
+        # what biters grew into since; eaten snakes are skipped as not alive
+        seg_cells, seg_owners = self._segments(live)
+        hot = np.zeros(len(self.segment_counts), dtype=bool)
+        hot[heads[self.segment_counts[heads] > 1]] = True
+        on_hot = hot[seg_cells]
+        owners_at = {}
+        for cell, sid in zip(seg_cells[on_hot].tolist(), seg_owners[on_hot].tolist()):
+            owners_at.setdefault(cell, set()).add(sid)
+        grown_at = {}
+        head_order = np.argsort(heads)
+        sorted_heads = heads[head_order]
+        queued = set(pending)
+        bites = 0
+        while pending:
+            i = heapq.heappop(pending)
+            if not self.alive[i]:
+                continue
+            last_j = -1
+            while True:
+                cell = int(self.head[i])
+                if cell not in owners_at:
+                    if self.segment_counts[cell] <= 1:
+                        break
+                    owners_at[cell] = set(seg_owners[seg_cells == cell].tolist()) | grown_at.get(cell, set())
+                victims = [j for j in owners_at[cell] if j != i and j > last_j and self.alive[j]]
+                if not victims:
+                    break
+                j = min(victims)
+                last_j = j
+                for grown in self._grow(i, int(self.length[j])):
+                    grown_at.setdefault(grown, set()).add(i)
+                    if grown in owners_at:
+                        owners_at[grown].add(i)
+                    if self.segment_counts[grown] <= 1:
+                        continue
+                    lo, hi = np.searchsorted(sorted_heads, [grown, grown + 1])
+                    for k in live[head_order[lo:hi]].tolist():
+                        if k > i and k not in queued:
+                            queued.add(k)
+                            heapq.heappush(pending, k)
+                self.ate[i] = True
+                self._release([j])
+                bites += 1
+        return bites
+
+    def update(self):
+        prof = self.profiler
+        if prof:
+            prof.begin()
+        self.cycle += 1
+        hatched = self._hatch()
+        self.total_births += hatched
+        if prof:
+            prof.count("hatched", hatched)
+            prof.mark("hatch")
+        live = self.live()
+        alive_before = len(live)
+        moved = self._move(live)
+        cycle = self.cycle
+        shedding = live[(self.shading_interval > 0) & (self.length[live] >= 2) & (cycle - self.last_shading[live] >= self.shading_interval)]
+        self.last_shading[shedding] = cycle
+        shed_cells = self._tails(shedding)
+        if len(live):
+            self.max_snake_length = max(self.max_snake_length, int(self.length[live].max()))
+        if prof:
+            prof.count("moves", moved)
+            prof.mark("move")
+        collisions = self._head_collisions(live)
+        if prof:
+            prof.count("head_collisions", collisions)
+            prof.mark("head_collisions")
+        live = self.live()
+        meals = self._eat(live)
+        if prof:
+            prof.count("grow_by", meals)
+            prof.mark("eat")
+        bites = self._bites(live)
+        self.total_bites += collisions + bites
+        if prof:
+            prof.count("bites", bites)
+            prof.mark("bites")
+        live = self.live()
+        starved = self.hungry[live] & ~self.ate[live] & (cycle - self.born[live] > self.hungry_die_cycles)
+        dead = starved | (self.tangled[live] > self.tangled_die_cycles)
+        self._release(live[dead])
+        live = live[~dead]
+        self.hungry[live] &= ~self.ate[live]
+        self.ate[live] = False
+        if prof:
+            prof.mark("cull")
+        laying = live[(self.length[live] > 3) & (cycle - self.last_lay[live] >= self.lay_interval)]
+        self.last_lay[laying] = cycle
+        # Shed skin first, then eggs; a cell keeps the first item put on it
+        cells = np.concatenate([shed_cells, self._tails(laying)])
+        kinds = np.r_[np.full(len(shed_cells), FOOD), np.full(len(laying), EGG)]
+        _, first = np.unique(cells, return_index=True)
+        first = first[self.items[cells[first]] == NO_ITEM]
+        cells, kinds = cells[first], kinds[first]
+        self._put_items(cells[kinds == FOOD], FOOD)
+        eggs = cells[kinds == EGG]
+        self._put_items(eggs, EGG, cycle + self.hatch_cycles)
+        self.total_eggs += len(eggs)
+        if prof:
+            prof.mark("lay")
+        if self.count > 1024 and 2 * len(live) < self.count:
+            self._compact()
+        self._flush_grid()
+        self.total_deaths += alive_before - self.stats_snakes
+        if prof:
+            prof.mark("grid")
+            prof.mark("stats")
+            prof.end()
+        for listener in self.listeners:
+            listener(self)
+
+    def fast_forward(self, last_cycle=None):
+        # Same as Game.fast_forward: with no snakes, jump to the cycle before
+        # the next hatch, calling the listeners for every cycle skipped
+        if self.alive[:self.count].any():
+            return
+        hatch = min(self._hatch_buckets, default=None)
+        if hatch is None:
+            if last_cycle is None:
+                return
+            target = last_cycle
+        else:
+            target = hatch - 1 if last_cycle is None else min(hatch - 1, last_cycle)
+        if target > self.cycle:
+            if self.count > 1024:
+                self._compact()
+            self._flush_grid()
+            if not self.listeners:
+                self.cycle = target
+            while self.cycle < target:
+                self.cycle += 1
+                for listener in self.listeners:
+                    listener(self)
+
+    def step(self, cycles=1):
+        end = self.cycle + cycles
+        while self.cycle < end:
+            self.fast_forward(end)
+            if self.cycle < end:
+                self.update()
+
+    def run(self, max_cycles):
+        end = self.cycle + max_cycles
+        while self.cycle < end:
+            self.update()
+            if self.is_extinct():
+                break
+            self.fast_forward(end)
+        return self.cycle
+
+    def run_until_extinct(self, max_cycles=None):
+        while max_cycles is None:
+            self.update()
+            if self.is_extinct():
+                return self.cycle
+            self.fast_forward()
+        self.run(max_cycles)
+        return self.cycle if self.is_extinct() else None
+
+    def is_extinct(self):
+        return self.stats_snakes == 0 and self.egg_count == 0
+
+    # --- grid ---
+
+    def _cell_codes(self, cells):
+        codes = ITEM_CODES[self.items[cells]]
+        codes[self.segment_counts[cells] > 0] = 1
+        codes[self.head_counts[cells] > 0] = 3
+        return codes
+
+    def _flush_grid(self):
+        # Recode only the cells touched since the last flush
+        flat = self.grid.reshape(-1)
+        counts = self._cell_counts
+        if self._dirty:
+            cells = np.unique(np.concatenate(self._dirty))
+            self._dirty = []
+            codes = self._cell_codes(cells)
+            counts -= np.bincount(flat[cells], minlength=7)
+            counts += np.bincount(codes, minlength=7)
+            flat[cells] = codes
+        self.stats_snakes = int(np.count_nonzero(self.alive[:self.count]))
+        self.stats_head = int(counts[3])
+        self.stats_body = int(counts[1])
+        self.stats_egg = int(counts[2])
+        self.stats_food_legend = int(counts[4])
+        self.stats_eggs = self.egg_count
+        self.stats_food = self.food_count
+
+    def rebuild_grid(self):
+        size = self.grid_size
+        self.grid = self._cell_codes(np.arange(size * size)).reshape(size, size)
+        self._cell_counts = np.bincount(self.grid.reshape(-1), minlength=7)
+        self._dirty = []
+        self._flush_grid()
+
+    def resize(self, size):
+        # Re-encode every cell for the new size. Snakes with a segment off the
+        # new grid are dropped, as are eggs and food.
+        old = self.grid_size
+        live = self.live()
+        cells, owners = self._segments(live)
+        x, y = np.divmod(cells, old)
+        self._release(np.unique(owners[(x >= size) | (y >= size)]))
+        for table in self.arena.tables.values():
+            x, y = np.divmod(table, old)
+            table[:] = np.where((x < size) & (y < size), x * size + y, 0)
+        for column in (self.head, self.last_head):
+            x, y = np.divmod(column, old)
+            column[:] = np.where((x < size) & (y < size), x * size + y, -1)
+        item_cells = np.flatnonzero(self.items)
+        kinds = self.items[item_cells]
+        hatch = self.hatch_at[item_cells]
+        x, y = np.divmod(item_cells, old)
+        keep = (x < size) & (y < size)
+        item_cells = x[keep] * size + y[keep]
+        kinds, hatch = kinds[keep], hatch[keep]
+        self.grid_size = size
+        self.items = np.zeros(size * size, dtype=np.uint8)
+        self.hatch_at = np.zeros(size * size, dtype=np.int64)
+        self._hatch_buckets = {}
+        self.egg_count = 0
+        self.food_count = 0
+        self._put_items(item_cells[kinds == FOOD], FOOD)
+        eggs = kinds == EGG
+        for cycle in np.unique(hatch[eggs]).tolist():
+            self._put_items(item_cells[eggs & (hatch == cycle)], EGG, cycle)
+        cells, _ = self._segments(self.live())
+        self.segment_counts = np.bincount(cells, minlength=size * size).astype(np.int32)
+        self.head_counts = np.bincount(self.head[self.live()], minlength=size * size).astype(np.int32)
+        self.rebuild_grid()
+
+    def stats(self):
+        return {
+            "cycle": self.cycle,
+            "snakes": self.stats_snakes,
+            "eggs": self.stats_eggs,
+            "food": self.stats_food,
+            "head": self.stats_head,
+            "body": self.stats_body,
+            "egg": self.stats_egg,
+            "food_legend": self.stats_food_legend,
+            "player_body": self.stats_player_body,
+            "player_head": self.stats_player_head,
+            "max_snake_length": self.max_snake_length,
+            "total_eggs": self.total_eggs,
+            "total_food": self.total_food,
+            "total_births": self.total_births,
+            "total_deaths": self.total_deaths,
+            "total_bites": self.total_bites,
+            "mean_length": float(self.length[self.live()].mean()) if self.stats_snakes else 0.0,
+        }
@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+
+class Snapshot:
+    def __init__(self, cycle, grid, stats, hud=None):
+        self.cycle = cycle
+        self.grid = grid
+        self.stats = stats
+        self.hud = hud  # profiler HUD text, built on the worker thread
+
+class SimulationWorker:
+    # Runs Game.update() on a background thread, as fast as possible
+    # (cycles_per_second = 0) or paced to a target rate. Other threads never
+    # touch the game while it runs: edits and player input go through
+    # submit() and are applied between cycles, and the latest grid/stats
+    # are published as a Snapshot whenever one has been requested.
+    def __init__(self, game, cycles_per_second=0):
+        self.game = game
+        self.cycles_per_second = cycles_per_second
+        self.latest = None
+        self.stop_reason = None
+        self._commands = queue.SimpleQueue()
+        self._snapshot_requested = True
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self.stop_reason = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="snake-simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._apply_commands()
+
+    def submit(self, command):
+        # command(game) runs on the worker before its next cycle, or right
+        # away on the caller's thread when the worker is not running.
+        if self.is_running():
+            self._commands.put(command)
+        else:
+            command(self.game)
+
+    def set_player_direction(self, direction):
+        self.submit(lambda game: setattr(game, "player_direction", direction))
+
+    def request_snapshot(self):
+        self._snapshot_requested = True
+
+    def take_snapshot(self):
+        game = self.game
+        profiler = game.profiler
+        hud = profiler.format_hud() if profiler is not None else None
+        self.latest = Snapshot(game.cycle, game.grid.copy(), game.stats(), hud)
+        self._snapshot_requested = False
+        return self.latest
+
+    def _apply_commands(self):
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            command(self.game)
+
+    def _run(self):
+        game = self.game
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            self._apply_commands()
+            if self.cycles_per_second == 0:
+                # Unpaced: skip straight over cycles with no snakes
+                game.fast_forward()
+            game.update()
+            if game.player_eaten:
+                self.stop_reason = "player_eaten"
+            elif game.is_extinct():
+                self.stop_reason = "extinct"
+            if self._snapshot_requested or self.stop_reason:
+                self.take_snapshot()
+            if self.stop_reason:
+                break
+            cps = self.cycles_per_second
+            if cps > 0:
+                next_tick += 1.0 / cps
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    next_tick = time.perf_counter()